@@ -8,13 +8,23 @@ class AsyncPoller extends LitElement {
     triggerEvent: {type: String},
     action: {type: Object},
     polling_interval: {type: Number},
+    stream_url: {type: String},
   };
 
+  constructor() {
+    super();
+    this.streaming = false;
+    this.streamTriggerPending = false;
+  }
+
   render() {
     return html`<div></div>`;
   }
 
   firstUpdated() {
+    if (this.stream_url) {
+      this.openStream();
+    }
     if (this.polling_interval <= 0) {
       return;
     }
@@ -25,12 +35,52 @@ class AsyncPoller extends LitElement {
     }
   }
 
-  runTimeout(action) {
+  disconnectedCallback() {
+    super.disconnectedCallback();
+    if (this.eventSource) {
+      this.eventSource.close();
+    }
+  }
+
+  // Triggers on every pushed change; polling only runs while the stream is
+  // down. EventSource reconnects by itself, resuming from the last event id.
+  openStream() {
+    this.eventSource = new EventSource(this.stream_url);
+    this.eventSource.onopen = () => {
+      this.streaming = true;
+    };
+    this.eventSource.onerror = () => {
+      this.streaming = false;
+    };
+    for (const kind of ['conversation', 'task', 'event', 'reset']) {
+      this.eventSource.addEventListener(kind, () => this.triggerFromStream());
+    }
+  }
+
+  // Changes arriving in a burst are folded into a single trigger.
+  triggerFromStream() {
+    if (this.streamTriggerPending) {
+      return;
+    }
+    this.streamTriggerPending = true;
+    setTimeout(() => {
+      this.streamTriggerPending = false;
+      this.trigger(this.action);
+    }, 100);
+  }
+
+  trigger(action) {
     this.dispatchEvent(
       new MesopEvent(this.triggerEvent, {
         action: action,
       }),
     );
+  }
+
+  runTimeout(action) {
+    if (!this.streaming) {
+      this.trigger(action);
+    }
     if (this.polling_interval > 0) {
       setTimeout(() => {
         this.runTimeout();
@@ -18,6 +18,7 @@ def async_poller(
     *,
     trigger_event: Callable[[mel.WebEvent], Any],
     action: AsyncAction | None = None,
+    stream_url: str = '',
     key: str | None = None,
 ):
     """Creates an invisible component that will delay state changes asynchronously.
@@ -34,6 +35,10 @@ def async_poller(
     The other benefit of this component is that it works generically (rather than
     say implementing a custom snackbar widget as a web component).
 
+    If stream_url is set, the component also listens to that server-sent
+    event stream and fires trigger_event on every change it pushes; polling
+    is paused while the stream is connected.
+
     Returns:
       The web component that was created.
     """
@@ -46,5 +51,6 @@ def async_poller(
         properties={
             'polling_interval': action.duration_seconds if action else 1,
             'action': asdict(action) if action else {},
+            'stream_url': stream_url,
         },
     )
@@ -15,7 +15,7 @@ def conversation_list(conversations: list[StateConversation]):
         df_data['ID'].append(conversation.conversation_id)
         df_data['Name'].append(conversation.conversation_name)
         df_data['Status'].append('Open' if conversation.is_active else 'Closed')
-        df_data['Messages'].append(len(conversation.message_ids))
+        df_data['Messages'].append(conversation.message_count)
     df = pd.DataFrame(
         pd.DataFrame(df_data), columns=['ID', 'Name', 'Status', 'Messages']
     )
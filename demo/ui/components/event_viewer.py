@@ -4,10 +4,15 @@ from typing import Tuple
 import mesop as me
 import pandas as pd
 
+from service.types import GetEventParams
 from state.host_agent_service import GetEvents
 from state.host_agent_service import convert_event_to_state
 
 
+# The event list shows this many of the most recent events.
+EVENT_PAGE_SIZE = 500
+
+
 def flatten_content(content: list[tuple[str, str]]) -> str:
     parts = []
     for p in content:
@@ -29,7 +34,7 @@ def event_list():
         'Id': [],
         'Content': [],
     }
-    events = asyncio.run(GetEvents())
+    events = asyncio.run(GetEvents(GetEventParams(limit=EVENT_PAGE_SIZE)))
     for e in events:
         event = convert_event_to_state(e)
         df_data['Conversation ID'].append(event.context_id)
@@ -34,7 +34,11 @@ def page_scaffold():
         if app_state
         else None
     )
-    async_poller(action=action, trigger_event=refresh_app_state)
+    async_poller(
+        action=action,
+        trigger_event=refresh_app_state,
+        stream_url='/changes/stream',
+    )
 
     sidenav('')
 
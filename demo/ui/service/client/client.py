@@ -9,6 +9,8 @@ from service.types import (
     AgentClientJSONError,
     CreateConversationRequest,
     CreateConversationResponse,
+    GetChangesRequest,
+    GetChangesResponse,
     GetEventRequest,
     GetEventResponse,
     JSONRPCRequest,
@@ -66,6 +68,11 @@ class ConversationClient:
     ) -> ListConversationResponse:
         return ListConversationResponse(**await self._send_request(payload))
 
+    async def get_changes(
+        self, payload: GetChangesRequest
+    ) -> GetChangesResponse:
+        return GetChangesResponse(**await self._send_request(payload))
+
     async def get_events(self, payload: GetEventRequest) -> GetEventResponse:
         return GetEventResponse(**await self._send_request(payload))
 
@@ -40,6 +40,9 @@ from hosts.multiagent.remote_agent_connection import (
 from utils.agent_card import get_agent_card
 
 from service.server.application_manager import ApplicationManager
+from service.server.change_feed import ChangeFeed
+from service.server.event_log import EventLog
+from service.server.task_store import TaskStore
 from service.types import Conversation, Event
 
 
@@ -56,12 +59,14 @@ class ADKHostManager(ApplicationManager):
         http_client: httpx.AsyncClient,
         api_key: str = '',
         uses_vertex_ai: bool = False,
+        max_events: int = 10_000,
     ):
-        self._conversations: list[Conversation] = []
+        # Conversations and tasks are indexed by id, in insertion order.
+        self._conversations: dict[str, Conversation] = {}
         self._messages: list[Message] = []
-        self._tasks: list[Task] = []
-        self._events: dict[str, Event] = {}
-        self._pending_message_ids: list[str] = []
+        self._tasks = TaskStore()
+        self._events = EventLog(max_events)
+        self._pending_message_ids: dict[str, None] = {}
         self._agents: list[AgentCard] = []
         self._artifact_chunks: dict[str, list[Artifact]] = {}
         self._session_service = InMemorySessionService()
@@ -69,6 +74,7 @@ class ADKHostManager(ApplicationManager):
         self._memory_service = InMemoryMemoryService()
         self._host_agent = HostAgent([], http_client, self.task_callback)
         self._context_to_conversation: dict[str, str] = {}
+        self._change_feed = ChangeFeed()
         self.user_id = 'test_user'
         self.app_name = 'A2A'
         self.api_key = api_key or os.environ.get('GOOGLE_API_KEY', '')
@@ -111,7 +117,8 @@ class ADKHostManager(ApplicationManager):
         )
         conversation_id = session.id
         c = Conversation(conversation_id=conversation_id, is_active=True)
-        self._conversations.append(c)
+        self._conversations[conversation_id] = c
+        self._change_feed.record('conversation', conversation_id)
         return c
 
     def update_api_key(self, api_key: str):
@@ -136,24 +143,22 @@ class ADKHostManager(ApplicationManager):
             # Check if the last event in the conversation was tied to a task.
             if conversation.messages:
                 task_id = conversation.messages[-1].taskId
-                if task_id and task_still_open(
-                    next(
-                        filter(lambda x: x and x.id == task_id, self._tasks),
-                        None,
-                    )
-                ):
+                if task_id and task_still_open(self._tasks.get(task_id)):
                     message.taskId = task_id
         return message
 
     async def process_message(self, message: Message):
         message_id = message.messageId
         if message_id:
-            self._pending_message_ids.append(message_id)
+            self._pending_message_ids[message_id] = None
         context_id = message.contextId
         conversation = self.get_conversation(context_id)
         self._messages.append(message)
         if conversation:
             conversation.messages.append(message)
+            self._change_feed.record(
+                'conversation', conversation.conversation_id
+            )
         self.add_event(
             Event(
                 id=str(uuid.uuid4()),
@@ -220,16 +225,24 @@ class ADKHostManager(ApplicationManager):
 
         if conversation and response:
             conversation.messages.append(response)
-        self._pending_message_ids.remove(message_id)
+        self._pending_message_ids.pop(message_id, None)
+        if conversation:
+            # Recorded even without a response, so clients see the message
+            # is no longer pending.
+            self._change_feed.record(
+                'conversation', conversation.conversation_id
+            )
 
     def add_task(self, task: Task):
-        self._tasks.append(task)
+        self._tasks.add(task)
+        self._change_feed.record('task', task.id)
 
     def update_task(self, task: Task):
-        for i, t in enumerate(self._tasks):
-            if t.id == task.id:
-                self._tasks[i] = task
-                return
+        if self._tasks.update(task):
+            self._change_feed.record('task', task.id)
+
+    def get_task(self, task_id: str) -> Task | None:
+        return self._tasks.get(task_id)
 
     def task_callback(self, task: TaskCallbackArg, agent_card: AgentCard):
         self.emit_event(task, agent_card)
@@ -246,7 +259,7 @@ class ADKHostManager(ApplicationManager):
             self.update_task(current_task)
             return current_task
         # Otherwise this is a Task, either new or updated
-        elif not any(filter(lambda x: x and x.id == task.id, self._tasks)):
+        elif self._tasks.get(task.id) is None:
             self.attach_message_to_task(task.status.message, task.id)
             self.add_task(task)
             return task
@@ -313,27 +326,7 @@ class ADKHostManager(ApplicationManager):
             self._task_map[message.messageId] = task_id
 
     def insert_message_history(self, task: Task, message: Message | None):
-        if not message:
-            return
-        if task.history is None:
-            task.history = []
-        message_id = message.messageId
-        if not message_id:
-            return
-        if task.history and (
-            task.status.message
-            and task.status.message.messageId
-            not in [x.messageId for x in task.history]
-        ):
-            task.history.append(task.status.message)
-        elif not task.history and task.status.message:
-            task.history = [task.status.message]
-        else:
-            print(
-                'Message id already in history',
-                task.status.message.messageId if task.status.message else '',
-                task.history,
-            )
+        self._tasks.insert_message_history(task, message)
 
     def add_or_get_task(self, event: TaskCallbackArg):
         task_id = None
@@ -345,9 +338,7 @@ class ADKHostManager(ApplicationManager):
             task_id = event.taskId
         if not task_id:
             task_id = str(uuid.uuid4())
-        current_task = next(
-            filter(lambda x: x.id == task_id, self._tasks), None
-        )
+        current_task = self._tasks.get(task_id)
         if not current_task:
             context_id = event.contextId
             current_task = Task(
@@ -397,29 +388,33 @@ class ADKHostManager(ApplicationManager):
                 del self._artifact_chunks[artifact.artifactId][-1]
 
     def add_event(self, event: Event):
-        self._events[event.id] = event
+        self._events.add(event)
+        self._change_feed.record('event', event.id)
+
+    def get_event(self, event_id: str) -> Event | None:
+        return self._events.get(event_id)
+
+    def get_events(
+        self,
+        limit: int | None = None,
+        before: str | None = None,
+        after: str | None = None,
+        conversation_id: str | None = None,
+    ) -> list[Event]:
+        return self._events.page(limit, before, after, conversation_id)
 
     def get_conversation(
         self, conversation_id: Optional[str]
     ) -> Optional[Conversation]:
         if not conversation_id:
             return None
-        return next(
-            filter(
-                lambda c: c and c.conversation_id == conversation_id,
-                self._conversations,
-            ),
-            None,
-        )
+        return self._conversations.get(conversation_id)
 
     def get_pending_messages(self) -> list[tuple[str, str]]:
         rval = []
         for message_id in self._pending_message_ids:
             if message_id in self._task_map:
-                task_id = self._task_map[message_id]
-                task = next(
-                    filter(lambda x: x.id == task_id, self._tasks), None
-                )
+                task = self._tasks.get(self._task_map[message_id])
                 if not task:
                     rval.append((message_id, ''))
                 elif task.history and task.history[-1].parts:
@@ -448,21 +443,25 @@ class ADKHostManager(ApplicationManager):
         # Now update the host agent definition
         self._initialize_host()
 
+    @property
+    def change_feed(self) -> ChangeFeed:
+        return self._change_feed
+
     @property
     def agents(self) -> list[AgentCard]:
         return self._agents
 
     @property
     def conversations(self) -> list[Conversation]:
-        return self._conversations
+        return list(self._conversations.values())
 
     @property
     def tasks(self) -> list[Task]:
-        return self._tasks
+        return self._tasks.values()
 
     @property
     def events(self) -> list[Event]:
-        return sorted(self._events.values(), key=lambda x: x.timestamp)
+        return self._events.page()
 
     def adk_content_from_message(self, message: Message) -> types.Content:
         parts: list[types.Part] = []
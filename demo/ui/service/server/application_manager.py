@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
 
 from a2a.types import AgentCard, Message, Task
+from service.server.change_feed import ChangeFeed
 from service.types import Conversation, Event
 
 
@@ -31,6 +32,45 @@ class ApplicationManager(ABC):
     ) -> Conversation | None:
         pass
 
+    def get_task(self, task_id: str) -> Task | None:
+        return next(filter(lambda x: x.id == task_id, self.tasks), None)
+
+    def get_event(self, event_id: str) -> Event | None:
+        return next(filter(lambda x: x.id == event_id, self.events), None)
+
+    def get_events(
+        self,
+        limit: int | None = None,
+        before: str | None = None,
+        after: str | None = None,
+        conversation_id: str | None = None,
+    ) -> list[Event]:
+        """Returns a page of events in timestamp order.
+
+        Without an after cursor, limit takes the newest matching events.
+        """
+        events = self.events
+        if conversation_id is not None:
+            events = [
+                e for e in events if e.content.contextId == conversation_id
+            ]
+        ids = [e.id for e in events]
+        start = ids.index(after) + 1 if after in ids else 0
+        if before is not None and before not in ids:
+            return []
+        end = ids.index(before) if before is not None else len(ids)
+        if limit is not None and end - start > limit:
+            if after is not None:
+                end = start + limit
+            else:
+                start = end - limit
+        return events[start:end]
+
+    @property
+    def change_feed(self) -> ChangeFeed | None:
+        """The manager's change feed, or None if it does not keep one."""
+        return None
+
     @property
     @abstractmethod
     def conversations(self) -> list[Conversation]:
@@ -0,0 +1,144 @@
+import asyncio
+import threading
+
+from collections import OrderedDict
+
+
+class ChangeSubscription:
+    """Buffer of the changes recorded since a stream client last read.
+
+    Changes are pushed from whichever thread records them and read on the
+    subscriber's event loop. Like the feed, the buffer keeps only the latest
+    change of each item. If more than ``max_buffer`` items are waiting the
+    buffer is dropped and ``get`` reports an overflow, after which the client
+    has to reload everything.
+    """
+
+    def __init__(self, max_buffer: int = 1000):
+        self.max_buffer = max_buffer
+        self._pending: OrderedDict[tuple[str, str], int] = OrderedDict()
+        self._overflowed = False
+        self._lock = threading.Lock()
+        self._loop = asyncio.get_running_loop()
+        self._ready = asyncio.Event()
+
+    def push(self, kind: str, key: str, seq: int):
+        with self._lock:
+            if self._overflowed:
+                return
+            self._pending[(kind, key)] = seq
+            self._pending.move_to_end((kind, key))
+            if len(self._pending) > self.max_buffer:
+                self._pending.clear()
+                self._overflowed = True
+        try:
+            self._loop.call_soon_threadsafe(self._ready.set)
+        except RuntimeError:
+            # The subscriber's loop is closed; it is about to unsubscribe.
+            pass
+
+    async def get(
+        self, timeout: float | None = None
+    ) -> list[tuple[int, str, str]] | None:
+        """Waits for changes and returns them as (seq, kind, key), in order.
+
+        Returns an empty list if timeout expires first, and None if the
+        buffer overflowed since the previous call.
+        """
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+        except TimeoutError:
+            return []
+        with self._lock:
+            self._ready.clear()
+            if self._overflowed:
+                self._overflowed = False
+                return None
+            changes = [
+                (seq, kind, key) for (kind, key), seq in self._pending.items()
+            ]
+            self._pending.clear()
+        return changes
+
+
+class ChangeFeed:
+    """Versioned log of which conversations, tasks and events changed.
+
+    Every change gets the next sequence number. Only the latest change of
+    each (kind, key) is kept, so the log grows with the number of distinct
+    items rather than the number of updates, and a client that passes the
+    cursor of its previous sync gets each changed item once. When more than
+    ``max_entries`` items are tracked the oldest entries are dropped and
+    ``floor`` moves up; a client whose cursor is below the floor has missed
+    changes and must reload everything.
+    """
+
+    def __init__(self, max_entries: int = 100_000):
+        self.max_entries = max_entries
+        self.floor = 0
+        self._cursor = 0
+        self._entries: OrderedDict[tuple[str, str], int] = OrderedDict()
+        self._subscriptions: set[ChangeSubscription] = set()
+        self._lock = threading.Lock()
+
+    @property
+    def cursor(self) -> int:
+        """The sequence number of the latest change."""
+        return self._cursor
+
+    def record(self, kind: str, key: str) -> int:
+        """Records a change to an item and returns its sequence number."""
+        with self._lock:
+            self._cursor += 1
+            self._entries[(kind, key)] = self._cursor
+            self._entries.move_to_end((kind, key))
+            while len(self._entries) > self.max_entries:
+                _, self.floor = self._entries.popitem(last=False)
+            seq = self._cursor
+            subscriptions = list(self._subscriptions)
+        for subscription in subscriptions:
+            subscription.push(kind, key, seq)
+        return seq
+
+    def subscribe(self, max_buffer: int = 1000) -> ChangeSubscription:
+        """Starts buffering changes for a stream client.
+
+        Must be called on the event loop the client is served on.
+        """
+        subscription = ChangeSubscription(max_buffer)
+        with self._lock:
+            self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: ChangeSubscription):
+        with self._lock:
+            self._subscriptions.discard(subscription)
+
+    def is_stale(self, since: int) -> bool:
+        """Whether a client at cursor since must reload everything."""
+        return since < self.floor or since > self._cursor
+
+    def entries_since(self, since: int) -> list[tuple[int, str, str]]:
+        """Returns the changes after since as (seq, kind, key), in order.
+
+        The entries are walked from the newest, so the cost is proportional
+        to the number of changes returned.
+        """
+        entries = []
+        with self._lock:
+            for (kind, key), seq in reversed(self._entries.items()):
+                if seq <= since:
+                    break
+                entries.append((seq, kind, key))
+        entries.reverse()
+        return entries
+
+    def changes_since(self, since: int) -> dict[str, list[str]]:
+        """Returns the keys changed after since, grouped by kind.
+
+        Keys are in the order of their latest change.
+        """
+        changes: dict[str, list[str]] = {}
+        for _, kind, key in self.entries_since(since):
+            changes.setdefault(kind, []).append(key)
+        return changes
@@ -0,0 +1,169 @@
+import bisect
+import itertools
+import threading
+
+from typing import TYPE_CHECKING
+
+
+if TYPE_CHECKING:
+    from service.types import Event
+
+
+class _SortedEvents:
+    """Events kept sorted by (timestamp, arrival) in parallel lists.
+
+    The entries before ``head`` were removed from the front. They are
+    dropped in one go once they fill half of the lists, so removing the
+    oldest event, as retention does, is amortized O(1).
+    """
+
+    def __init__(self):
+        self.keys: list[tuple[float, int]] = []
+        self.events: list['Event | None'] = []
+        self.head = 0
+
+    def __len__(self) -> int:
+        return len(self.events) - self.head
+
+    def oldest(self) -> 'Event':
+        return self.events[self.head]
+
+    def add(self, key: tuple[float, int], event: 'Event'):
+        # Events almost always arrive in timestamp order, so this is
+        # usually an append.
+        if not self or key >= self.keys[-1]:
+            self.keys.append(key)
+            self.events.append(event)
+            return
+        i = bisect.bisect_right(self.keys, key, self.head)
+        self.keys.insert(i, key)
+        self.events.insert(i, event)
+
+    def remove(self, key: tuple[float, int]):
+        i = bisect.bisect_left(self.keys, key, self.head)
+        if i == len(self.keys) or self.keys[i] != key:
+            return
+        if i > self.head:
+            del self.keys[i]
+            del self.events[i]
+            return
+        # The key stays so the lists remain sorted for bisect.
+        self.events[i] = None
+        self.head += 1
+        if self.head * 2 >= len(self.keys):
+            del self.keys[: self.head]
+            del self.events[: self.head]
+            self.head = 0
+
+    def page(
+        self,
+        limit: int | None,
+        before: tuple[float, int] | None,
+        after: tuple[float, int] | None,
+    ) -> list['Event']:
+        start = (
+            self.head
+            if after is None
+            else bisect.bisect_right(self.keys, after, self.head)
+        )
+        end = (
+            len(self.keys)
+            if before is None
+            else bisect.bisect_left(self.keys, before, self.head)
+        )
+        if limit is not None and end - start > limit:
+            # Paging forward from a cursor takes the oldest events after it,
+            # otherwise the newest events are taken.
+            if after is not None:
+                end = start + limit
+            else:
+                start = end - limit
+        return self.events[start:end]
+
+
+class EventLog:
+    """Timestamp-ordered, bounded log of the events shown in the UI.
+
+    Events are inserted in order as they arrive, so reading a page costs
+    O(log n + page size) instead of sorting every event. Events are also
+    indexed by conversation. Past ``max_events`` the oldest events are
+    dropped.
+    """
+
+    def __init__(self, max_events: int = 10_000):
+        self.max_events = max_events
+        self._all = _SortedEvents()
+        self._by_conversation: dict[str, _SortedEvents] = {}
+        self._keys: dict[str, tuple[float, int]] = {}
+        self._events: dict[str, 'Event'] = {}
+        self._arrival = itertools.count()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._all)
+
+    def add(self, event: 'Event'):
+        key = (event.timestamp, next(self._arrival))
+        with self._lock:
+            if event.id in self._events:
+                self._remove(event.id)
+            self._keys[event.id] = key
+            self._events[event.id] = event
+            self._all.add(key, event)
+            self._by_conversation.setdefault(
+                conversation_of(event), _SortedEvents()
+            ).add(key, event)
+            while len(self._all) > self.max_events:
+                self._remove(self._all.oldest().id)
+
+    def get(self, event_id: str) -> 'Event | None':
+        return self._events.get(event_id)
+
+    def page(
+        self,
+        limit: int | None = None,
+        before: str | None = None,
+        after: str | None = None,
+        conversation_id: str | None = None,
+    ) -> list['Event']:
+        """Returns events in timestamp order.
+
+        Args:
+            limit: The maximum number of events to return. Without an
+                   after cursor these are the newest matching events.
+            before: Only return events older than the event with this id.
+            after: Only return events newer than the event with this id.
+            conversation_id: Only return events of this conversation.
+        """
+        with self._lock:
+            if before is not None and before not in self._keys:
+                return []
+            events = (
+                self._all
+                if conversation_id is None
+                else self._by_conversation.get(conversation_id)
+            )
+            if events is None:
+                return []
+            # An unknown after cursor was dropped by retention, so every
+            # retained event is newer than it.
+            return events.page(
+                limit,
+                self._keys.get(before) if before is not None else None,
+                self._keys.get(after) if after is not None else None,
+            )
+
+    def _remove(self, event_id: str):
+        key = self._keys.pop(event_id)
+        event = self._events.pop(event_id)
+        self._all.remove(key)
+        conversation_id = conversation_of(event)
+        events = self._by_conversation.get(conversation_id)
+        if events is not None:
+            events.remove(key)
+            if not events:
+                del self._by_conversation[conversation_id]
+
+
+def conversation_of(event: 'Event') -> str:
+    return event.content.contextId or ''
@@ -0,0 +1,175 @@
+import hashlib
+import os
+import re
+import threading
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+
+
+# An entity tag in an If-None-Match list, the W/ of weak tags left out, or *.
+_ENTITY_TAG = re.compile(r'(?:W/)?("[^"]*")|(\*)')
+
+
+@dataclass
+class CachedFile:
+    """A cached file; its bytes are in memory or in a spill file."""
+
+    file_id: str
+    mime_type: str
+    size: int
+    data: bytes | None = None
+    path: Path | None = None
+
+    @property
+    def etag(self) -> str:
+        return f'"{self.file_id}"'
+
+    def read(self, start: int = 0, end: int | None = None) -> bytes:
+        """Returns the bytes in [start, end), all of them by default."""
+        end = self.size if end is None else end
+        if self.data is not None:
+            return self.data[start:end]
+        with open(self.path, 'rb') as f:
+            f.seek(start)
+            return f.read(end - start)
+
+
+class FileCache:
+    """Size-bounded LRU cache of file contents, keyed by content hash.
+
+    A file's id is the SHA-256 of its bytes, so identical files are stored
+    once and an id always refers to the same content. At most ``max_bytes``
+    are kept in memory; the least recently used files beyond that are
+    written to ``spill_dir`` if one is set, which holds at most
+    ``max_spill_bytes``, and are dropped otherwise.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 64 * 1024 * 1024,
+        spill_dir: str | Path | None = None,
+        max_spill_bytes: int = 1024 * 1024 * 1024,
+    ):
+        self.max_bytes = max_bytes
+        self.spill_dir = Path(spill_dir) if spill_dir is not None else None
+        self.max_spill_bytes = max_spill_bytes
+        self._memory: OrderedDict[str, CachedFile] = OrderedDict()
+        self._spilled: OrderedDict[str, CachedFile] = OrderedDict()
+        self._memory_bytes = 0
+        self._spilled_bytes = 0
+        self._lock = threading.Lock()
+
+    def __contains__(self, file_id: str) -> bool:
+        return file_id in self._memory or file_id in self._spilled
+
+    def put(self, data: bytes, mime_type: str) -> str:
+        """Caches a file and returns its id."""
+        file_id = hashlib.sha256(data).hexdigest()
+        with self._lock:
+            if file_id in self._memory:
+                self._memory.move_to_end(file_id)
+                return file_id
+            spilled = self._spilled.pop(file_id, None)
+            if spilled is not None:
+                self._spilled_bytes -= spilled.size
+                self._unlink(spilled)
+            self._memory[file_id] = CachedFile(
+                file_id=file_id, mime_type=mime_type, size=len(data), data=data
+            )
+            self._memory_bytes += len(data)
+            self._evict()
+        return file_id
+
+    def get(self, file_id: str) -> CachedFile | None:
+        with self._lock:
+            cached = self._memory.get(file_id)
+            if cached is not None:
+                self._memory.move_to_end(file_id)
+                return cached
+            cached = self._spilled.get(file_id)
+            if cached is not None:
+                self._spilled.move_to_end(file_id)
+            return cached
+
+    def _evict(self):
+        # Never evicts the file just added, even if it exceeds max_bytes.
+        while self._memory_bytes > self.max_bytes and len(self._memory) > 1:
+            _, cached = self._memory.popitem(last=False)
+            self._memory_bytes -= cached.size
+            self._spill(cached)
+        while self._spilled_bytes > self.max_spill_bytes and self._spilled:
+            _, cached = self._spilled.popitem(last=False)
+            self._spilled_bytes -= cached.size
+            self._unlink(cached)
+
+    def _spill(self, cached: CachedFile):
+        if self.spill_dir is None or cached.size > self.max_spill_bytes:
+            return
+        path = self.spill_dir / cached.file_id
+        try:
+            self.spill_dir.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(cached.data)
+        except OSError as e:
+            print('Failed to spill cached file', cached.file_id, e)
+            return
+        self._spilled[cached.file_id] = CachedFile(
+            file_id=cached.file_id,
+            mime_type=cached.mime_type,
+            size=cached.size,
+            path=path,
+        )
+        self._spilled_bytes += cached.size
+
+    def _unlink(self, cached: CachedFile):
+        try:
+            os.remove(cached.path)
+        except OSError:
+            pass
+
+
+def parse_range(header: str | None, size: int) -> tuple[int, int] | None:
+    """Parses a single-range Range header into [start, end) offsets.
+
+    Returns None if the whole file should be served: no header, a unit
+    other than bytes, several ranges, or a malformed range, which RFC 9110
+    says to ignore.
+
+    Raises:
+        ValueError: If the range cannot be satisfied.
+    """
+    if not header:
+        return None
+    unit, _, ranges = header.partition('=')
+    if unit.strip() != 'bytes' or ',' in ranges:
+        return None
+    first, sep, last = ranges.strip().partition('-')
+    if (
+        not sep
+        or not (first or last)
+        or not all(p.isascii() and p.isdigit() for p in (first, last) if p)
+    ):
+        return None
+    if not first:
+        # A suffix range: the last N bytes.
+        length = int(last)
+        if length == 0 or size == 0:
+            raise ValueError(f'Unsatisfiable range: {header}')
+        return max(size - length, 0), size
+    start = int(first)
+    if last and int(last) < start:
+        return None
+    if start >= size:
+        raise ValueError(f'Unsatisfiable range: {header}')
+    end = int(last) + 1 if last else size
+    return start, min(end, size)
+
+
+def parse_etags(header: str | None) -> list[str]:
+    """Returns the entity tags of an If-None-Match header.
+
+    Weak tags are returned without their W/ prefix, as If-None-Match
+    compares tags weakly; a * matching any tag is returned as is.
+    """
+    return [tag or star for tag, star in _ENTITY_TAG.findall(header or '')]
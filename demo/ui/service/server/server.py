@@ -1,17 +1,25 @@
 import asyncio
 import base64
+import json
 import os
+import tempfile
 import threading
-import uuid
 from typing import cast
 
 import httpx
 
-from a2a.types import FilePart, FileWithUri, Message, Part
+from a2a.types import FilePart, FileWithBytes, FileWithUri, Message, Part
 from fastapi import APIRouter, FastAPI, Request, Response
+from fastapi.responses import StreamingResponse
 
 from service.types import (
+    ChangeSet,
+    Conversation,
+    ConversationInfo,
     CreateConversationResponse,
+    GetChangesParams,
+    GetChangesResponse,
+    GetEventParams,
     GetEventResponse,
     ListAgentResponse,
     ListConversationResponse,
@@ -25,6 +33,7 @@ from service.types import (
 
 from .adk_host_manager import ADKHostManager, get_message_id
 from .application_manager import ApplicationManager
+from .file_cache import FileCache, parse_etags, parse_range
 from .in_memory_manager import InMemoryFakeAgentManager
 
 
@@ -35,8 +44,17 @@ class ConversationServer:
     agents and provide details about the executions.
     """
 
-    def __init__(self, app: FastAPI, http_client: httpx.AsyncClient):
+    def __init__(
+        self,
+        app: FastAPI,
+        http_client: httpx.AsyncClient,
+        stream_buffer_size: int = 1000,
+        stream_keepalive: float = 15.0,
+        file_cache: FileCache | None = None,
+    ):
         agent_manager = os.environ.get('A2A_HOST', 'ADK')
+        self.stream_buffer_size = stream_buffer_size
+        self.stream_keepalive = stream_keepalive
         self.manager: ApplicationManager
 
         # Get API key from environment
@@ -53,8 +71,12 @@ class ConversationServer:
             )
         else:
             self.manager = InMemoryFakeAgentManager()
-        self._file_cache = {}  # dict[str, FilePart] maps file id to message data
-        self._message_to_cache = {}  # dict[str, str] maps message id to cache id
+        # Messages only keep urls of their files, so files evicted from
+        # memory are spilled to disk rather than dropped.
+        self._file_cache = file_cache or FileCache(
+            spill_dir=os.environ.get('A2A_UI_FILE_CACHE_DIR')
+            or tempfile.mkdtemp(prefix='a2a-ui-files-')
+        )
 
         app.add_api_route(
             '/conversation/create', self._create_conversation, methods=['POST']
@@ -71,6 +93,10 @@ class ConversationServer:
             '/message/pending', self._pending_messages, methods=['POST']
         )
         app.add_api_route('/task/list', self._list_tasks, methods=['POST'])
+        app.add_api_route('/changes/get', self._get_changes, methods=['POST'])
+        app.add_api_route(
+            '/changes/stream', self._stream_changes, methods=['GET']
+        )
         app.add_api_route(
             '/agent/register', self._register_agent, methods=['POST']
         )
@@ -123,6 +149,13 @@ class ConversationServer:
         return ListMessageResponse(result=[])
 
     def cache_content(self, messages: list[Message]):
+        """Moves inline file bytes into the file cache.
+
+        The file parts of the manager's messages are replaced in place by
+        url references, so the file cache holds the only copy of the bytes
+        and each part is decoded once. Files are dropped from the cache only
+        once its spill directory is full.
+        """
         rval = []
         for m in messages:
             message_id = get_message_id(m)
@@ -130,17 +163,14 @@ class ConversationServer:
                 rval.append(m)
                 continue
             new_parts: list[Part] = []
-            for i, p in enumerate(m.parts):
+            for p in m.parts:
                 part = p.root
-                if part.kind != 'file':
+                if part.kind != 'file' or not isinstance(
+                    part.file, FileWithBytes
+                ):
                     new_parts.append(p)
                     continue
-                message_part_id = f'{message_id}:{i}'
-                if message_part_id in self._message_to_cache:
-                    cache_id = self._message_to_cache[message_part_id]
-                else:
-                    cache_id = str(uuid.uuid4())
-                    self._message_to_cache[message_part_id] = cache_id
+                cache_id = self.cache_file(part)
                 # Replace the part data with a url reference
                 new_parts.append(
                     Part(
@@ -152,12 +182,18 @@ class ConversationServer:
                         )
                     )
                 )
-                if cache_id not in self._file_cache:
-                    self._file_cache[cache_id] = part
             m.parts = new_parts
             rval.append(m)
         return rval
 
+    def cache_file(self, part: FilePart) -> str:
+        mime_type = part.file.mimeType or 'application/octet-stream'
+        if 'image' in mime_type:
+            data = base64.b64decode(part.file.bytes)
+        else:
+            data = part.file.bytes.encode('utf-8')
+        return self._file_cache.put(data, mime_type)
+
     async def _pending_messages(self):
         return PendingMessageResponse(
             result=self.manager.get_pending_messages()
@@ -166,12 +202,147 @@ class ConversationServer:
     def _list_conversation(self):
         return ListConversationResponse(result=self.manager.conversations)
 
-    def _get_events(self):
-        return GetEventResponse(result=self.manager.events)
+    async def _get_events(self, request: Request):
+        body = await request.body()
+        message_data = json.loads(body) if body else {}
+        params = GetEventParams(**(message_data.get('params') or {}))
+        return GetEventResponse(
+            result=self.manager.get_events(
+                limit=params.limit,
+                before=params.before,
+                after=params.after,
+                conversation_id=params.conversation_id,
+            )
+        )
 
     def _list_tasks(self):
         return ListTaskResponse(result=self.manager.tasks)
 
+    async def _get_changes(self, request: Request):
+        message_data = await request.json()
+        params = GetChangesParams(**(message_data.get('params') or {}))
+        return GetChangesResponse(result=self.get_changes(params))
+
+    def get_changes(self, params: GetChangesParams) -> ChangeSet:
+        """Returns what changed since the client's last sync.
+
+        Conversations and tasks changed after params.since are looked up in
+        the manager's change feed; a client without a usable cursor gets all
+        of them with reset set. Messages are append-only, so the conversation's
+        messages past params.message_offset are returned.
+        """
+        feed = self.manager.change_feed
+        if feed is None or params.since <= 0 or feed.is_stale(params.since):
+            cursor = feed.cursor if feed else 0
+            changes = ChangeSet(
+                cursor=cursor,
+                reset=True,
+                conversations=[
+                    conversation_info(c) for c in self.manager.conversations
+                ],
+                tasks=self.manager.tasks,
+            )
+        else:
+            cursor = feed.cursor
+            changed = feed.changes_since(params.since)
+            conversations = (
+                self.manager.get_conversation(conversation_id)
+                for conversation_id in changed.get('conversation', [])
+            )
+            tasks = (
+                self.manager.get_task(task_id)
+                for task_id in changed.get('task', [])
+            )
+            changes = ChangeSet(
+                cursor=cursor,
+                conversations=[
+                    conversation_info(c) for c in conversations if c
+                ],
+                tasks=[t for t in tasks if t],
+            )
+
+        conversation = self.manager.get_conversation(params.conversation_id)
+        if conversation:
+            messages = conversation.messages
+            offset = params.message_offset
+            if offset < 0 or offset > len(messages):
+                offset = 0
+            changes.messages = self.cache_content(messages[offset:])
+            changes.message_offset = len(messages)
+        changes.pending_messages = self.manager.get_pending_messages()
+        return changes
+
+    async def _stream_changes(self, request: Request):
+        """Pushes conversation, task and event changes as server-sent events.
+
+        Each SSE id is the change's cursor, so a reconnecting EventSource
+        resumes from its Last-Event-ID; a 'since' query parameter does the
+        same for other clients. A 'reset' event tells the client it missed
+        changes and must reload, e.g. when its buffer of
+        stream_buffer_size changes overflowed.
+        """
+        feed = self.manager.change_feed
+        if feed is None:
+            return Response(status_code=404)
+        cursor = request.headers.get('last-event-id')
+        try:
+            since = int(cursor or request.query_params.get('since', 0))
+        except ValueError:
+            since = 0
+        # Subscribe before reading the backlog so no change falls in between.
+        subscription = feed.subscribe(self.stream_buffer_size)
+
+        async def events():
+            try:
+                if since <= 0 or feed.is_stale(since):
+                    last_seq = feed.cursor
+                    yield sse_event('reset', last_seq, {'cursor': last_seq})
+                    changes = []
+                else:
+                    last_seq = since
+                    changes = feed.entries_since(since)
+                while True:
+                    for seq, kind, key in changes:
+                        if seq <= last_seq:
+                            continue
+                        last_seq = seq
+                        item = self.change_item(kind, key)
+                        if item is not None:
+                            yield sse_event(kind, seq, item)
+                    if await request.is_disconnected():
+                        return
+                    changes = await subscription.get(self.stream_keepalive)
+                    if changes is None:
+                        last_seq = feed.cursor
+                        yield sse_event('reset', last_seq, {'cursor': last_seq})
+                        changes = []
+                    elif not changes:
+                        yield ': keepalive\n\n'
+            finally:
+                feed.unsubscribe(subscription)
+
+        return StreamingResponse(
+            events(),
+            media_type='text/event-stream',
+            headers={'Cache-Control': 'no-cache'},
+        )
+
+    def change_item(self, kind: str, key: str) -> dict | None:
+        """Returns the current state of a changed item, if it still exists."""
+        if kind == 'conversation':
+            conversation = self.manager.get_conversation(key)
+            if conversation:
+                return conversation_info(conversation).model_dump(mode='json')
+        elif kind == 'task':
+            task = self.manager.get_task(key)
+            if task:
+                return task.model_dump(mode='json', exclude_none=True)
+        elif kind == 'event':
+            event = self.manager.get_event(key)
+            if event:
+                return event.model_dump(mode='json', exclude_none=True)
+        return None
+
     async def _register_agent(self, request: Request):
         message_data = await request.json()
         url = message_data['params']
@@ -181,16 +352,50 @@ class ConversationServer:
     async def _list_agents(self):
         return ListAgentResponse(result=self.manager.agents)
 
-    def _files(self, file_id):
-        if file_id not in self._file_cache:
-            raise Exception('file not found')
-        part = self._file_cache[file_id]
-        if 'image' in part.file.mimeType:
+    def _files(self, file_id: str, request: Request):
+        """Serves a cached file with ETag and single-range support.
+
+        File ids are content hashes, so browsers may cache responses
+        indefinitely.
+        """
+        cached = self._file_cache.get(file_id)
+        if cached is None:
+            return Response(status_code=404)
+        headers = {
+            'ETag': cached.etag,
+            'Cache-Control': 'private, max-age=31536000, immutable',
+            'Accept-Ranges': 'bytes',
+        }
+        if_none_match = parse_etags(request.headers.get('if-none-match'))
+        if cached.etag in if_none_match or '*' in if_none_match:
+            return Response(status_code=304, headers=headers)
+
+        if_range = request.headers.get('if-range')
+        range_header = request.headers.get('range')
+        if if_range and if_range != cached.etag:
+            range_header = None
+        try:
+            byte_range = parse_range(range_header, cached.size)
+        except ValueError:
+            headers['Content-Range'] = f'bytes */{cached.size}'
+            return Response(status_code=416, headers=headers)
+        start, end = byte_range or (0, cached.size)
+        try:
+            content = cached.read(start, end)
+        except OSError:
+            # A spilled file was evicted while being served.
+            return Response(status_code=404)
+        if byte_range is None:
             return Response(
-                content=base64.b64decode(part.file.bytes),
-                media_type=part.file.mimeType,
+                content=content, media_type=cached.mime_type, headers=headers
             )
-        return Response(content=part.file.bytes, media_type=part.file.mimeType)
+        headers['Content-Range'] = f'bytes {start}-{end - 1}/{cached.size}'
+        return Response(
+            content=content,
+            status_code=206,
+            media_type=cached.mime_type,
+            headers=headers,
+        )
 
     async def _update_api_key(self, request: Request):
         """Update the API key"""
@@ -205,3 +410,17 @@ class ConversationServer:
             return {'status': 'error', 'message': 'No API key provided'}
         except Exception as e:
             return {'status': 'error', 'message': str(e)}
+
+
+def sse_event(event: str, event_id: int, data: dict) -> str:
+    return f'event: {event}\nid: {event_id}\ndata: {json.dumps(data)}\n\n'
+
+
+def conversation_info(conversation: Conversation) -> ConversationInfo:
+    return ConversationInfo(
+        conversation_id=conversation.conversation_id,
+        is_active=conversation.is_active,
+        name=conversation.name,
+        task_ids=conversation.task_ids,
+        message_count=len(conversation.messages),
+    )
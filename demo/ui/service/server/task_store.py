@@ -0,0 +1,73 @@
+from typing import TYPE_CHECKING
+
+
+if TYPE_CHECKING:
+    from a2a.types import Message, Task
+
+
+class TaskStore:
+    """Tasks of the UI indexed by id, in insertion order.
+
+    Alongside each task the set of message ids in its history is kept, so
+    checking whether a status message is already in the history is O(1).
+    The set is dropped when the task object is replaced and rebuilt if the
+    history was changed behind its back.
+    """
+
+    def __init__(self):
+        self._tasks: dict[str, Task] = {}
+        self._message_ids: dict[str, set[str]] = {}
+
+    def get(self, task_id: str) -> 'Task | None':
+        return self._tasks.get(task_id)
+
+    def values(self) -> list['Task']:
+        return list(self._tasks.values())
+
+    def add(self, task: 'Task'):
+        self._tasks[task.id] = task
+
+    def update(self, task: 'Task') -> bool:
+        """Replaces a known task, returning False if the task is unknown."""
+        current = self._tasks.get(task.id)
+        if current is None:
+            return False
+        if current is not task:
+            self._message_ids.pop(task.id, None)
+        self._tasks[task.id] = task
+        return True
+
+    def insert_message_history(self, task: 'Task', message: 'Message | None'):
+        """Appends the task's status message to its history, once."""
+        if not message:
+            return
+        if task.history is None:
+            task.history = []
+        message_id = message.messageId
+        if not message_id:
+            return
+        history_ids = self.history_message_ids(task)
+        if task.history and (
+            task.status.message
+            and task.status.message.messageId not in history_ids
+        ):
+            task.history.append(task.status.message)
+            history_ids.add(task.status.message.messageId)
+        elif not task.history and task.status.message:
+            task.history = [task.status.message]
+            history_ids.add(task.status.message.messageId)
+        else:
+            print(
+                'Message id already in history',
+                task.status.message.messageId if task.status.message else '',
+                task.history,
+            )
+
+    def history_message_ids(self, task: 'Task') -> set[str]:
+        """Returns the set of message ids in the task's history."""
+        history = task.history or []
+        ids = self._message_ids.get(task.id)
+        if ids is None or len(ids) != len(history):
+            ids = {x.messageId for x in history}
+            self._message_ids[task.id] = ids
+        return ids
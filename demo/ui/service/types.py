@@ -71,8 +71,18 @@ class SendMessageResponse(JSONRPCResponse):
     result: Message | MessageInfo | None = None
 
 
+class GetEventParams(BaseModel):
+    # Without an 'after' cursor the newest events are returned.
+    limit: int | None = Field(default=None, ge=1)
+    # Event ids to page from; the cursor event itself is excluded.
+    before: str | None = None
+    after: str | None = None
+    conversation_id: str | None = None
+
+
 class GetEventRequest(JSONRPCRequest):
     method: Literal['events/get'] = 'events/get'
+    params: GetEventParams | None = None
 
 
 class GetEventResponse(JSONRPCResponse):
@@ -111,6 +121,47 @@ class ListTaskResponse(JSONRPCResponse):
     result: list[Task] | None = None
 
 
+class ConversationInfo(BaseModel):
+    """A conversation without its messages, for change sets."""
+
+    conversation_id: str
+    is_active: bool
+    name: str = ''
+    task_ids: list[str] = Field(default_factory=list)
+    # Only the count; the messages themselves are fetched with
+    # GetChangesParams.message_offset.
+    message_count: int = 0
+
+
+class GetChangesParams(BaseModel):
+    # Cursor returned by the previous sync, 0 for a full load.
+    since: int = 0
+    conversation_id: str | None = None
+    # Number of messages of the conversation the client already has.
+    message_offset: int = 0
+
+
+class GetChangesRequest(JSONRPCRequest):
+    method: Literal['changes/get'] = 'changes/get'
+    params: GetChangesParams = Field(default_factory=GetChangesParams)
+
+
+class ChangeSet(BaseModel):
+    cursor: int
+    # Set when the client's cursor could not be served incrementally; the
+    # conversations and tasks are then complete and replace the client's.
+    reset: bool = False
+    conversations: list[ConversationInfo] = Field(default_factory=list)
+    tasks: list[Task] = Field(default_factory=list)
+    messages: list[Message] = Field(default_factory=list)
+    message_offset: int = 0
+    pending_messages: list[tuple[str, str]] = Field(default_factory=list)
+
+
+class GetChangesResponse(JSONRPCResponse):
+    result: ChangeSet | None = None
+
+
 class RegisterAgentRequest(JSONRPCRequest):
     method: Literal['agent/register'] = 'agent/register'
     # This is the base url of the agent card
@@ -4,14 +4,20 @@ import sys
 import traceback
 import uuid
 
+from collections.abc import Callable
 from typing import Any
 
 from a2a.types import FileWithBytes, Message, Part, Role, Task, TaskState
 from service.client.client import ConversationClient
 from service.types import (
+    ChangeSet,
     Conversation,
+    ConversationInfo,
     CreateConversationRequest,
     Event,
+    GetChangesParams,
+    GetChangesRequest,
+    GetEventParams,
     GetEventRequest,
     ListAgentRequest,
     ListConversationRequest,
@@ -88,10 +94,10 @@ async def AddRemoteAgent(path: str):
         print('Failed to register the agent', e)
 
 
-async def GetEvents() -> list[Event]:
+async def GetEvents(params: GetEventParams | None = None) -> list[Event]:
     client = ConversationClient(server_url)
     try:
-        response = await client.get_events(GetEventRequest())
+        response = await client.get_events(GetEventRequest(params=params))
         return response.result if response.result else []
     except Exception as e:
         print('Failed to get events', e)
@@ -132,39 +138,80 @@ async def ListMessages(conversation_id: str) -> list[Message]:
     return []
 
 
+async def GetChanges(params: GetChangesParams) -> ChangeSet | None:
+    client = ConversationClient(server_url)
+    try:
+        response = await client.get_changes(GetChangesRequest(params=params))
+        return response.result
+    except Exception as e:
+        print('Failed to get changes ', e)
+    return None
+
+
 async def UpdateAppState(state: AppState, conversation_id: str):
-    """Update the app state."""
+    """Update the app state with the changes since the last update."""
     try:
+        if conversation_id != state.synced_conversation_id:
+            state.message_offset = 0
+        changes = await GetChanges(
+            GetChangesParams(
+                since=state.sync_cursor,
+                conversation_id=conversation_id or None,
+                message_offset=state.message_offset,
+            )
+        )
+        if changes is None:
+            return
         if conversation_id:
             state.current_conversation_id = conversation_id
-            messages = await ListMessages(conversation_id)
-            if not messages:
-                state.messages = []
+            messages = [convert_message_to_state(x) for x in changes.messages]
+            if state.message_offset == 0:
+                state.messages = messages
             else:
-                state.messages = [convert_message_to_state(x) for x in messages]
-        conversations = await ListConversations()
-        if not conversations:
-            state.conversations = []
+                upsert(state.messages, messages, lambda x: x.message_id)
+        state.synced_conversation_id = conversation_id
+        state.message_offset = changes.message_offset
+
+        conversations = [
+            convert_conversation_to_state(x) for x in changes.conversations
+        ]
+        tasks = [
+            SessionTask(
+                context_id=extract_conversation_id(task),
+                task=convert_task_to_state(task),
+            )
+            for task in changes.tasks
+        ]
+        if changes.reset:
+            state.conversations = conversations
+            state.task_list = tasks
         else:
-            state.conversations = [
-                convert_conversation_to_state(x) for x in conversations
-            ]
-
-        state.task_list = []
-        for task in await GetTasks():
-            state.task_list.append(
-                SessionTask(
-                    context_id=extract_conversation_id(task),
-                    task=convert_task_to_state(task),
-                )
+            upsert(
+                state.conversations, conversations, lambda x: x.conversation_id
             )
-        state.background_tasks = await GetProcessingMessages()
+            upsert(state.task_list, tasks, lambda x: x.task.task_id)
+        state.sync_cursor = changes.cursor
+        state.background_tasks = dict(changes.pending_messages)
         state.message_aliases = GetMessageAliases()
     except Exception as e:
         print('Failed to update state: ', e)
         traceback.print_exc(file=sys.stdout)
 
 
+def upsert(items: list, updates: list, key: Callable[[Any], str]):
+    """Replaces the items with the key of an update, appends the others."""
+    if not updates:
+        return
+    index = {key(x): i for i, x in enumerate(items)}
+    for update in updates:
+        i = index.get(key(update))
+        if i is None:
+            index[key(update)] = len(items)
+            items.append(update)
+        else:
+            items[i] = update
+
+
 async def UpdateApiKey(api_key: str):
     """Update the API key"""
     import httpx
@@ -199,13 +246,17 @@ def convert_message_to_state(message: Message) -> StateMessage:
 
 
 def convert_conversation_to_state(
-    conversation: Conversation,
+    conversation: Conversation | ConversationInfo,
 ) -> StateConversation:
+    if isinstance(conversation, ConversationInfo):
+        message_count = conversation.message_count
+    else:
+        message_count = len(conversation.messages)
     return StateConversation(
         conversation_id=conversation.conversation_id,
         conversation_name=conversation.name,
         is_active=conversation.is_active,
-        message_ids=[extract_message_id(x) for x in conversation.messages],
+        message_count=message_count,
     )
 
 
@@ -20,7 +20,7 @@ class StateConversation:
     conversation_id: str = ''
     conversation_name: str = ''
     is_active: bool = True
-    message_ids: list[str] = dataclasses.field(default_factory=list)
+    message_count: int = 0
 
 
 @dataclass
@@ -92,6 +92,10 @@ class AppState:
     # This is used to track the message sent to agent with form data
     form_responses: dict[str, str] = dataclasses.field(default_factory=dict)
     polling_interval: int = 1
+    # Change feed cursor and message count of the last sync with the server.
+    sync_cursor: int = 0
+    synced_conversation_id: str = ''
+    message_offset: int = 0
 
     # Added for API key management
     api_key: str = ''
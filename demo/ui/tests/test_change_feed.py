@@ -0,0 +1,82 @@
+import threading
+import unittest
+
+from service.server.change_feed import ChangeFeed
+
+
+class ChangeFeedTest(unittest.TestCase):
+    """Tests for the ChangeFeed used by incremental UI syncs."""
+
+    def setUp(self) -> None:
+        self.feed = ChangeFeed(max_entries=3)
+
+    def test_changes_since_cursor(self) -> None:
+        """Only changes after the cursor are returned, grouped by kind."""
+        self.feed.record('conversation', 'c1')
+        cursor = self.feed.record('task', 't1')
+        self.feed.record('task', 't2')
+        self.feed.record('conversation', 'c1')
+        self.assertEqual(
+            self.feed.changes_since(cursor),
+            {'task': ['t2'], 'conversation': ['c1']},
+        )
+        self.assertEqual(self.feed.changes_since(self.feed.cursor), {})
+
+    def test_repeated_changes_are_reported_once(self) -> None:
+        """An item updated many times appears once, at its latest change."""
+        for _ in range(5):
+            self.feed.record('task', 't1')
+        self.feed.record('task', 't2')
+        self.assertEqual(self.feed.changes_since(0), {'task': ['t1', 't2']})
+
+    def test_cursor_below_floor_is_stale(self) -> None:
+        """Dropping the oldest entries invalidates cursors before them."""
+        first = self.feed.record('task', 't1')
+        for task_id in ('t2', 't3', 't4'):
+            self.feed.record('task', task_id)
+        self.assertEqual(self.feed.floor, first)
+        self.assertFalse(self.feed.is_stale(first))
+        self.assertTrue(self.feed.is_stale(first - 1))
+        self.assertTrue(self.feed.is_stale(self.feed.cursor + 1))
+
+
+class ChangeSubscriptionTest(unittest.IsolatedAsyncioTestCase):
+    """Tests for streaming subscriptions to a ChangeFeed."""
+
+    async def asyncSetUp(self) -> None:
+        self.feed = ChangeFeed()
+        self.subscription = self.feed.subscribe(max_buffer=2)
+
+    async def test_receives_changes_from_other_threads(self) -> None:
+        """Changes recorded on another thread wake the subscriber."""
+        thread = threading.Thread(
+            target=lambda: self.feed.record('task', 't1')
+        )
+        thread.start()
+        changes = await self.subscription.get(timeout=1)
+        thread.join()
+        self.assertEqual(changes, [(1, 'task', 't1')])
+
+    async def test_timeout_returns_no_changes(self) -> None:
+        """get returns an empty list when nothing changes in time."""
+        self.assertEqual(await self.subscription.get(timeout=0.01), [])
+
+    async def test_overflow_is_reported_once(self) -> None:
+        """A full buffer is dropped and reported, then buffering resumes."""
+        for task_id in ('t1', 't2', 't3'):
+            self.feed.record('task', task_id)
+        self.assertIsNone(await self.subscription.get(timeout=1))
+        self.feed.record('task', 't4')
+        self.assertEqual(
+            await self.subscription.get(timeout=1), [(4, 'task', 't4')]
+        )
+
+    async def test_unsubscribe_stops_delivery(self) -> None:
+        """An unsubscribed client receives nothing further."""
+        self.feed.unsubscribe(self.subscription)
+        self.feed.record('task', 't1')
+        self.assertEqual(await self.subscription.get(timeout=0.01), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
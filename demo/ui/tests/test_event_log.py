@@ -0,0 +1,100 @@
+import unittest
+
+from types import SimpleNamespace
+
+from service.server.event_log import EventLog
+
+
+def _event(event_id: str, timestamp: float, conversation_id: str = 'c1'):
+    # EventLog only reads the id, timestamp and context id of an Event.
+    return SimpleNamespace(
+        id=event_id,
+        timestamp=timestamp,
+        content=SimpleNamespace(contextId=conversation_id),
+    )
+
+
+def _ids(events) -> list[str]:
+    return [event.id for event in events]
+
+
+class EventLogTest(unittest.TestCase):
+    """Tests for the timestamp-ordered EventLog."""
+
+    def test_events_are_ordered_by_timestamp(self) -> None:
+        """Events are returned oldest first, ties in arrival order."""
+        log = EventLog()
+        for event_id, timestamp in (('a', 1), ('b', 2), ('c', 2), ('d', 3)):
+            log.add(_event(event_id, timestamp))
+        self.assertEqual(_ids(log.page()), ['a', 'b', 'c', 'd'])
+
+    def test_out_of_order_insert(self) -> None:
+        """A late event is inserted at its timestamp."""
+        log = EventLog()
+        for event_id, timestamp in (('a', 1), ('c', 3), ('b', 2), ('z', 0)):
+            log.add(_event(event_id, timestamp))
+        self.assertEqual(_ids(log.page()), ['z', 'a', 'b', 'c'])
+
+    def test_readding_an_event_replaces_it(self) -> None:
+        """An event added again under its id moves to its new timestamp."""
+        log = EventLog()
+        log.add(_event('a', 1))
+        log.add(_event('b', 2))
+        log.add(_event('a', 3))
+        self.assertEqual(_ids(log.page()), ['b', 'a'])
+        self.assertEqual(len(log), 2)
+
+    def test_paging(self) -> None:
+        """before, after and limit select a window of the events."""
+        log = EventLog()
+        for i in range(6):
+            log.add(_event(f'e{i}', i))
+        self.assertEqual(_ids(log.page(limit=2)), ['e4', 'e5'])
+        self.assertEqual(_ids(log.page(before='e3')), ['e0', 'e1', 'e2'])
+        self.assertEqual(_ids(log.page(before='e3', limit=2)), ['e1', 'e2'])
+        self.assertEqual(_ids(log.page(after='e3')), ['e4', 'e5'])
+        self.assertEqual(_ids(log.page(after='e1', limit=2)), ['e2', 'e3'])
+        self.assertEqual(_ids(log.page(after='e1', before='e4')), ['e2', 'e3'])
+        self.assertEqual(log.page(before='missing'), [])
+
+    def test_filters_by_conversation(self) -> None:
+        """Only the events of the requested conversation are returned."""
+        log = EventLog()
+        log.add(_event('a', 1, 'c1'))
+        log.add(_event('b', 2, 'c2'))
+        log.add(_event('c', 3, 'c1'))
+        self.assertEqual(_ids(log.page(conversation_id='c1')), ['a', 'c'])
+        self.assertEqual(_ids(log.page(conversation_id='c1', after='a')), ['c'])
+        self.assertEqual(log.page(conversation_id='missing'), [])
+
+    def test_retention_drops_oldest(self) -> None:
+        """Past max_events the oldest events are dropped everywhere."""
+        log = EventLog(max_events=3)
+        for i in range(10):
+            log.add(_event(f'e{i}', i, f'c{i % 2}'))
+        self.assertEqual(len(log), 3)
+        self.assertEqual(_ids(log.page()), ['e7', 'e8', 'e9'])
+        self.assertIsNone(log.get('e6'))
+        self.assertEqual(_ids(log.page(conversation_id='c0')), ['e8'])
+        self.assertEqual(_ids(log.page(conversation_id='c1')), ['e7', 'e9'])
+        # A cursor dropped by retention is older than every retained event.
+        self.assertEqual(_ids(log.page(after='e2')), ['e7', 'e8', 'e9'])
+
+    def test_retention_with_late_events(self) -> None:
+        """Dropping the oldest event keeps late inserts in order."""
+        log = EventLog(max_events=4)
+        for event_id, timestamp in (
+            ('a', 1),
+            ('b', 5),
+            ('c', 2),
+            ('d', 6),
+            ('e', 3),
+            ('f', 4),
+        ):
+            log.add(_event(event_id, timestamp))
+        self.assertEqual(_ids(log.page()), ['e', 'f', 'b', 'd'])
+        self.assertEqual(_ids(log.page(after='f', limit=1)), ['b'])
+
+
+if __name__ == '__main__':
+    unittest.main()
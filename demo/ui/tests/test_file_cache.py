@@ -0,0 +1,80 @@
+import tempfile
+import unittest
+
+from service.server.file_cache import FileCache, parse_etags, parse_range
+
+
+class FileCacheTest(unittest.TestCase):
+    """Tests for the content-addressed FileCache."""
+
+    def test_identical_content_is_stored_once(self) -> None:
+        """Files with the same bytes share one id and one entry."""
+        cache = FileCache()
+        first = cache.put(b'image', 'image/png')
+        second = cache.put(b'image', 'image/png')
+        self.assertEqual(first, second)
+        self.assertEqual(cache.get(first).read(), b'image')
+        self.assertEqual(cache.get(first).etag, f'"{first}"')
+
+    def test_evicts_least_recently_used(self) -> None:
+        """Past max_bytes the least recently used file is dropped."""
+        cache = FileCache(max_bytes=8)
+        a = cache.put(b'aaaa', 'text/plain')
+        b = cache.put(b'bbbb', 'text/plain')
+        cache.get(a)
+        c = cache.put(b'cccc', 'text/plain')
+        self.assertIn(a, cache)
+        self.assertNotIn(b, cache)
+        self.assertIn(c, cache)
+
+    def test_spills_evicted_files_to_disk(self) -> None:
+        """With a spill directory evicted files are still served."""
+        with tempfile.TemporaryDirectory() as spill_dir:
+            cache = FileCache(max_bytes=4, spill_dir=spill_dir)
+            a = cache.put(b'aaaa', 'text/plain')
+            cache.put(b'bbbb', 'text/plain')
+            cached = cache.get(a)
+            self.assertIsNone(cached.data)
+            self.assertEqual(cached.read(1, 3), b'aa')
+
+
+class ParseRangeTest(unittest.TestCase):
+    """Tests for parsing Range headers."""
+
+    def test_ranges(self) -> None:
+        """Explicit, open-ended and suffix ranges map to [start, end)."""
+        self.assertEqual(parse_range('bytes=0-3', 10), (0, 4))
+        self.assertEqual(parse_range('bytes=5-', 10), (5, 10))
+        self.assertEqual(parse_range('bytes=-3', 10), (7, 10))
+        self.assertEqual(parse_range('bytes=8-20', 10), (8, 10))
+
+    def test_whole_file(self) -> None:
+        """No header, other units and multiple ranges serve everything."""
+        self.assertIsNone(parse_range(None, 10))
+        self.assertIsNone(parse_range('items=0-1', 10))
+        self.assertIsNone(parse_range('bytes=0-1,4-5', 10))
+
+    def test_unsatisfiable(self) -> None:
+        """Ranges outside the file are rejected."""
+        with self.assertRaises(ValueError):
+            parse_range('bytes=10-', 10)
+        with self.assertRaises(ValueError):
+            parse_range('bytes=-0', 10)
+
+    def test_malformed(self) -> None:
+        """Malformed ranges are ignored and serve everything."""
+        for header in ('bytes=5-2', 'bytes=-', 'bytes=3', 'bytes=a-b'):
+            self.assertIsNone(parse_range(header, 10), header)
+
+    def test_etags(self) -> None:
+        """If-None-Match lists are split into tags, weak or not."""
+        self.assertEqual(parse_etags(None), [])
+        self.assertEqual(parse_etags('*'), ['*'])
+        self.assertEqual(
+            parse_etags('"a", W/"b",W/"c,d"'), ['"a"', '"b"', '"c,d"']
+        )
+        self.assertNotIn('"a"', parse_etags('"xa", "ab"'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import unittest
+
+from types import SimpleNamespace
+
+from service.server.task_store import TaskStore
+
+
+def _message(message_id: str):
+    return SimpleNamespace(messageId=message_id)
+
+
+def _task(task_id: str, status_message=None, history=None):
+    # TaskStore only reads the id, history and status message of a Task.
+    return SimpleNamespace(
+        id=task_id,
+        history=history,
+        status=SimpleNamespace(message=status_message),
+    )
+
+
+def _ids(task) -> list[str]:
+    return [message.messageId for message in task.history]
+
+
+class TaskStoreTest(unittest.TestCase):
+    """Tests for the task store and the message ids of task histories."""
+
+    def test_add_and_update(self) -> None:
+        """Tasks are indexed by id and updates of unknown tasks are ignored."""
+        store = TaskStore()
+        task = _task('t1')
+        store.add(task)
+        self.assertIs(store.get('t1'), task)
+        self.assertFalse(store.update(_task('t2')))
+        self.assertIsNone(store.get('t2'))
+        self.assertTrue(store.update(task))
+        self.assertEqual(store.values(), [task])
+
+    def test_insert_message_history_deduplicates(self) -> None:
+        """A status message is added to the history once."""
+        store = TaskStore()
+        task = _task('t1', _message('m1'))
+        store.add(task)
+        store.insert_message_history(task, task.status.message)
+        store.insert_message_history(task, task.status.message)
+        self.assertEqual(_ids(task), ['m1'])
+
+        task.status.message = _message('m2')
+        store.insert_message_history(task, task.status.message)
+        store.insert_message_history(task, task.status.message)
+        self.assertEqual(_ids(task), ['m1', 'm2'])
+        self.assertEqual(store.history_message_ids(task), {'m1', 'm2'})
+
+    def test_history_changed_elsewhere_rebuilds_ids(self) -> None:
+        """Messages appended to the history directly are still deduplicated."""
+        store = TaskStore()
+        task = _task('t1', _message('m1'))
+        store.add(task)
+        store.insert_message_history(task, task.status.message)
+        task.history.append(_message('m2'))
+
+        task.status.message = _message('m2')
+        store.insert_message_history(task, task.status.message)
+        self.assertEqual(_ids(task), ['m1', 'm2'])
+
+    def test_replacing_a_task_drops_its_ids(self) -> None:
+        """Replacing a task object discards the ids of its old history."""
+        store = TaskStore()
+        task = _task('t1', _message('m1'))
+        store.add(task)
+        store.insert_message_history(task, task.status.message)
+
+        replacement = _task('t1', _message('m1'), history=[_message('m0')])
+        store.update(replacement)
+        self.assertIs(store.get('t1'), replacement)
+        store.insert_message_history(replacement, replacement.status.message)
+        self.assertEqual(_ids(replacement), ['m0', 'm1'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,6 @@
 # type: ignore
 
+import asyncio
 import json
 import logging
 import re
@@ -34,6 +35,8 @@ class TravelAgent(BaseAgent):
 
         self.instructions = instructions
         self.agent = None
+        self.runner = AgentRunner()
+        self._init_lock = asyncio.Lock()
 
     async def init_agent(self):
         logger.info(f'Initializing {self.agent_name} metadata')
@@ -57,7 +60,6 @@ class TravelAgent(BaseAgent):
             generate_content_config=generate_content_config,
             tools=tools,
         )
-        self.runner = AgentRunner()
 
     async def invoke(self, query, session_id) -> dict:
         logger.info(f'Running {self.agent_name} for session {session_id}')
@@ -75,7 +77,10 @@ class TravelAgent(BaseAgent):
             raise ValueError('Query cannot be empty')
 
         if not self.agent:
-            await self.init_agent()
+            # Concurrent first requests must not build the agent twice.
+            async with self._init_lock:
+                if not self.agent:
+                    await self.init_agent()
         async for chunk in self.runner.run_stream(
             self.agent, query, context_id
         ):
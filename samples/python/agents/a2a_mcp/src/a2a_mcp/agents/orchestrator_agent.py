@@ -1,5 +1,8 @@
+import functools
 import logging
+import time
 
+from collections import OrderedDict
 from collections.abc import AsyncIterable
 
 from a2a.types import (
@@ -19,52 +22,21 @@ import json
 logger = logging.getLogger(__name__)
 
 
-class OrchestratorAgent(BaseAgent):
-    """Orchestrator Agent."""
+@functools.cache
+def get_genai_client() -> genai.Client:
+    """Returns the process-wide client, so sessions share its connections."""
+    return genai.Client()
+
+
+class OrchestratorSession:
+    """Workflow state of one conversation context."""
 
     def __init__(self):
-        init_api_key()
-        super().__init__(
-            agent_name="Orchestrator Agent",
-            description="Facilitate inter agent communication",
-            content_types=["text", "text/plain"],
-        )
         self.graph = None
         self.results = []
         self.travel_context = {}
         self.query_history = []
-        self.context_id = None
-
-    async def generate_summary(self) -> str:
-        client = genai.Client()
-        response = client.models.generate_content(
-            model="gemini-2.0-flash",
-            contents=prompts.SUMMARY_COT_INSTRUCTIONS.replace(
-                "{travel_data}", str(self.results)
-            ),
-            config={"temperature": 0.0},
-        )
-        return response.text
-
-    def answer_user_question(self, question) -> str:
-        try:
-            client = genai.Client()
-            response = client.models.generate_content(
-                model="gemini-2.0-flash",
-                contents=prompts.QA_COT_PROMPT.replace(
-                    "{TRIP_CONTEXT}", str(self.travel_context)
-                )
-                .replace("{CONVERSATION_HISTORY}", str(self.query_history))
-                .replace("{TRIP_QUESTION}", question),
-                config={
-                    "temperature": 0.0,
-                    "response_mime_type": "application/json",
-                },
-            )
-            return response.text
-        except Exception as e:
-            logger.info(f"Error answering user question: {e}")
-        return '{"can_answer": "no", "answer": "Cannot answer based on provided context"}'
+        self.last_used = time.monotonic()
 
     def set_node_attributes(
         self, node_id, task_id=None, context_id=None, query=None
@@ -98,11 +70,81 @@ class OrchestratorAgent(BaseAgent):
         self.set_node_attributes(node.id, task_id, context_id, query)
         return node
 
-    def clear_state(self):
-        self.graph = None
-        self.results.clear()
-        self.travel_context.clear()
-        self.query_history.clear()
+
+class OrchestratorAgent(BaseAgent):
+    """Orchestrator Agent.
+
+    LLM calls go through the async API of a shared genai client, so a slow
+    model call does not block other sessions served by the same process.
+    Each context gets its own OrchestratorSession; at most ``max_sessions``
+    are kept, least recently used first out, and sessions idle for
+    ``session_ttl`` seconds are dropped.
+    """
+
+    def __init__(
+        self,
+        genai_client: genai.Client | None = None,
+        max_sessions: int = 1000,
+        session_ttl: float = 3600.0,
+    ):
+        init_api_key()
+        super().__init__(
+            agent_name="Orchestrator Agent",
+            description="Facilitate inter agent communication",
+            content_types=["text", "text/plain"],
+        )
+        self.sessions: OrderedDict[str, OrchestratorSession] = OrderedDict()
+        self.max_sessions = max_sessions
+        self.session_ttl = session_ttl
+        self.genai_client = genai_client or get_genai_client()
+
+    def get_session(self, context_id) -> OrchestratorSession:
+        """Returns the session of a context, creating it if needed."""
+        now = time.monotonic()
+        # Sessions are ordered by last use, so expired ones are at the front.
+        while self.sessions:
+            oldest = next(iter(self.sessions.values()))
+            if now - oldest.last_used < self.session_ttl:
+                break
+            self.sessions.popitem(last=False)
+
+        session = self.sessions.pop(context_id, None) or OrchestratorSession()
+        session.last_used = now
+        self.sessions[context_id] = session
+        while len(self.sessions) > self.max_sessions:
+            self.sessions.popitem(last=False)
+        return session
+
+    async def generate_summary(self, session: OrchestratorSession) -> str:
+        response = await self.genai_client.aio.models.generate_content(
+            model="gemini-2.0-flash",
+            contents=prompts.SUMMARY_COT_INSTRUCTIONS.replace(
+                "{travel_data}", str(session.results)
+            ),
+            config={"temperature": 0.0},
+        )
+        return response.text
+
+    async def answer_user_question(
+        self, session: OrchestratorSession, question
+    ) -> str:
+        try:
+            response = await self.genai_client.aio.models.generate_content(
+                model="gemini-2.0-flash",
+                contents=prompts.QA_COT_PROMPT.replace(
+                    "{TRIP_CONTEXT}", str(session.travel_context)
+                )
+                .replace("{CONVERSATION_HISTORY}", str(session.query_history))
+                .replace("{TRIP_QUESTION}", question),
+                config={
+                    "temperature": 0.0,
+                    "response_mime_type": "application/json",
+                },
+            )
+            return response.text
+        except Exception as e:
+            logger.info(f"Error answering user question: {e}")
+        return '{"can_answer": "no", "answer": "Cannot answer based on provided context"}'
 
     async def stream(
         self, query, context_id, task_id
@@ -113,17 +155,15 @@ class OrchestratorAgent(BaseAgent):
         )
         if not query:
             raise ValueError("Query cannot be empty")
-        if self.context_id != context_id:
-            # Clear state when the context changes
-            self.clear_state()
-            self.context_id = context_id
+        session_id = context_id
+        session = self.get_session(session_id)
 
-        self.query_history.append(query)
+        session.query_history.append(query)
         start_node_id = None
         # Graph does not exist, start a new graph with planner node.
-        if not self.graph:
-            self.graph = WorkflowGraph()
-            planner_node = self.add_graph_node(
+        if not session.graph:
+            session.graph = WorkflowGraph()
+            planner_node = session.add_graph_node(
                 task_id=task_id,
                 context_id=context_id,
                 query=query,
@@ -132,9 +172,9 @@ class OrchestratorAgent(BaseAgent):
             )
             start_node_id = planner_node.id
         # Paused state is when the agent might need more information.
-        elif self.graph.state == Status.PAUSED:
-            start_node_id = self.graph.paused_node_id
-            self.set_node_attributes(node_id=start_node_id, query=query)
+        elif session.graph.state == Status.PAUSED:
+            start_node_id = session.graph.paused_node_id
+            session.set_node_attributes(node_id=start_node_id, query=query)
 
         # This loop can be avoided if the workflow graph is dynamic or
         # is built from the results of the planner when the planner
@@ -142,14 +182,14 @@ class OrchestratorAgent(BaseAgent):
         # TODO: Make the graph dynamically iterable over edges
         while True:
             # Set attributes on the node so we propagate task and context
-            self.set_node_attributes(
+            session.set_node_attributes(
                 node_id=start_node_id,
                 task_id=task_id,
                 context_id=context_id,
             )
             # Resume workflow, used when the workflow nodes are updated.
             should_resume_workflow = False
-            async for chunk in self.graph.run_workflow(
+            async for node_id, chunk in session.graph.stream_workflow(
                 start_node_id=start_node_id
             ):
                 if isinstance(chunk.root, SendStreamingMessageSuccessResponse):
@@ -169,21 +209,28 @@ class OrchestratorAgent(BaseAgent):
                             task_status_event.status.state
                             == TaskState.input_required
                         ):
+                            if should_resume_workflow:
+                                # The workflow restarts for an earlier answer
+                                # or plan; ask this question on a later run.
+                                session.graph.requeue_question(node_id, chunk)
+                                continue
                             question = task_status_event.status.message.parts[
                                 0
                             ].root.text
 
                             try:
                                 answer = json.loads(
-                                    self.answer_user_question(question)
+                                    await self.answer_user_question(
+                                        session, question
+                                    )
                                 )
                                 logger.info(f"Agent Answer {answer}")
                                 if answer["can_answer"] == "yes":
                                     # Orchestrator can answer on behalf of the user set the query
                                     # Resume workflow from paused state.
                                     query = answer["answer"]
-                                    start_node_id = self.graph.paused_node_id
-                                    self.set_node_attributes(
+                                    start_node_id = session.graph.paused_node_id
+                                    session.set_node_attributes(
                                         node_id=start_node_id, query=query
                                     )
                                     should_resume_workflow = True
@@ -194,32 +241,30 @@ class OrchestratorAgent(BaseAgent):
                     # Store the node and continue.
                     if isinstance(chunk.root.result, TaskArtifactUpdateEvent):
                         artifact = chunk.root.result.artifact
-                        self.results.append(artifact)
+                        session.results.append(artifact)
                         if artifact.name == "PlannerAgent-result":
                             # Planning agent returned data, update graph.
                             artifact_data = artifact.parts[0].root.data
                             if "trip_info" in artifact_data:
-                                self.travel_context = artifact_data["trip_info"]
+                                session.travel_context = artifact_data[
+                                    "trip_info"
+                                ]
                             logger.info(
                                 f"Updating workflow with {len(artifact_data['tasks'])} task nodes"
                             )
-                            # Define the edges
-                            current_node_id = start_node_id
-                            for idx, task_data in enumerate(
-                                artifact_data["tasks"]
-                            ):
-                                node = self.add_graph_node(
+                            # The planned tasks do not depend on each other,
+                            # so they all hang off the planner node and run
+                            # concurrently.
+                            for task_data in artifact_data["tasks"]:
+                                session.add_graph_node(
                                     task_id=task_id,
                                     context_id=context_id,
                                     query=task_data["description"],
-                                    node_id=current_node_id,
+                                    node_id=start_node_id,
                                 )
-                                current_node_id = node.id
-                                # Restart graph from the newly inserted subgraph state
-                                # Start from the new node just created.
-                                if idx == 0:
-                                    should_resume_workflow = True
-                                    start_node_id = node.id
+                            # Restart graph from the planner node, it is
+                            # skipped once completed.
+                            should_resume_workflow = True
                         else:
                             # Not planner but artifacts from other tasks,
                             # continue to the next node in the workflow.
@@ -240,11 +285,13 @@ class OrchestratorAgent(BaseAgent):
             else:
                 # Readable logs
                 logger.info("Restarting workflow loop.")
-        if self.graph.state == Status.COMPLETED:
+        if session.graph.state == Status.COMPLETED:
             # All individual actions complete, now generate the summary
-            logger.info(f"Generating summary for {len(self.results)} results")
-            summary = await self.generate_summary()
-            self.clear_state()
+            logger.info(
+                f"Generating summary for {len(session.results)} results"
+            )
+            summary = await self.generate_summary(session)
+            self.sessions.pop(session_id, None)
             logger.info(f"Summary: {summary}")
             yield {
                 "response_type": "text",
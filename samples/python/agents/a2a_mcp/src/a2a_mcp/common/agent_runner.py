@@ -1,7 +1,12 @@
 # type: ignore
 
+import asyncio
+import logging
+import time
 import uuid
 
+from collections import OrderedDict
+from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 
 from google.adk.agents import Agent
@@ -11,83 +16,179 @@ from google.adk.sessions import InMemorySessionService
 from google.genai import types
 
 
+logger = logging.getLogger(__name__)
+
+
 class AgentRunner:
     """Manages the execution of an ADK (Agent Development Kit) Agent.
 
     This class encapsulates the logic for running an agent, handling session
     management (creation and retrieval), and streaming responses back to the
     caller. It uses an in-memory session service.
+
+    One ADK Runner is built per agent and reused across calls. Each
+    session_id maps to its own session; at most ``max_sessions`` are kept,
+    and the least recently used one is deleted from the session service
+    when the limit is exceeded. Sessions that a run is still using are never
+    deleted; the limit is enforced again once they are released.
     """
 
     def __init__(
         self,
         user_id: str = 'user_1',
         app_name: str = 'A2A-MCP',
+        max_sessions: int = 1000,
     ):
         self.session_service = InMemorySessionService()
-        self.session = None
         self.app_name = app_name
         self.user_id = user_id
+        self.max_sessions = max_sessions
+        self._runners: dict[str, tuple[Agent, Runner]] = {}
+        # Number of runs using each session, least recently used first.
+        self._sessions: OrderedDict[str, int] = OrderedDict()
+        # Lock and number of holders or waiters per session_id, so a session
+        # is created once by concurrent first calls and is not recreated
+        # while it is being deleted.
+        self._session_locks: dict[str, tuple[asyncio.Lock, int]] = {}
 
-    async def run_stream(
-        self, agent: Agent, query: str, session_id: str
-    ) -> AsyncGenerator[Event, None]:
+    def get_runner(self, agent: Agent) -> Runner:
+        """Returns the cached Runner of an agent, building it on first use."""
+        cached = self._runners.get(agent.name)
+        if cached is not None and cached[0] is agent:
+            return cached[1]
         runner = Runner(
             agent=agent,
             app_name=self.app_name,
             session_service=self.session_service,
         )
+        self._runners[agent.name] = (agent, runner)
+        return runner
+
+    @asynccontextmanager
+    async def session(self, session_id: str | None):
+        """Yields the id of the session to run in, creating it if needed.
+
+        The session is not evicted before the block exits.
+        """
         if not session_id:
             session_id = uuid.uuid4().hex
+        if session_id in self._sessions:
+            self._sessions[session_id] += 1
+            self._sessions.move_to_end(session_id)
         else:
-            self.session = await self.session_service.get_session(
+            async with self._session_lock(session_id):
+                if session_id in self._sessions:
+                    self._sessions[session_id] += 1
+                    self._sessions.move_to_end(session_id)
+                else:
+                    await self._create_session(session_id)
+                    self._sessions[session_id] = 1
+            await self._evict()
+        try:
+            yield session_id
+        finally:
+            self._sessions[session_id] -= 1
+            if len(self._sessions) > self.max_sessions:
+                await self._evict()
+
+    @asynccontextmanager
+    async def _session_lock(self, session_id: str):
+        lock, users = self._session_locks.get(session_id, (None, 0))
+        lock = lock or asyncio.Lock()
+        self._session_locks[session_id] = (lock, users + 1)
+        try:
+            async with lock:
+                yield
+        finally:
+            lock, users = self._session_locks[session_id]
+            if users == 1:
+                del self._session_locks[session_id]
+            else:
+                self._session_locks[session_id] = (lock, users - 1)
+
+    async def _create_session(self, session_id: str) -> None:
+        session = await self.session_service.get_session(
+            app_name=self.app_name,
+            user_id=self.user_id,
+            session_id=session_id,
+        )
+        if not session:
+            await self.session_service.create_session(
                 app_name=self.app_name,
                 user_id=self.user_id,
                 session_id=session_id,
             )
-        if not self.session:
-            self.session = await self.session_service.create_session(
-                app_name=self.app_name,
-                user_id=self.user_id,
-                session_id=session_id,
+
+    async def _evict(self) -> None:
+        """Deletes the least recently used unused sessions over the limit."""
+        excess = len(self._sessions) - self.max_sessions
+        if excess <= 0:
+            return
+        evicted = []
+        for session_id, users in self._sessions.items():
+            if len(evicted) == excess:
+                break
+            if users == 0:
+                evicted.append(session_id)
+        for session_id in evicted:
+            del self._sessions[session_id]
+        for session_id in evicted:
+            async with self._session_lock(session_id):
+                await self.session_service.delete_session(
+                    app_name=self.app_name,
+                    user_id=self.user_id,
+                    session_id=session_id,
+                )
+
+    async def run_stream(
+        self, agent: Agent, query: str, session_id: str
+    ) -> AsyncGenerator[Event, None]:
+        start = time.perf_counter()
+        runner = self.get_runner(agent)
+        async with self.session(session_id) as session_id:
+            logger.debug(
+                f'{agent.name} setup took '
+                f'{(time.perf_counter() - start) * 1000:.2f}ms'
             )
-        content = types.Content(role='user', parts=[types.Part(text=query)])
+            content = types.Content(role='user', parts=[types.Part(text=query)])
 
-        async for event in runner.run_async(
-            user_id=self.user_id,
-            session_id=self.session.id,
-            new_message=content,
-        ):
-            if event.is_final_response():
-                response = ''
-                if (
-                    event.content
-                    and event.content.parts
-                    and event.content.parts[0].text
-                ):
-                    response = '\n'.join(
-                        [p.text for p in event.content.parts if p.text]
-                    )
-                elif (
-                    event.content
-                    and event.content.parts
-                    and any(
-                        True for p in event.content.parts if p.function_response
-                    )
-                ):
-                    response = next(
-                        p.function_response.model_dump()
-                        for p in event.content.parts
-                    )
+            async for event in runner.run_async(
+                user_id=self.user_id,
+                session_id=session_id,
+                new_message=content,
+            ):
+                if event.is_final_response():
+                    response = ''
+                    if (
+                        event.content
+                        and event.content.parts
+                        and event.content.parts[0].text
+                    ):
+                        response = '\n'.join(
+                            [p.text for p in event.content.parts if p.text]
+                        )
+                    elif (
+                        event.content
+                        and event.content.parts
+                        and any(
+                            True
+                            for p in event.content.parts
+                            if p.function_response
+                        )
+                    ):
+                        response = next(
+                            p.function_response.model_dump()
+                            for p in event.content.parts
+                        )
+                    else:
+                        response = f'Error in running agent: {agent.name}'
+                    yield {
+                        'type': 'final_result',
+                        'response': response,
+                    }
                 else:
-                    response = f'Error in running agent: {agent.name}'
-                yield {
-                    'type': 'final_result',
-                    'response': response,
-                }
-            else:
-                yield {
-                    'is_task_complete': False,
-                    'require_user_input': False,
-                    'content': f'{agent.name}: Processing request...',
-                }
+                    yield {
+                        'is_task_complete': False,
+                        'require_user_input': False,
+                        'content': f'{agent.name}: Processing request...',
+                    }
@@ -1,9 +1,11 @@
+import asyncio
 import json
 import logging
 import uuid
 
 from collections.abc import AsyncIterable
 from enum import Enum
+from typing import Any
 from uuid import uuid4
 
 import httpx
@@ -25,6 +27,9 @@ from a2a_mcp.mcp import client
 
 logger = logging.getLogger(__name__)
 
+# Marks the end of a node's chunk stream in WorkflowGraph's merged queue.
+_NODE_DONE = object()
+
 
 class Status(Enum):
     """Represents the status of a workflow and its associated node."""
@@ -61,7 +66,7 @@ class WorkflowNode:
     async def get_planner_resource(self) -> AgentCard | None:
         logger.info(f'Getting resource for node {self.id}')
         config = get_mcp_server_config()
-        async with client.init_session(
+        async with client.session_pool.session(
             config.host, config.port, config.transport
         ) as session:
             response = await client.find_resource(
@@ -73,7 +78,7 @@ class WorkflowNode:
     async def find_agent_for_task(self) -> AgentCard | None:
         logger.info(f'Find agent for task - {self.task}')
         config = get_mcp_server_config()
-        async with client.init_session(
+        async with client.session_pool.session(
             config.host, config.port, config.transport
         ) as session:
             result = await client.find_agent(session, self.task)
@@ -121,15 +126,25 @@ class WorkflowNode:
 
 
 class WorkflowGraph:
-    """Represents a graph of workflow nodes."""
+    """Represents a graph of workflow nodes.
+
+    Nodes whose predecessors have all completed run concurrently, at most
+    ``max_concurrency`` at a time.
+    """
 
-    def __init__(self):
+    def __init__(self, max_concurrency: int = 4):
         self.graph = nx.DiGraph()
         self.nodes = {}
         self.latest_node = None
         self.node_type = None
         self.state = Status.INITIALIZED
         self.paused_node_id = None
+        self.max_concurrency = max_concurrency
+        # Nodes left unfinished by a pause, run again when the workflow resumes.
+        self.deferred_node_ids = set()
+        # Input-required chunks of nodes that asked for input while the
+        # workflow was already paused, by node id in the order they arrived.
+        self.queued_questions: dict[str, Any] = {}
 
     def add_node(self, node) -> None:
         logger.info(f'Adding node {node.id}')
@@ -146,55 +161,149 @@ class WorkflowGraph:
     async def run_workflow(
         self, start_node_id: str = None
     ) -> AsyncIterable[dict[str, any]]:
+        async for _, chunk in self.stream_workflow(start_node_id):
+            yield chunk
+
+    async def stream_workflow(
+        self, start_node_id: str = None
+    ) -> AsyncIterable[tuple[str, Any]]:
+        """Runs the workflow and yields (node id, chunk) pairs.
+
+        Chunks of concurrently running nodes are interleaved in arrival order;
+        the chunks of each node keep their order. Completed nodes are skipped.
+        Once a node asks for input the workflow pauses: no new nodes start,
+        the nodes already running finish, and the paused node's remaining
+        chunks are not yielded. Questions from other nodes that ask for input
+        meanwhile are queued; each is yielded, pausing the workflow again, at
+        the end of a later run.
+        """
         logger.info('Executing workflow graph')
         if not start_node_id or start_node_id not in self.nodes:
             start_nodes = [n for n, d in self.graph.in_degree() if d == 0]
         else:
             start_nodes = [self.nodes[start_node_id].id]
 
-        applicable_graph = set()
+        applicable_graph = set(self.deferred_node_ids)
+        self.deferred_node_ids = set()
 
         for node_id in start_nodes:
             applicable_graph.add(node_id)
             applicable_graph.update(nx.descendants(self.graph, node_id))
 
         complete_graph = list(nx.topological_sort(self.graph))
-        sub_graph = [n for n in complete_graph if n in applicable_graph]
+        sub_graph = [
+            n
+            for n in complete_graph
+            if n in applicable_graph
+            and self.nodes[n].state != Status.COMPLETED
+        ]
         logger.info(f'Sub graph {sub_graph} size {len(sub_graph)}')
         self.state = Status.RUNNING
-        # Alternative is to loop over all nodes, but we only need the connected nodes.
-        for node_id in sub_graph:
-            node = self.nodes[node_id]
-            node.state = Status.RUNNING
-            query = self.graph.nodes[node_id].get('query')
-            task_id = self.graph.nodes[node_id].get('task_id')
-            context_id = self.graph.nodes[node_id].get('context_id')
-            async for chunk in node.run_node(query, task_id, context_id):
-                # When the workflow node is paused, do not yeild any chunks
-                # but, let the loop complete.
-                if node.state != Status.PAUSED:
-                    if isinstance(
-                        chunk.root, SendStreamingMessageSuccessResponse
-                    ) and (
-                        isinstance(chunk.root.result, TaskStatusUpdateEvent)
-                    ):
-                        task_status_event = chunk.root.result
-                        context_id = task_status_event.contextId
+
+        pending = set(sub_graph)
+        running: dict[str, asyncio.Task] = {}
+        # Node chunks take a slot until they are read, so a fast node cannot
+        # run far ahead; the end-of-node markers need none and never block.
+        chunks = asyncio.Queue()
+        slots = asyncio.Semaphore(self.max_concurrency * 4)
+        try:
+            while True:
+                if self.state == Status.RUNNING:
+                    for node_id in sub_graph:
+                        if len(running) >= self.max_concurrency:
+                            break
                         if (
-                            task_status_event.status.state
-                            == TaskState.input_required
-                            and context_id
+                            node_id in pending
+                            and node_id not in running
+                            and not any(
+                                p in pending
+                                for p in self.graph.predecessors(node_id)
+                            )
                         ):
-                            node.state = Status.PAUSED
-                            self.state = Status.PAUSED
-                            self.paused_node_id = node.id
-                    yield chunk
+                            running[node_id] = asyncio.create_task(
+                                self._run_node(node_id, chunks, slots)
+                            )
+                if not running:
+                    if self.state == Status.RUNNING and self.queued_questions:
+                        node_id = next(iter(self.queued_questions))
+                        chunk = self.queued_questions.pop(node_id)
+                        self.state = Status.PAUSED
+                        self.paused_node_id = node_id
+                        yield node_id, chunk
+                    break
+
+                node_id, chunk = await chunks.get()
+                node = self.nodes[node_id]
+                if chunk is _NODE_DONE:
+                    # Re-raises the node's error, if any.
+                    await running.pop(node_id)
+                    if node.state == Status.RUNNING:
+                        node.state = Status.COMPLETED
+                        pending.discard(node_id)
+                    continue
+                slots.release()
+
+                # When the workflow node is paused, do not yeild any chunks
+                # but, let the node complete.
+                if node.state == Status.PAUSED:
+                    continue
+                if isinstance(
+                    chunk.root, SendStreamingMessageSuccessResponse
+                ) and (isinstance(chunk.root.result, TaskStatusUpdateEvent)):
+                    task_status_event = chunk.root.result
+                    if (
+                        task_status_event.status.state
+                        == TaskState.input_required
+                        and task_status_event.contextId
+                    ):
+                        node.state = Status.PAUSED
+                        if self.state == Status.PAUSED:
+                            # Another node already asked for input; this
+                            # question is asked once that one is answered.
+                            self.queued_questions[node_id] = chunk
+                            continue
+                        self.state = Status.PAUSED
+                        self.paused_node_id = node.id
+                yield node_id, chunk
+        finally:
+            for task in running.values():
+                task.cancel()
+            await asyncio.gather(*running.values(), return_exceptions=True)
+            # Also runs when the caller stops early, so the unfinished nodes
+            # run on the next call. Nodes with a queued question, and the
+            # nodes after them, run once the question is answered.
+            deferred = set(pending)
             if self.state == Status.PAUSED:
-                break
-            if node.state == Status.RUNNING:
-                node.state = Status.COMPLETED
-        if self.state == Status.RUNNING:
-            self.state = Status.COMPLETED
+                deferred.discard(self.paused_node_id)
+            for node_id in self.queued_questions:
+                deferred.discard(node_id)
+                deferred -= nx.descendants(self.graph, node_id)
+            self.deferred_node_ids = deferred
+            if self.state == Status.RUNNING and not pending:
+                self.state = Status.COMPLETED
+
+    def requeue_question(self, node_id: str, chunk: Any) -> None:
+        """Asks a question yielded by stream_workflow again on a later run.
+
+        The question goes ahead of the questions already queued.
+        """
+        self.queued_questions = {node_id: chunk, **self.queued_questions}
+
+    async def _run_node(
+        self, node_id: str, chunks: asyncio.Queue, slots: asyncio.Semaphore
+    ) -> None:
+        node = self.nodes[node_id]
+        node.state = Status.RUNNING
+        self.queued_questions.pop(node_id, None)
+        query = self.graph.nodes[node_id].get('query')
+        task_id = self.graph.nodes[node_id].get('task_id')
+        context_id = self.graph.nodes[node_id].get('context_id')
+        try:
+            async for chunk in node.run_node(query, task_id, context_id):
+                await slots.acquire()
+                chunks.put_nowait((node_id, chunk))
+        finally:
+            chunks.put_nowait((node_id, _NODE_DONE))
 
     def set_node_attribute(self, node_id, attribute, value):
         nx.set_node_attributes(self.graph, {node_id: value}, attribute)
@@ -0,0 +1,338 @@
+# type: ignore
+import hashlib
+import json
+import os
+import threading
+
+from collections.abc import Callable, Sequence
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+
+from mcp.server.fastmcp.utilities.logging import get_logger
+
+
+logger = get_logger(__name__)
+
+EmbedFn = Callable[[str], Sequence[float]]
+BatchEmbedFn = Callable[[list[str]], Sequence[Sequence[float]]]
+LoadCardsFn = Callable[[], tuple[list[str], list[dict]]]
+
+# Above this many cards the approximate index is used unless disabled.
+APPROXIMATE_THRESHOLD = 2000
+EMBEDDINGS_FILE = 'embeddings.npy'
+METADATA_FILE = 'metadata.json'
+
+
+def card_fingerprint(agent_card: dict) -> str:
+    """Returns a stable hash of an agent card's content."""
+    return hashlib.sha256(
+        json.dumps(agent_card, sort_keys=True).encode()
+    ).hexdigest()
+
+
+def normalize(matrix: np.ndarray) -> np.ndarray:
+    """L2-normalizes the rows of a matrix (or a single vector)."""
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+class IVFIndex:
+    """Approximate nearest-neighbour index over normalized embeddings.
+
+    Cards are bucketed by their nearest k-means centroid; a query only scans
+    the buckets of its ``n_probe`` nearest centroids, which trades a little
+    recall for much less work on large card sets.
+    """
+
+    def __init__(
+        self,
+        embeddings: np.ndarray,
+        n_lists: int | None = None,
+        n_probe: int = 8,
+        iterations: int = 10,
+        seed: int = 0,
+    ):
+        n_cards = len(embeddings)
+        n_lists = min(n_lists or max(1, int(np.sqrt(n_cards))), n_cards)
+        rng = np.random.default_rng(seed)
+        centroids = embeddings[rng.choice(n_cards, n_lists, replace=False)]
+        for _ in range(iterations):
+            assignments = np.argmax(embeddings @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignments, embeddings)
+            # Empty buckets keep their previous centroid.
+            empty = ~np.bincount(assignments, minlength=n_lists).astype(bool)
+            sums[empty] = centroids[empty]
+            centroids = normalize(sums)
+
+        assignments = np.argmax(embeddings @ centroids.T, axis=1)
+        self.centroids = np.ascontiguousarray(centroids)
+        self.lists = [np.flatnonzero(assignments == c) for c in range(n_lists)]
+        self.n_probe = min(n_probe, n_lists)
+
+    def candidates(self, query: np.ndarray) -> np.ndarray:
+        """Returns the indexes of the cards in the query's nearest buckets."""
+        scores = self.centroids @ query
+        nearest = np.argpartition(-scores, self.n_probe - 1)[: self.n_probe]
+        return np.concatenate([self.lists[c] for c in nearest])
+
+
+class AgentCardIndex:
+    """Searchable matrix of agent card embeddings.
+
+    Rows are L2-normalized float32, so the dot product with a normalized
+    query embedding is their cosine similarity. Query embeddings are kept in
+    an LRU cache, unless a shared ``query_embedding`` function is passed in.
+    An index is never modified after it is built.
+    """
+
+    def __init__(
+        self,
+        card_uris: list[str],
+        agent_cards: list[dict],
+        embeddings: np.ndarray,
+        embed_query: EmbedFn | None = None,
+        query_cache_size: int = 1024,
+        query_embedding: Callable[[str], np.ndarray] | None = None,
+        approximate: bool | None = None,
+        n_probe: int = 8,
+    ):
+        self.card_uris = list(card_uris)
+        self.agent_cards = list(agent_cards)
+        self.embeddings = embeddings
+        self.query_embedding = query_embedding or cached_query_embedding(
+            embed_query, query_cache_size
+        )
+        if approximate is None:
+            approximate = len(self.card_uris) >= APPROXIMATE_THRESHOLD
+        self.ivf = (
+            IVFIndex(embeddings, n_probe=n_probe)
+            if approximate and len(self.card_uris)
+            else None
+        )
+
+    def search(self, query: str, top_k: int = 1) -> list[tuple[int, float]]:
+        """Returns up to top_k (card index, score) pairs, best first."""
+        if not self.card_uris or top_k <= 0:
+            return []
+
+        query_embedding = self.query_embedding(query)
+        candidates = None
+        if self.ivf is not None:
+            candidates = self.ivf.candidates(query_embedding)
+        if candidates is not None and len(candidates):
+            scores = self.embeddings[candidates] @ query_embedding
+        else:
+            candidates = None
+            scores = self.embeddings @ query_embedding
+
+        k = min(top_k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        indexes = candidates[top] if candidates is not None else top
+        return [
+            (int(index), float(scores[i])) for index, i in zip(indexes, top)
+        ]
+
+
+def cached_query_embedding(
+    embed_query: EmbedFn, cache_size: int = 1024
+) -> Callable[[str], np.ndarray]:
+    """Wraps embed_query in an LRU cache of normalized, read-only vectors."""
+
+    @lru_cache(maxsize=cache_size)
+    def query_embedding(query: str) -> np.ndarray:
+        embedding = normalize(embed_query(query))
+        # Cached arrays are shared between callers.
+        embedding.setflags(write=False)
+        return embedding
+
+    return query_embedding
+
+
+class AgentCardRegistry:
+    """Keeps an AgentCardIndex in sync with a directory of agent cards.
+
+    Every card is fingerprinted by its content and only cards with a new
+    fingerprint are embedded, ``batch_size`` cards per embedding call. The
+    embeddings are persisted to ``cache_dir`` with their fingerprints, so a
+    restart with unchanged cards memory-maps the cached matrix instead of
+    calling the embedding model. ``watch`` polls the directory and rebuilds
+    the index when files are added, changed or removed. A rebuilt index
+    replaces ``index`` in a single assignment, so readers always see either
+    the old or the new index.
+    """
+
+    def __init__(
+        self,
+        cards_dir: str | Path,
+        load_cards: LoadCardsFn,
+        embed_documents: BatchEmbedFn,
+        embed_query: EmbedFn,
+        cache_dir: str | Path | None = None,
+        model: str = '',
+        batch_size: int = 100,
+        query_cache_size: int = 1024,
+        approximate: bool | None = None,
+        n_probe: int = 8,
+    ):
+        self.cards_dir = Path(cards_dir)
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.model = model
+        self.batch_size = batch_size
+        self.approximate = approximate
+        self.n_probe = n_probe
+        self.index: AgentCardIndex | None = None
+        self.fingerprints: list[str] = []
+        self.query_embedding = cached_query_embedding(
+            embed_query, query_cache_size
+        )
+        self._load_cards = load_cards
+        self._embed_documents = embed_documents
+        self._signature = None
+        self._reload_lock = threading.Lock()
+        self._stop_watching = threading.Event()
+        self._watcher: threading.Thread | None = None
+
+    def reload(self) -> bool:
+        """Rebuilds the index if the card files changed since the last load.
+
+        Returns:
+            True if a new index was swapped in.
+        """
+        with self._reload_lock:
+            signature = self._scan()
+            if self.index is not None and signature == self._signature:
+                return False
+
+            card_uris, agent_cards = self._load_cards()
+            fingerprints = [card_fingerprint(card) for card in agent_cards]
+            embeddings = self._embeddings_for(agent_cards, fingerprints)
+            self.index = AgentCardIndex(
+                card_uris,
+                agent_cards,
+                embeddings,
+                query_embedding=self.query_embedding,
+                approximate=self.approximate,
+                n_probe=self.n_probe,
+            )
+            self.fingerprints = fingerprints
+            self._signature = signature
+            logger.info(f'Agent card index holds {len(card_uris)} cards')
+            return True
+
+    def watch(self, poll_interval: float = 5.0) -> None:
+        """Starts a daemon thread that reloads the index on changes."""
+        if self._watcher is not None:
+            return
+
+        def poll():
+            while not self._stop_watching.wait(poll_interval):
+                try:
+                    self.reload()
+                except Exception as e:
+                    logger.error(f'Reloading agent cards failed: {e}')
+
+        self._stop_watching.clear()
+        self._watcher = threading.Thread(
+            target=poll, name='agent-card-watcher', daemon=True
+        )
+        self._watcher.start()
+
+    def stop(self) -> None:
+        self._stop_watching.set()
+        if self._watcher is not None:
+            self._watcher.join()
+            self._watcher = None
+
+    def _scan(self) -> frozenset:
+        try:
+            return frozenset(
+                (entry.name, entry.stat().st_mtime_ns, entry.stat().st_size)
+                for entry in os.scandir(self.cards_dir)
+                if entry.is_file() and entry.name.lower().endswith('.json')
+            )
+        except OSError:
+            return frozenset()
+
+    def _embeddings_for(
+        self, agent_cards: list[dict], fingerprints: list[str]
+    ) -> np.ndarray:
+        cached_fingerprints, cached = self._load_cache()
+        if cached is not None and cached_fingerprints == fingerprints:
+            logger.info(f'Loaded {len(cached)} card embeddings from cache')
+            return cached
+
+        known = {}
+        if cached is not None:
+            known.update(zip(cached_fingerprints, cached))
+        if self.index is not None:
+            known.update(zip(self.fingerprints, self.index.embeddings))
+
+        missing = {
+            fingerprint: card
+            for fingerprint, card in zip(fingerprints, agent_cards)
+            if fingerprint not in known
+        }
+        if missing:
+            logger.info(f'Generating embeddings for {len(missing)} cards')
+        pending = list(missing.items())
+        for start in range(0, len(pending), self.batch_size):
+            batch = pending[start : start + self.batch_size]
+            vectors = self._embed_documents(
+                [json.dumps(card) for _, card in batch]
+            )
+            known.update(zip((fp for fp, _ in batch), vectors))
+
+        if not fingerprints:
+            return np.zeros((0, 0), dtype=np.float32)
+        embeddings = np.ascontiguousarray(
+            normalize([known[fingerprint] for fingerprint in fingerprints])
+        )
+        self._save_cache(fingerprints, embeddings)
+        return embeddings
+
+    def _load_cache(self) -> tuple[list[str], np.ndarray | None]:
+        if self.cache_dir is None:
+            return [], None
+        try:
+            with (self.cache_dir / METADATA_FILE).open(encoding='utf-8') as f:
+                metadata = json.load(f)
+            if metadata.get('model') != self.model:
+                return [], None
+            embeddings = np.load(
+                self.cache_dir / EMBEDDINGS_FILE, mmap_mode='r'
+            )
+        except (OSError, ValueError) as e:
+            logger.info(f'No usable embedding cache in {self.cache_dir}: {e}')
+            return [], None
+        if len(embeddings) != len(metadata['fingerprints']):
+            return [], None
+        return metadata['fingerprints'], embeddings
+
+    def _save_cache(
+        self, fingerprints: list[str], embeddings: np.ndarray
+    ) -> None:
+        if self.cache_dir is None:
+            return
+        metadata = {'model': self.model, 'fingerprints': fingerprints}
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            # Written to temporary files first so a crash never leaves a
+            # cache whose metadata does not match its embeddings.
+            tmp_embeddings = self.cache_dir / f'{EMBEDDINGS_FILE}.tmp'
+            with tmp_embeddings.open('wb') as f:
+                np.save(f, embeddings)
+            tmp_metadata = self.cache_dir / f'{METADATA_FILE}.tmp'
+            with tmp_metadata.open('w', encoding='utf-8') as f:
+                json.dump(metadata, f)
+            os.replace(tmp_embeddings, self.cache_dir / EMBEDDINGS_FILE)
+            os.replace(tmp_metadata, self.cache_dir / METADATA_FILE)
+        except OSError as e:
+            logger.error(
+                f'Could not write embedding cache {self.cache_dir}: {e}'
+            )
@@ -2,6 +2,7 @@
 import asyncio
 import json
 import os
+import time
 
 from contextlib import asynccontextmanager
 
@@ -79,6 +80,169 @@ async def init_session(host, port, transport):
         )
 
 
+class _PooledSession:
+    """An MCP session kept open by a background task of the pool."""
+
+    def __init__(self, key: tuple):
+        self.key = key
+        self.session: ClientSession | None = None
+        self.error: Exception | None = None
+        self.ready = asyncio.Event()
+        self.closing = asyncio.Event()
+        self.task: asyncio.Task | None = None
+        self.in_use = 0
+        self.last_used = time.monotonic()
+        # Taken by callers that saw this session fail, so only the first of
+        # them replaces it.
+        self.reopen_lock = asyncio.Lock()
+        # Set once the session was replaced; it closes when its last user
+        # is done.
+        self.retired = False
+
+    def is_alive(self) -> bool:
+        return (
+            self.task is not None
+            and not self.task.done()
+            and not self.closing.is_set()
+            and self.task.get_loop() is asyncio.get_running_loop()
+        )
+
+
+class MCPSessionPool:
+    """Process-wide pool of initialized MCP client sessions.
+
+    Sessions are keyed by (host, port, transport) and shared by concurrent
+    callers, so only the first caller pays for the connect and the MCP
+    initialize handshake. A session that was idle for ``health_check_interval``
+    seconds is pinged before reuse and replaced if the ping fails; the failed
+    session is closed once the callers still using it are done. A session
+    whose connection drops is replaced on next use. Sessions unused for
+    ``idle_timeout`` seconds are closed.
+
+    Each session is opened and closed by its own background task, because the
+    transports' task groups must be exited by the task that entered them.
+    """
+
+    def __init__(
+        self,
+        idle_timeout: float = 300.0,
+        health_check_interval: float = 30.0,
+        ping_timeout: float = 5.0,
+    ):
+        self.idle_timeout = idle_timeout
+        self.health_check_interval = health_check_interval
+        self.ping_timeout = ping_timeout
+        self._entries: dict[tuple, _PooledSession] = {}
+
+    @asynccontextmanager
+    async def session(self, host, port, transport):
+        """Yields a shared, initialized ClientSession for the server.
+
+        Args:
+            host: The hostname or IP address of the MCP server (used for SSE).
+            port: The port number of the MCP server (used for SSE).
+            transport: The communication transport to use ('sse' or 'stdio').
+
+        Yields:
+            ClientSession: An initialized session, shared with other callers.
+        """
+        entry = await self._acquire((host, port, transport))
+        entry.in_use += 1
+        try:
+            yield entry.session
+        finally:
+            entry.in_use -= 1
+            entry.last_used = time.monotonic()
+            if entry.retired and entry.in_use == 0:
+                entry.closing.set()
+
+    async def close(self) -> None:
+        """Closes every pooled session."""
+        entries = list(self._entries.values())
+        self._entries.clear()
+        for entry in entries:
+            entry.closing.set()
+        await asyncio.gather(
+            *(entry.task for entry in entries), return_exceptions=True
+        )
+
+    async def _acquire(self, key: tuple) -> _PooledSession:
+        entry = self._entries.get(key)
+        if entry is None or not entry.is_alive():
+            entry = self._open(key)
+        await entry.ready.wait()
+
+        idle = time.monotonic() - entry.last_used
+        if entry.session is not None and idle > self.health_check_interval:
+            try:
+                await asyncio.wait_for(
+                    entry.session.send_ping(), timeout=self.ping_timeout
+                )
+            except Exception as e:
+                logger.warning(f'MCP session {key} failed health check: {e}')
+                entry = await self._reopen(entry)
+
+        if entry.session is None:
+            raise ConnectionError(
+                f'Could not open MCP session {key}: {entry.error}'
+            )
+        entry.last_used = time.monotonic()
+        return entry
+
+    async def _reopen(self, failed: _PooledSession) -> _PooledSession:
+        """Replaces a failed session once, for all callers that saw it fail."""
+        async with failed.reopen_lock:
+            entry = self._entries.get(failed.key)
+            # Only replace the pooled session if it is still the failed one;
+            # otherwise another caller already opened its replacement.
+            if entry is failed or entry is None or not entry.is_alive():
+                self._retire(failed)
+                entry = self._open(failed.key)
+        await entry.ready.wait()
+        return entry
+
+    def _retire(self, entry: _PooledSession) -> None:
+        """Stops handing out a session and closes it once it is unused."""
+        entry.retired = True
+        if self._entries.get(entry.key) is entry:
+            del self._entries[entry.key]
+        if entry.in_use == 0:
+            entry.closing.set()
+
+    def _open(self, key: tuple) -> _PooledSession:
+        entry = _PooledSession(key)
+        entry.task = asyncio.create_task(self._hold(entry))
+        self._entries[key] = entry
+        return entry
+
+    async def _hold(self, entry: _PooledSession) -> None:
+        try:
+            async with init_session(*entry.key) as session:
+                entry.session = session
+                entry.ready.set()
+                while not entry.closing.is_set():
+                    try:
+                        await asyncio.wait_for(
+                            entry.closing.wait(), timeout=self.idle_timeout
+                        )
+                    except TimeoutError:
+                        idle = time.monotonic() - entry.last_used
+                        if entry.in_use == 0 and idle >= self.idle_timeout:
+                            logger.info(f'Closing idle MCP session {entry.key}')
+                            break
+        except Exception as e:
+            entry.error = e
+            logger.warning(f'MCP session {entry.key} closed with error: {e}')
+        finally:
+            entry.session = None
+            entry.ready.set()
+            if self._entries.get(entry.key) is entry:
+                del self._entries[entry.key]
+
+
+session_pool = MCPSessionPool()
+
+
 async def find_agent(session: ClientSession, query) -> CallToolRequest:
     """Calls the 'find_agent' tool on the connected MCP server.
 
@@ -0,0 +1,171 @@
+# type: ignore
+import asyncio
+import json
+import os
+import time
+
+import httpx
+
+from mcp.server.fastmcp.utilities.logging import get_logger
+
+
+logger = get_logger(__name__)
+PLACES_API_URL = 'https://places.googleapis.com/v1/places:searchText'
+
+
+class CircuitBreaker:
+    """Stops calling a failing dependency for a while.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    calls are refused for ``reset_timeout`` seconds. Then a single trial call
+    is let through; its outcome closes the circuit or opens it again. A call
+    that ends without recording an outcome must ``release`` the trial.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: float | None = None
+        self._trial_running = False
+
+    @property
+    def is_open(self) -> bool:
+        return self.opened_at is not None
+
+    def allow(self) -> bool:
+        if self.opened_at is None:
+            return True
+        if time.monotonic() - self.opened_at < self.reset_timeout:
+            return False
+        if self._trial_running:
+            return False
+        self._trial_running = True
+        return True
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self._trial_running = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self._trial_running or self.failures >= self.failure_threshold:
+            if self.opened_at is None or self._trial_running:
+                logger.warning('Places API circuit opened')
+            self.opened_at = time.monotonic()
+        self._trial_running = False
+
+    def release(self) -> None:
+        """Ends a trial call that recorded no outcome, e.g. as it raised."""
+        self._trial_running = False
+
+
+class PlacesClient:
+    """Async Google Places text-search client.
+
+    All lookups share one connection pool. Concurrent lookups of the same
+    query with the same API key share a single request. Failed lookups, and
+    lookups refused while the circuit breaker is open, return an empty
+    result. Only server errors, transport errors and malformed responses
+    count towards opening the circuit; a 4xx response means the API is up.
+    """
+
+    def __init__(
+        self,
+        api_url: str = PLACES_API_URL,
+        api_key: str | None = None,
+        timeout: float = 10.0,
+        max_connections: int = 20,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+    ):
+        self.api_url = api_url
+        self.api_key = api_key
+        self.timeout = timeout
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+        )
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self._client: httpx.AsyncClient | None = None
+        self._in_flight: dict[tuple[str, str], asyncio.Future] = {}
+
+    async def search(self, query: str) -> dict:
+        api_key = self.api_key or os.getenv('GOOGLE_PLACES_API_KEY')
+        if not api_key:
+            logger.info('GOOGLE_PLACES_API_KEY is not set')
+            return {'places': []}
+
+        # Lookups with different keys may get different answers, e.g. when
+        # one key is over its quota.
+        key = (api_key, query)
+        in_flight = self._in_flight.get(key)
+        if in_flight is None:
+            in_flight = asyncio.ensure_future(self._search(query, api_key))
+            self._in_flight[key] = in_flight
+            in_flight.add_done_callback(
+                lambda _: self._in_flight.pop(key, None)
+            )
+        # A caller giving up must not cancel the request for the others.
+        return await asyncio.shield(in_flight)
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout, limits=self.limits
+            )
+        return self._client
+
+    async def _search(self, query: str, api_key: str) -> dict:
+        if not self.breaker.allow():
+            logger.info('Places API circuit is open, skipping lookup')
+            return {'places': []}
+        try:
+            return await self._post(query, api_key)
+        finally:
+            # Ends the trial if the call raised, e.g. was cancelled, so the
+            # circuit does not stay open for good.
+            self.breaker.release()
+
+    async def _post(self, query: str, api_key: str) -> dict:
+        headers = {
+            'X-Goog-Api-Key': api_key,
+            'X-Goog-FieldMask': 'places.id,places.displayName,places.formattedAddress',
+            'Content-Type': 'application/json',
+        }
+        payload = {
+            'textQuery': query,
+            'languageCode': 'en',
+            'maxResultCount': 10,
+        }
+
+        try:
+            response = await self._get_client().post(
+                self.api_url, headers=headers, json=payload
+            )
+            response.raise_for_status()
+            result = response.json()
+            self.breaker.record_success()
+            return result
+        except httpx.HTTPStatusError as http_err:
+            logger.info(f'HTTP error occurred: {http_err}')
+            logger.info(f'Response content: {http_err.response.text}')
+            if http_err.response.status_code < 500:
+                self.breaker.record_success()
+                return {'places': []}
+        except httpx.TimeoutException as timeout_err:
+            logger.info(f'Timeout error occurred: {timeout_err}')
+        except httpx.RequestError as req_err:
+            logger.info(f'Connection error occurred: {req_err}')
+        except json.JSONDecodeError:
+            logger.info(
+                f'Failed to decode JSON response. Raw response: {response.text}'
+            )
+        self.breaker.record_failure()
+        return {'places': []}
@@ -1,36 +1,42 @@
 # type: ignore
 import json
 import os
-import sqlite3
 import traceback
 
 from pathlib import Path
 
 import google.generativeai as genai
-import numpy as np
-import pandas as pd
-import requests
 
 from a2a_mcp.common.utils import init_api_key
+from a2a_mcp.mcp.agent_index import AgentCardRegistry
+from a2a_mcp.mcp.places import PlacesClient
+from a2a_mcp.mcp.sqlite_pool import ReadOnlySQLitePool
+from a2a_mcp.mcp.tool_cache import ToolResultCache
 from mcp.server.fastmcp import FastMCP
 from mcp.server.fastmcp.utilities.logging import get_logger
 
 
 logger = get_logger(__name__)
 AGENT_CARDS_DIR = 'agent_cards'
+AGENT_INDEX_DIR = os.getenv('AGENT_INDEX_DIR', '.agent_card_index')
 MODEL = 'models/embedding-001'
 SQLLITE_DB = 'travel_agency.db'
-PLACES_API_URL = 'https://places.googleapis.com/v1/places:searchText'
+SQLLITE_MAX_ROWS = int(os.getenv('SQLLITE_MAX_ROWS', '100'))
+PLACES_API_URL = os.getenv(
+    'PLACES_API_URL', 'https://places.googleapis.com/v1/places:searchText'
+)
+TOOL_CACHE_SIZE = int(os.getenv('TOOL_CACHE_SIZE', '1024'))
 
 
 def generate_embeddings(text):
     """Generates embeddings for the given text using Google Generative AI.
 
     Args:
-        text: The input string for which to generate embeddings.
+        text: The input string, or a list of strings to embed in one call.
 
     Returns:
-        A list of embeddings representing the input text.
+        A list of embeddings representing the input text, or one such list
+        per input string.
     """
     return genai.embed_content(
         model=MODEL,
@@ -39,6 +45,22 @@ def generate_embeddings(text):
     )['embedding']
 
 
+def generate_query_embeddings(text):
+    """Generates embeddings for a search query using Google Generative AI.
+
+    Args:
+        text: The query string for which to generate embeddings.
+
+    Returns:
+        A list of embeddings representing the query.
+    """
+    return genai.embed_content(
+        model=MODEL,
+        content=text,
+        task_type='retrieval_query',
+    )['embedding']
+
+
 def load_agent_cards():
     """Loads agent card data from JSON files within a specified directory.
 
@@ -54,7 +76,7 @@ def load_agent_cards():
         logger.error(
             f'Agent cards directory not found or is not a directory: {AGENT_CARDS_DIR}'
         )
-        return agent_cards
+        return card_uris, agent_cards
 
     logger.info(f'Loading agent cards from card repo: {AGENT_CARDS_DIR}')
 
@@ -86,31 +108,32 @@ def load_agent_cards():
     return card_uris, agent_cards
 
 
-def build_agent_card_embeddings() -> pd.DataFrame:
-    """Loads agent cards, generates embeddings for them, and returns a DataFrame.
+def build_agent_card_embeddings() -> AgentCardRegistry:
+    """Loads agent cards and builds the embedding index over them.
+
+    Only cards that changed since their embeddings were cached in
+    AGENT_INDEX_DIR are embedded, in batches.
 
     Returns:
-        Optional[pd.DataFrame]: A Pandas DataFrame containing the original
-        'agent_card' data and their corresponding 'Embeddings'. Returns None
-        if no agent cards were loaded initially or if an exception occurred
-        during the embedding generation process.
+        AgentCardRegistry: The registry holding the index over the loaded
+        agent cards. If the embedding generation failed its index is None
+        until a later reload succeeds.
     """
-    card_uris, agent_cards = load_agent_cards()
+    registry = AgentCardRegistry(
+        AGENT_CARDS_DIR,
+        load_cards=load_agent_cards,
+        embed_documents=generate_embeddings,
+        embed_query=generate_query_embeddings,
+        cache_dir=AGENT_INDEX_DIR,
+        model=MODEL,
+    )
     logger.info('Generating Embeddings for agent cards')
     try:
-        if agent_cards:
-            df = pd.DataFrame(
-                {'card_uri': card_uris, 'agent_card': agent_cards}
-            )
-            df['card_embeddings'] = df.apply(
-                lambda row: generate_embeddings(json.dumps(row['agent_card'])),
-                axis=1,
-            )
-            return df
+        registry.reload()
         logger.info('Done generating embeddings for agent cards')
     except Exception as e:
         logger.error(f'An unexpected error occurred : {e}.', exc_info=True)
-        return None
+    return registry
 
 
 def serve(host, port, transport):  # noqa: PLR0915
@@ -128,7 +151,13 @@ def serve(host, port, transport):  # noqa: PLR0915
     logger.info('Starting Agent Cards MCP Server')
     mcp = FastMCP('agent-cards', host=host, port=port)
 
-    df = build_agent_card_embeddings()
+    registry = build_agent_card_embeddings()
+    # Picks up agent cards added, changed or removed while serving, and
+    # retries the first load if it failed.
+    registry.watch()
+    travel_db = ReadOnlySQLitePool(SQLLITE_DB, max_rows=SQLLITE_MAX_ROWS)
+    tool_cache = ToolResultCache(max_entries=TOOL_CACHE_SIZE)
+    places = PlacesClient(api_url=PLACES_API_URL)
 
     @mcp.tool(
         name='find_agent',
@@ -139,9 +168,8 @@ def serve(host, port, transport):  # noqa: PLR0915
 
         This function takes a user query, typically a natural language question or a task generated by an agent,
         generates its embedding, and compares it against the
-        pre-computed embeddings of the loaded agent cards. It uses the dot
-        product to measure similarity and identifies the agent card with the
-        highest similarity score.
+        pre-computed embeddings of the loaded agent cards. It uses the cosine
+        similarity to identify the agent card with the highest score.
 
         Args:
             query: The natural language query string used to search for a
@@ -151,74 +179,73 @@ def serve(host, port, transport):  # noqa: PLR0915
             The json representing the agent card deemed most relevant
             to the input query based on embedding similarity.
         """
-        query_embedding = genai.embed_content(
-            model=MODEL, content=query, task_type='retrieval_query'
-        )
-        dot_products = np.dot(
-            np.stack(df['card_embeddings']), query_embedding['embedding']
-        )
-        best_match_index = np.argmax(dot_products)
+        index = registry.index
+        matches = index.search(query, top_k=1) if index is not None else []
+        if not matches:
+            raise ValueError('No agent cards are loaded')
+        [(best_match_index, score)] = matches
         logger.debug(
-            f'Found best match at index {best_match_index} with score {dot_products[best_match_index]}'
+            f'Found best match at index {best_match_index} with score {score}'
         )
-        return df.iloc[best_match_index]['agent_card']
+        return index.agent_cards[best_match_index]
+
+    @mcp.tool(
+        name='find_agents',
+        description='Finds the agent cards most relevant to a natural language query string, with their similarity scores.',
+    )
+    def find_agents(query: str, top_k: int = 3) -> list[dict]:
+        """Finds the agent cards most relevant to a query string.
+
+        Args:
+            query: The natural language query string used to search for
+                   relevant agents.
+            top_k: The maximum number of agent cards to return.
+
+        Returns:
+            A list of {'agent_card': ..., 'score': ...} entries, best match
+            first.
+        """
+        index = registry.index
+        if index is None:
+            return []
+        return [
+            {'agent_card': index.agent_cards[i], 'score': score}
+            for i, score in index.search(query, top_k=top_k)
+        ]
 
     @mcp.tool()
-    def query_places_data(query: str):
+    # Failed lookups fall back to an empty result, which is not cached.
+    @tool_cache.cached(
+        ttl=3600, cache_if=lambda result: bool(result.get('places'))
+    )
+    async def query_places_data(query: str):
         """Query Google Places."""
         logger.info(f'Search for places : {query}')
-        api_key = os.getenv('GOOGLE_PLACES_API_KEY')
-        if not api_key:
-            logger.info('GOOGLE_PLACES_API_KEY is not set')
-            return {'places': []}
-
-        headers = {
-            'X-Goog-Api-Key': api_key,
-            'X-Goog-FieldMask': 'places.id,places.displayName,places.formattedAddress',
-            'Content-Type': 'application/json',
-        }
-        payload = {
-            'textQuery': query,
-            'languageCode': 'en',
-            'maxResultCount': 10,
-        }
-
-        try:
-            response = requests.post(
-                PLACES_API_URL, headers=headers, json=payload
-            )
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.HTTPError as http_err:
-            logger.info(f'HTTP error occurred: {http_err}')
-            logger.info(f'Response content: {response.text}')
-        except requests.exceptions.ConnectionError as conn_err:
-            logger.info(f'Connection error occurred: {conn_err}')
-        except requests.exceptions.Timeout as timeout_err:
-            logger.info(f'Timeout error occurred: {timeout_err}')
-        except requests.exceptions.RequestException as req_err:
-            logger.info(
-                f'An unexpected error occurred with the request: {req_err}'
-            )
-        except json.JSONDecodeError:
-            logger.info(
-                f'Failed to decode JSON response. Raw response: {response.text}'
-            )
-
-        return {'places': []}
+        return await places.search(query)
 
     @mcp.tool()
-    def query_travel_data(query: str) -> dict:
+    # Errors are returned as dicts and results as JSON text.
+    @tool_cache.cached(ttl=60, cache_if=lambda result: isinstance(result, str))
+    def query_travel_data(query: str, limit: int = 0, offset: int = 0) -> dict:
         """
         "name": "query_travel_data",
         "description": "Retrieves the most up-to-date, ariline, hotel and car rental availability. Helps with the booking.
-        This tool should be used when a user asks for the airline ticket booking, hotel or accommodation booking, or car rental reservations.",
+        This tool should be used when a user asks for the airline ticket booking, hotel or accommodation booking, or car rental reservations.
+        Returns one page of rows; when 'next_offset' is set, call again with that offset for more rows.",
         "parameters": {
             "type": "object",
             "properties": {
             "query": {
                 "type": "string",
                 "description": "A SQL to run against the travel database."
+            },
+            "limit": {
+                "type": "integer",
+                "description": "Maximum number of rows to return, capped by the server."
+            },
+            "offset": {
+                "type": "integer",
+                "description": "Number of rows to skip."
             }
             },
             "required": ["query"]
@@ -231,21 +258,26 @@ def serve(host, port, transport):  # noqa: PLR0915
             raise ValueError(f'In correct query {query}')
 
         try:
-            with sqlite3.connect(SQLLITE_DB) as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.cursor()
-                cursor.execute(query)
-                rows = cursor.fetchall()
-                result = {'results': [dict(row) for row in rows]}
-                return json.dumps(result)
+            result = travel_db.query(query, limit=limit, offset=offset)
+            return json.dumps(result)
         except Exception as e:
             logger.error(f'Exception running query {e}')
             logger.error(traceback.format_exc())
-            if 'no such column' in e:
+            if 'no such column' in str(e):
                 return {
                     'error': f'Please check your query, {e}. Use the table schema to regenerate the query'
                 }
-            return {'error': {e}}
+            return {'error': str(e)}
+
+    @mcp.resource('resource://travel_data/stats', mime_type='application/json')
+    def get_travel_data_stats() -> dict:
+        """Retrieves the connection pool and per-query timing stats of the travel database."""
+        return travel_db.get_stats()
+
+    @mcp.resource('resource://tool_cache/stats', mime_type='application/json')
+    def get_tool_cache_stats() -> dict:
+        """Retrieves the hit and miss counters of the tool result cache."""
+        return tool_cache.get_stats()
 
     @mcp.resource('resource://agent_cards/list', mime_type='application/json')
     def get_agent_cards() -> dict:
@@ -261,7 +293,10 @@ def serve(host, port, transport):  # noqa: PLR0915
         """
         resources = {}
         logger.info('Starting read resources')
-        resources['agent_cards'] = df['card_uri'].to_list()
+        index = registry.index
+        resources['agent_cards'] = (
+            list(index.card_uris) if index is not None else []
+        )
         return resources
 
     @mcp.resource(
@@ -280,12 +315,16 @@ def serve(host, port, transport):  # noqa: PLR0915
         logger.info(
             f'Starting read resource resource://agent_cards/{card_name}'
         )
-        resources['agent_card'] = (
-            df.loc[
-                df['card_uri'] == f'resource://agent_cards/{card_name}',
-                'agent_card',
-            ]
-        ).to_list()
+        card_uri = f'resource://agent_cards/{card_name}'
+        index = registry.index
+        if index is None:
+            resources['agent_card'] = []
+            return resources
+        resources['agent_card'] = [
+            card
+            for uri, card in zip(index.card_uris, index.agent_cards)
+            if uri == card_uri
+        ]
 
         return resources
 
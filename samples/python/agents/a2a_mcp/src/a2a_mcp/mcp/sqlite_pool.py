@@ -0,0 +1,157 @@
+# type: ignore
+import queue
+import sqlite3
+import threading
+import time
+
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+
+from mcp.server.fastmcp.utilities.logging import get_logger
+
+
+logger = get_logger(__name__)
+
+
+class ReadOnlySQLitePool:
+    """Pool of read-only connections to a SQLite database.
+
+    Connections are opened with the ``mode=ro`` URI flag and ``query_only``
+    set, so the pool can never write to the database, and are reused across
+    queries so each keeps its cache of ``cached_statements`` prepared
+    statements. Results are paginated: a query returns at most ``max_rows``
+    rows along with the offset of the next page. Timing stats are kept for
+    the ``stats_size`` most recent distinct queries.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        size: int = 4,
+        max_rows: int = 100,
+        cached_statements: int = 256,
+        timeout: float = 5.0,
+        stats_size: int = 256,
+    ):
+        self.uri = f'{Path(path).resolve().as_uri()}?mode=ro'
+        self.size = size
+        self.max_rows = max_rows
+        self.cached_statements = cached_statements
+        self.timeout = timeout
+        self.stats_size = stats_size
+        self._idle: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue()
+        self._opened = 0
+        self._lock = threading.Lock()
+        self._stats: OrderedDict[str, dict] = OrderedDict()
+
+    @contextmanager
+    def connection(self):
+        """Borrows a connection, waiting up to timeout for a free one."""
+        conn = self._acquire()
+        try:
+            yield conn
+        finally:
+            self._idle.put(conn)
+
+    def query(
+        self, sql: str, params=(), limit: int | None = None, offset: int = 0
+    ) -> dict:
+        """Runs a SELECT and returns one page of its rows.
+
+        Returns:
+            A dict with the 'results' of the page as a list of dicts, and
+            'next_offset', the offset of the next page or None on the last
+            page.
+        """
+        limit = min(limit or self.max_rows, self.max_rows)
+        offset = max(offset, 0)
+        start = time.perf_counter()
+        with self.connection() as conn:
+            # SQLite produces rows as they are fetched, so only the rows up
+            # to the end of the page are computed. The statement itself is
+            # run unchanged, keeping its column names and ordering.
+            cursor = conn.execute(sql, params)
+            try:
+                skipped = 0
+                while skipped < offset:
+                    batch = cursor.fetchmany(min(offset - skipped, 1000))
+                    if not batch:
+                        break
+                    skipped += len(batch)
+                rows = cursor.fetchmany(limit + 1)
+            finally:
+                cursor.close()
+        self._record(sql, time.perf_counter() - start, len(rows))
+
+        has_more = len(rows) > limit
+        return {
+            'results': [dict(row) for row in rows[:limit]],
+            'next_offset': offset + limit if has_more else None,
+        }
+
+    def get_stats(self) -> dict:
+        """Returns the connection count and per-query timing stats."""
+        with self._lock:
+            return {
+                'connections': self._opened,
+                'idle_connections': self._idle.qsize(),
+                'queries': [
+                    {'query': sql, **stats}
+                    for sql, stats in self._stats.items()
+                ],
+            }
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+    def _acquire(self) -> sqlite3.Connection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            can_open = self._opened < self.size
+            if can_open:
+                self._opened += 1
+        if can_open:
+            try:
+                return self._connect()
+            except sqlite3.Error:
+                with self._lock:
+                    self._opened -= 1
+                raise
+        try:
+            return self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise TimeoutError('No free SQLite connection') from None
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.uri,
+            uri=True,
+            check_same_thread=False,
+            cached_statements=self.cached_statements,
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute('PRAGMA query_only = ON')
+        return conn
+
+    def _record(self, sql: str, elapsed: float, rows: int) -> None:
+        logger.info(f'Query took {elapsed * 1000:.1f}ms for {rows} rows')
+        with self._lock:
+            stats = self._stats.pop(sql, None) or {
+                'count': 0,
+                'total_ms': 0.0,
+                'max_ms': 0.0,
+            }
+            stats['count'] += 1
+            stats['total_ms'] += elapsed * 1000
+            stats['max_ms'] = max(stats['max_ms'], elapsed * 1000)
+            self._stats[sql] = stats
+            if len(self._stats) > self.stats_size:
+                self._stats.popitem(last=False)
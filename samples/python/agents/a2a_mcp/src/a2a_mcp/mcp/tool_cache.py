@@ -0,0 +1,141 @@
+# type: ignore
+import functools
+import inspect
+import json
+import threading
+import time
+
+from collections import OrderedDict, defaultdict
+from collections.abc import Callable
+from typing import Any
+
+
+# Returned by ToolResultCache.get for keys without a live entry, as None can
+# be a cached result.
+MISSING = object()
+
+
+class ToolResultCache:
+    """TTL and size-bounded LRU cache for the results of MCP tools.
+
+    Tools opt in with the ``cached`` decorator, which keys each call on the
+    tool name and its arguments after binding them to the tool's signature,
+    so positional, keyword and defaulted arguments share one entry. Hit and
+    miss counters are kept per tool. Subclasses can override ``get`` and
+    ``set`` to store results elsewhere.
+    """
+
+    def __init__(self, max_entries: int = 1024, default_ttl: float = 300.0):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits: defaultdict[str, int] = defaultdict(int)
+        self._misses: defaultdict[str, int] = defaultdict(int)
+
+    def get(self, key: str) -> Any:
+        """Returns the cached value for key, or MISSING if there is none."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return MISSING
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return MISSING
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> dict:
+        """Returns the entry count and per-tool hit/miss counters."""
+        with self._lock:
+            tools = set(self._hits) | set(self._misses)
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'tools': {
+                    tool: {
+                        'hits': self._hits[tool],
+                        'misses': self._misses[tool],
+                    }
+                    for tool in sorted(tools)
+                },
+            }
+
+    def cached(
+        self,
+        ttl: float | None = None,
+        name: str | None = None,
+        cache_if: Callable[[Any], bool] | None = None,
+    ):
+        """Caches the results of the decorated tool function.
+
+        Args:
+            ttl: Seconds a result stays valid, defaults to default_ttl.
+            name: The tool name used in keys and stats, defaults to the
+                  function name.
+            cache_if: Only results for which this returns True are cached,
+                      e.g. to skip error results.
+        """
+        ttl = self.default_ttl if ttl is None else ttl
+
+        def decorator(fn):
+            tool = name or fn.__name__
+            signature = inspect.signature(fn)
+
+            def key_for(args, kwargs) -> str:
+                bound = signature.bind(*args, **kwargs)
+                bound.apply_defaults()
+                return json.dumps(
+                    [tool, bound.arguments], sort_keys=True, default=str
+                )
+
+            def lookup(key: str) -> Any:
+                value = self.get(key)
+                with self._lock:
+                    if value is MISSING:
+                        self._misses[tool] += 1
+                    else:
+                        self._hits[tool] += 1
+                return value
+
+            def store(key: str, value: Any) -> None:
+                if cache_if is None or cache_if(value):
+                    self.set(key, value, ttl)
+
+            if inspect.iscoroutinefunction(fn):
+
+                @functools.wraps(fn)
+                async def async_wrapper(*args, **kwargs):
+                    key = key_for(args, kwargs)
+                    value = lookup(key)
+                    if value is MISSING:
+                        value = await fn(*args, **kwargs)
+                        store(key, value)
+                    return value
+
+                return async_wrapper
+
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                key = key_for(args, kwargs)
+                value = lookup(key)
+                if value is MISSING:
+                    value = fn(*args, **kwargs)
+                    store(key, value)
+                return value
+
+            return wrapper
+
+        return decorator
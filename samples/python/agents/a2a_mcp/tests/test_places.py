@@ -0,0 +1,149 @@
+import asyncio
+import json
+import threading
+import time
+import unittest
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from a2a_mcp.mcp.places import CircuitBreaker, PlacesClient
+
+
+class _StubPlacesAPI(BaseHTTPRequestHandler):
+    """Answers every POST with the server's status and places."""
+
+    def do_POST(self):
+        server = self.server
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        with server.lock:
+            server.requests.append(
+                (self.headers['X-Goog-Api-Key'], body['textQuery'])
+            )
+        time.sleep(server.delay)
+        if server.status == 200:
+            content = json.dumps(
+                {'places': [{'id': body['textQuery']}]}
+            ).encode()
+        else:
+            content = b'{"error": {}}'
+        self.send_response(server.status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    def test_opens_after_threshold(self):
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+        breaker.record_failure()
+        self.assertFalse(breaker.is_open)
+        breaker.record_failure()
+        self.assertTrue(breaker.is_open)
+        self.assertFalse(breaker.allow())
+
+    def test_single_trial_after_reset_timeout(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+        breaker.record_failure()
+        self.assertTrue(breaker.allow())
+        # Only one trial call at a time.
+        self.assertFalse(breaker.allow())
+        breaker.record_success()
+        self.assertFalse(breaker.is_open)
+        self.assertTrue(breaker.allow())
+        self.assertTrue(breaker.allow())
+
+    def test_failed_trial_reopens(self):
+        breaker = CircuitBreaker(failure_threshold=3, reset_timeout=0)
+        for _ in range(3):
+            breaker.record_failure()
+        opened_at = breaker.opened_at
+        self.assertTrue(breaker.allow())
+        breaker.record_failure()
+        self.assertTrue(breaker.is_open)
+        self.assertGreaterEqual(breaker.opened_at, opened_at)
+        self.assertTrue(breaker.allow())
+
+    def test_released_trial_allows_another(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+        breaker.record_failure()
+        self.assertTrue(breaker.allow())
+        breaker.release()
+        self.assertTrue(breaker.allow())
+
+
+class TestPlacesClient(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), _StubPlacesAPI)
+        self.server.lock = threading.Lock()
+        self.server.requests = []
+        self.server.status = 200
+        self.server.delay = 0
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.start()
+        host, port = self.server.server_address
+        self.client = PlacesClient(
+            api_url=f'http://{host}:{port}/v1/places:searchText',
+            api_key='key',
+            failure_threshold=2,
+            reset_timeout=60,
+        )
+
+    async def asyncTearDown(self):
+        await self.client.aclose()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+
+    async def test_search(self):
+        result = await self.client.search('paris')
+        self.assertEqual(result, {'places': [{'id': 'paris'}]})
+        self.assertEqual(self.server.requests, [('key', 'paris')])
+
+    async def test_client_error_does_not_open_circuit(self):
+        self.server.status = 403
+        for _ in range(3):
+            self.assertEqual(await self.client.search('paris'), {'places': []})
+        self.assertFalse(self.client.breaker.is_open)
+        self.assertEqual(len(self.server.requests), 3)
+
+    async def test_server_errors_open_circuit(self):
+        self.server.status = 503
+        for _ in range(3):
+            self.assertEqual(await self.client.search('paris'), {'places': []})
+        self.assertTrue(self.client.breaker.is_open)
+        # The third lookup was refused by the open circuit.
+        self.assertEqual(len(self.server.requests), 2)
+
+    async def test_concurrent_lookups_share_a_request(self):
+        self.server.delay = 0.1
+        results = await asyncio.gather(
+            *(self.client.search('paris') for _ in range(5)),
+            self.client.search('rome'),
+        )
+        self.assertEqual(results[:5], [{'places': [{'id': 'paris'}]}] * 5)
+        self.assertEqual(results[5], {'places': [{'id': 'rome'}]})
+        self.assertEqual(
+            sorted(self.server.requests), [('key', 'paris'), ('key', 'rome')]
+        )
+
+    async def test_lookups_with_other_api_keys_are_not_shared(self):
+        self.server.delay = 0.1
+        first = asyncio.create_task(self.client.search('paris'))
+        # Lets the first lookup start its request under the old key.
+        await asyncio.sleep(0)
+        self.client.api_key = 'other'
+        await asyncio.gather(first, self.client.search('paris'))
+        self.assertEqual(
+            sorted(self.server.requests),
+            [('key', 'paris'), ('other', 'paris')],
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
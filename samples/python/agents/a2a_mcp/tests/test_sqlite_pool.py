@@ -0,0 +1,93 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from a2a_mcp.mcp.sqlite_pool import ReadOnlySQLitePool
+
+
+class TestReadOnlySQLitePool(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, 'travel.db')
+        with sqlite3.connect(self.path) as conn:
+            conn.execute('CREATE TABLE flights (id INTEGER, carrier TEXT)')
+            conn.executemany(
+                'INSERT INTO flights VALUES (?, ?)',
+                [(i, f'carrier_{i}') for i in range(25)],
+            )
+        conn.close()
+        self.pool = ReadOnlySQLitePool(self.path, size=2, max_rows=10)
+
+    def tearDown(self):
+        self.pool.close()
+        self.tmp_dir.cleanup()
+
+    def count_flights(self) -> int:
+        with sqlite3.connect(self.path) as conn:
+            (count,) = conn.execute('SELECT COUNT(*) FROM flights').fetchone()
+        conn.close()
+        return count
+
+    def test_connections_are_reused(self):
+        for _ in range(5):
+            self.pool.query('SELECT * FROM flights WHERE id = ?', (1,))
+        stats = self.pool.get_stats()
+        self.assertEqual(stats['connections'], 1)
+        self.assertEqual(stats['idle_connections'], 1)
+        self.assertEqual(stats['queries'][0]['count'], 5)
+
+    def test_pool_size_is_bounded(self):
+        pool = ReadOnlySQLitePool(self.path, size=1, timeout=0.01)
+        with pool.connection() as conn:
+            with self.assertRaises(TimeoutError):
+                with pool.connection():
+                    pass
+        with pool.connection() as reused:
+            self.assertIs(reused, conn)
+        pool.close()
+
+    def test_paging(self):
+        sql = 'SELECT * FROM flights ORDER BY id'
+        page = self.pool.query(sql, limit=10)
+        self.assertEqual(
+            [row['id'] for row in page['results']], list(range(10))
+        )
+        self.assertEqual(page['next_offset'], 10)
+
+        page = self.pool.query(sql, limit=10, offset=20)
+        self.assertEqual(
+            [row['id'] for row in page['results']], list(range(20, 25))
+        )
+        self.assertIsNone(page['next_offset'])
+
+        page = self.pool.query(sql, limit=5, offset=8)
+        self.assertEqual(
+            [row['id'] for row in page['results']], list(range(8, 13))
+        )
+        self.assertEqual(page['next_offset'], 13)
+
+        # The limit is capped at max_rows.
+        page = self.pool.query(sql, limit=100)
+        self.assertEqual(len(page['results']), 10)
+
+        page = self.pool.query(sql, offset=100)
+        self.assertEqual(page['results'], [])
+        self.assertIsNone(page['next_offset'])
+
+    def test_writes_are_rejected(self):
+        for sql in (
+            "INSERT INTO flights VALUES (100, 'carrier_100')",
+            'DELETE FROM flights',
+            'DROP TABLE flights',
+        ):
+            with self.assertRaises(sqlite3.OperationalError):
+                self.pool.query(sql)
+        with self.pool.connection() as conn:
+            with self.assertRaises(sqlite3.OperationalError):
+                conn.execute('UPDATE flights SET carrier = NULL')
+        self.assertEqual(self.count_flights(), 25)
+
+
+if __name__ == '__main__':
+    unittest.main()
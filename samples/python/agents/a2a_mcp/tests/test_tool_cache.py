@@ -0,0 +1,114 @@
+import unittest
+
+from unittest.mock import patch
+
+from a2a_mcp.mcp.tool_cache import MISSING, ToolResultCache
+
+
+class TestToolResultCache(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.cache = ToolResultCache(max_entries=3, default_ttl=60)
+        self.calls = []
+
+    def search_tool(self):
+        @self.cache.cached()
+        def search(query, limit=10):
+            self.calls.append((query, limit))
+            return f'{query}:{limit}'
+
+        return search
+
+    def test_get_missing_key(self):
+        self.assertIs(self.cache.get('missing'), MISSING)
+        self.cache.set('none', None, ttl=60)
+        self.assertIsNone(self.cache.get('none'))
+
+    def test_entries_expire(self):
+        with patch('time.monotonic', return_value=100.0):
+            self.cache.set('key', 'value', ttl=10)
+        with patch('time.monotonic', return_value=109.0):
+            self.assertEqual(self.cache.get('key'), 'value')
+        with patch('time.monotonic', return_value=111.0):
+            self.assertIs(self.cache.get('key'), MISSING)
+        self.assertEqual(self.cache.get_stats()['entries'], 0)
+
+    def test_least_recently_used_entry_is_evicted(self):
+        for key in ('a', 'b', 'c'):
+            self.cache.set(key, key, ttl=60)
+        self.cache.get('a')
+        self.cache.set('d', 'd', ttl=60)
+        self.assertIs(self.cache.get('b'), MISSING)
+        for key in ('a', 'c', 'd'):
+            self.assertEqual(self.cache.get(key), key)
+        self.assertEqual(self.cache.get_stats()['entries'], 3)
+
+    def test_bound_arguments_share_a_key(self):
+        search = self.search_tool()
+        self.assertEqual(search('paris'), 'paris:10')
+        self.assertEqual(search('paris', 10), 'paris:10')
+        self.assertEqual(search(query='paris', limit=10), 'paris:10')
+        self.assertEqual(search('paris', limit=5), 'paris:5')
+        self.assertEqual(self.calls, [('paris', 10), ('paris', 5)])
+        self.assertEqual(
+            self.cache.get_stats()['tools'],
+            {'search': {'hits': 2, 'misses': 2}},
+        )
+
+    def test_tool_name_is_part_of_the_key(self):
+        @self.cache.cached(name='hotels')
+        def hotels(query):
+            return f'hotel in {query}'
+
+        @self.cache.cached(name='cars')
+        def cars(query):
+            return f'car in {query}'
+
+        self.assertEqual(hotels('paris'), 'hotel in paris')
+        self.assertEqual(cars('paris'), 'car in paris')
+        self.assertEqual(
+            set(self.cache.get_stats()['tools']), {'hotels', 'cars'}
+        )
+
+    def test_cache_if_skips_results(self):
+        @self.cache.cached(cache_if=lambda result: 'error' not in result)
+        def lookup(query):
+            self.calls.append(query)
+            return {'error': 'failed'} if query == 'bad' else {'ok': query}
+
+        for _ in range(2):
+            lookup('bad')
+            lookup('good')
+        self.assertEqual(self.calls, ['bad', 'good', 'bad'])
+
+    async def test_async_tool(self):
+        @self.cache.cached(ttl=60)
+        async def query_db(query):
+            self.calls.append(query)
+            return [query]
+
+        self.assertEqual(await query_db('SELECT 1'), ['SELECT 1'])
+        self.assertEqual(await query_db('SELECT 1'), ['SELECT 1'])
+        self.assertEqual(self.calls, ['SELECT 1'])
+
+    def test_subclass_storage(self):
+        class DictCache(ToolResultCache):
+            def __init__(self):
+                super().__init__()
+                self.store = {}
+
+            def get(self, key):
+                return self.store.get(key, MISSING)
+
+            def set(self, key, value, ttl):
+                self.store[key] = value
+
+        self.cache = DictCache()
+        search = self.search_tool()
+        search('rome')
+        search('rome')
+        self.assertEqual(len(self.cache.store), 1)
+        self.assertEqual(self.calls, [('rome', 10)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,3 +1,4 @@
+import asyncio
 import json
 
 from collections.abc import AsyncIterable
@@ -6,7 +7,8 @@ from typing import Any
 import httpx
 
 from httpx._types import TimeoutTypes
-from httpx_sse import connect_sse
+from httpx_sse import aconnect_sse
+from pydantic import ValidationError
 
 from common.types import (
     A2AClientHTTPError,
@@ -28,12 +30,50 @@ from common.types import (
 )
 
 
+DEFAULT_LIMITS = httpx.Limits(
+    max_connections=100, max_keepalive_connections=20, keepalive_expiry=30.0
+)
+# Streams hold their connection for as long as the task runs, so they get a
+# pool of their own without a connection cap; otherwise open streams could
+# use up the connections RPC calls need.
+STREAM_LIMITS = httpx.Limits(
+    max_connections=None, max_keepalive_connections=20, keepalive_expiry=30.0
+)
+
+
 class A2AClient:
+    """JSON-RPC client for a single A2A agent.
+
+    The client keeps one connection-pooled ``httpx.AsyncClient`` for its whole
+    lifetime so consecutive calls reuse TCP/TLS connections. RPC calls share
+    at most ``limits.max_connections`` connections. Streaming calls use a
+    second, uncapped pool that is opened on the first stream, and their
+    reads never time out, so long-lived streams cannot starve RPC calls.
+
+    The transports are released by ``aclose``, so create one client per
+    agent, reuse it, and close it when done (or use it as an async context
+    manager); a client that is dropped without ``aclose`` leaks its pooled
+    connections until they expire. Pass ``httpx_client`` to share a
+    transport between several clients; the caller then owns it, ``aclose``
+    leaves it open, and streams go through it as well unless
+    ``stream_httpx_client`` is also given.
+
+    With ``batch_window`` set, non-streaming calls issued within that many
+    seconds of each other are coalesced into one JSON-RPC batch request of at
+    most ``max_batch_size`` calls. The agent must support batch requests.
+    """
+
     def __init__(
         self,
         agent_card: AgentCard = None,
         url: str = None,
         timeout: TimeoutTypes = 60.0,
+        httpx_client: httpx.AsyncClient | None = None,
+        limits: httpx.Limits = DEFAULT_LIMITS,
+        stream_httpx_client: httpx.AsyncClient | None = None,
+        http2: bool = False,
+        batch_window: float | None = None,
+        max_batch_size: int = 50,
     ):
         if agent_card:
             self.url = agent_card.url
@@ -42,6 +82,41 @@ class A2AClient:
         else:
             raise ValueError('Must provide either agent_card or url')
         self.timeout = timeout
+        self._owns_client = httpx_client is None
+        self._client = httpx_client or httpx.AsyncClient(
+            timeout=timeout, limits=limits, http2=http2
+        )
+        self.http2 = http2
+        self._owns_stream_client = (
+            stream_httpx_client is None and httpx_client is None
+        )
+        self._stream_client = stream_httpx_client or httpx_client
+        self.batch_window = batch_window
+        self.max_batch_size = max_batch_size
+        self._batch: list[tuple[JSONRPCRequest, asyncio.Future]] = []
+        self._batch_timer: asyncio.TimerHandle | None = None
+        self._batch_tasks: set[asyncio.Task] = set()
+
+    async def __aenter__(self) -> 'A2AClient':
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Closes the underlying transport if this client created it.
+
+        Calls still waiting for their batch are sent first.
+        """
+        if self._batch:
+            self._flush_batch()
+        if self._batch_tasks:
+            await asyncio.gather(*self._batch_tasks, return_exceptions=True)
+        if self._owns_client:
+            await self._client.aclose()
+        if self._owns_stream_client and self._stream_client is not None:
+            await self._stream_client.aclose()
+            self._stream_client = None
 
     async def send_task(self, payload: dict[str, Any]) -> SendTaskResponse:
         request = SendTaskRequest(params=payload)
@@ -51,31 +126,103 @@ class A2AClient:
         self, payload: dict[str, Any]
     ) -> AsyncIterable[SendTaskStreamingResponse]:
         request = SendTaskStreamingRequest(params=payload)
-        with httpx.Client(timeout=None) as client:
-            with connect_sse(
-                client, 'POST', self.url, json=request.model_dump()
-            ) as event_source:
-                try:
-                    for sse in event_source.iter_sse():
-                        yield SendTaskStreamingResponse(**json.loads(sse.data))
-                except json.JSONDecodeError as e:
-                    raise A2AClientJSONError(str(e)) from e
-                except httpx.RequestError as e:
-                    raise A2AClientHTTPError(400, str(e)) from e
+        # Events are read off the socket only as the caller consumes them, so
+        # a slow consumer applies backpressure instead of buffering the stream.
+        async with aconnect_sse(
+            self._get_stream_client(),
+            'POST',
+            self.url,
+            json=request.model_dump(),
+            timeout=_stream_timeout(self.timeout),
+        ) as event_source:
+            try:
+                async for sse in event_source.aiter_sse():
+                    yield SendTaskStreamingResponse.model_validate_json(
+                        sse.data
+                    )
+            except ValidationError as e:
+                raise A2AClientJSONError(str(e)) from e
+            except httpx.RequestError as e:
+                raise A2AClientHTTPError(400, str(e)) from e
+
+    def _get_stream_client(self) -> httpx.AsyncClient:
+        if self._stream_client is None:
+            self._stream_client = httpx.AsyncClient(
+                limits=STREAM_LIMITS, http2=self.http2
+            )
+        return self._stream_client
 
     async def _send_request(self, request: JSONRPCRequest) -> dict[str, Any]:
-        async with httpx.AsyncClient() as client:
-            try:
-                # Image generation could take time, adding timeout
-                response = await client.post(
-                    self.url, json=request.model_dump(), timeout=self.timeout
+        if self.batch_window is None:
+            return await self._post(request.model_dump())
+
+        future = asyncio.get_running_loop().create_future()
+        self._batch.append((request, future))
+        if len(self._batch) >= self.max_batch_size:
+            self._flush_batch()
+        elif self._batch_timer is None:
+            self._batch_timer = asyncio.get_running_loop().call_later(
+                self.batch_window, self._flush_batch
+            )
+        return await future
+
+    def _flush_batch(self) -> None:
+        if self._batch_timer is not None:
+            self._batch_timer.cancel()
+            self._batch_timer = None
+        batch, self._batch = self._batch, []
+        task = asyncio.create_task(self._send_batch(batch))
+        self._batch_tasks.add(task)
+        task.add_done_callback(self._batch_tasks.discard)
+
+    async def _send_batch(
+        self, batch: list[tuple[JSONRPCRequest, asyncio.Future]]
+    ) -> None:
+        try:
+            if len(batch) == 1:
+                request, _ = batch[0]
+                responses = [await self._post(request.model_dump())]
+            else:
+                responses = await self._post(
+                    [request.model_dump() for request, _ in batch]
                 )
-                response.raise_for_status()
-                return response.json()
-            except httpx.HTTPStatusError as e:
-                raise A2AClientHTTPError(e.response.status_code, str(e)) from e
-            except json.JSONDecodeError as e:
-                raise A2AClientJSONError(str(e)) from e
+                if not isinstance(responses, list):
+                    raise A2AClientJSONError(
+                        f'Expected a batch response, got {responses}'
+                    )
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        by_id = {
+            response.get('id'): response
+            for response in responses
+            if isinstance(response, dict)
+        }
+        for request, future in batch:
+            if future.done():
+                continue
+            if request.id in by_id:
+                future.set_result(by_id[request.id])
+            else:
+                future.set_exception(
+                    A2AClientJSONError(f'No response for request {request.id}')
+                )
+
+    async def _post(self, payload: Any) -> Any:
+        try:
+            # Image generation could take time, adding timeout
+            response = await self._client.post(
+                self.url, json=payload, timeout=self.timeout
+            )
+            response.raise_for_status()
+            return response.json()
+        except httpx.HTTPStatusError as e:
+            raise A2AClientHTTPError(e.response.status_code, str(e)) from e
+        except json.JSONDecodeError as e:
+            raise A2AClientJSONError(str(e)) from e
 
     async def get_task(self, payload: dict[str, Any]) -> GetTaskResponse:
         request = GetTaskRequest(params=payload)
@@ -100,3 +247,18 @@ class A2AClient:
         return GetTaskPushNotificationResponse(
             **await self._send_request(request)
         )
+
+
+def _stream_timeout(timeout: TimeoutTypes) -> httpx.Timeout:
+    """Returns timeout with reads disabled, since events may be far apart."""
+    if isinstance(timeout, httpx.Timeout):
+        return httpx.Timeout(
+            connect=timeout.connect,
+            read=None,
+            write=timeout.write,
+            pool=timeout.pool,
+        )
+    if isinstance(timeout, tuple):
+        connect, _, write, pool = timeout
+        return httpx.Timeout(connect=connect, read=None, write=write, pool=pool)
+    return httpx.Timeout(timeout, read=None)
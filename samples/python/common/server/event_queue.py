@@ -0,0 +1,158 @@
+import asyncio
+import time
+
+from collections import deque
+from enum import Enum
+from typing import Any
+
+from common.types import InternalError, TaskStatusUpdateEvent
+
+
+class SlowConsumerPolicy(str, Enum):
+    """What to do when a subscriber's buffer is full."""
+
+    DROP_OLDEST = 'drop-oldest'
+    COALESCE = 'coalesce'
+    DISCONNECT = 'disconnect'
+
+
+class SSEEventQueue:
+    """Bounded per-subscriber buffer for SSE events.
+
+    Producers never wait on a subscriber: ``put_nowait`` always returns
+    immediately and applies the slow-consumer policy when the buffer is full.
+    ``COALESCE`` replaces a buffered, non-final status update of a task with
+    the task's newer one, as long as no other event of the task follows it,
+    whether or not the buffer is full. A full buffer then discards the oldest
+    non-final status update, or else the oldest event.
+    ``DISCONNECT`` discards the backlog and ends the stream with an error.
+    Each event is buffered with its sequence number in the task's event log,
+    if it has one, so the stream can tell clients where to resume.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 256,
+        policy: SlowConsumerPolicy = SlowConsumerPolicy.DROP_OLDEST,
+    ):
+        if maxsize <= 0:
+            raise ValueError('maxsize must be positive')
+        self.maxsize = maxsize
+        self.policy = policy
+        self.dropped = 0
+        self.disconnected = False
+        self._buffer: deque[tuple[int | None, Any]] = deque()
+        self._not_empty = asyncio.Event()
+
+    def qsize(self) -> int:
+        return len(self._buffer)
+
+    def empty(self) -> bool:
+        return not self._buffer
+
+    def put_nowait(self, event: Any, sequence: int | None = None) -> int:
+        """Buffers an event and returns how many events were dropped."""
+        if self.disconnected:
+            self.dropped += 1
+            return 1
+
+        if self.policy == SlowConsumerPolicy.COALESCE and self._coalesce(
+            event, sequence
+        ):
+            self.dropped += 1
+            return 1
+
+        dropped = 0
+        if len(self._buffer) >= self.maxsize:
+            if self.policy == SlowConsumerPolicy.DISCONNECT:
+                dropped = len(self._buffer) + 1
+                self._buffer.clear()
+                self.disconnected = True
+                event = InternalError(
+                    message='SSE consumer is too slow, stream disconnected'
+                )
+                sequence = None
+            elif self.policy == SlowConsumerPolicy.COALESCE:
+                self._drop_stale_status()
+                dropped = 1
+            else:
+                self._buffer.popleft()
+                dropped = 1
+
+        self._buffer.append((sequence, event))
+        self._not_empty.set()
+        self.dropped += dropped
+        return dropped
+
+    async def get(self) -> Any:
+        _, event = await self.get_entry()
+        return event
+
+    async def get_entry(self) -> tuple[int | None, Any]:
+        """Waits for the next event and returns it as (sequence, event)."""
+        while not self._buffer:
+            self._not_empty.clear()
+            await self._not_empty.wait()
+        return self._buffer.popleft()
+
+    def _coalesce(self, event: Any, sequence: int | None) -> bool:
+        """Replaces the task's buffered status with event, if possible."""
+        if not isinstance(event, TaskStatusUpdateEvent) or event.final:
+            return False
+        # Only the task's latest buffered event may be replaced, so the
+        # order of its events is kept.
+        for i in range(len(self._buffer) - 1, -1, -1):
+            queued = self._buffer[i][1]
+            if getattr(queued, 'id', None) != event.id:
+                continue
+            if isinstance(queued, TaskStatusUpdateEvent) and not queued.final:
+                self._buffer[i] = (sequence, event)
+                return True
+            return False
+        return False
+
+    def _drop_stale_status(self):
+        for i, (_, queued) in enumerate(self._buffer):
+            if isinstance(queued, TaskStatusUpdateEvent) and not queued.final:
+                del self._buffer[i]
+                return
+        self._buffer.popleft()
+
+
+class TaskEventLog:
+    """Append-only log of the events published for one task.
+
+    Every event gets a sequence number, starting at 0 for the first event of
+    the task. The log keeps at most ``max_events`` entries that are younger
+    than ``max_age`` seconds, so a resubscribing client can replay what it
+    missed without the log growing without bound.
+    """
+
+    def __init__(self, max_events: int = 1000, max_age: float = 3600.0):
+        self.max_events = max_events
+        self.max_age = max_age
+        self.next_sequence = 0
+        self._entries: deque[tuple[int, float, Any]] = deque(maxlen=max_events)
+
+    def append(self, event: Any) -> int:
+        sequence = self.next_sequence
+        self.next_sequence += 1
+        self._entries.append((sequence, time.monotonic(), event))
+        self._evict_expired()
+        return sequence
+
+    def since(self, sequence: int) -> list[Any]:
+        """Returns the retained events with a sequence number >= sequence."""
+        return [event for _, event in self.entries_since(sequence)]
+
+    def entries_since(self, sequence: int) -> list[tuple[int, Any]]:
+        """Like ``since``, but returns the events as (sequence, event)."""
+        self._evict_expired()
+        return [
+            (seq, event) for seq, _, event in self._entries if seq >= sequence
+        ]
+
+    def _evict_expired(self):
+        cutoff = time.monotonic() - self.max_age
+        while self._entries and self._entries[0][1] < cutoff:
+            self._entries.popleft()
@@ -1,3 +1,4 @@
+import asyncio
 import json
 import logging
 
@@ -8,11 +9,10 @@ from pydantic import ValidationError
 from sse_starlette.sse import EventSourceResponse
 from starlette.applications import Starlette
 from starlette.requests import Request
-from starlette.responses import JSONResponse
+from starlette.responses import JSONResponse, Response
 
 from common.server.task_manager import TaskManager
 from common.types import (
-    A2ARequest,
     AgentCard,
     CancelTaskRequest,
     GetTaskPushNotificationRequest,
@@ -20,7 +20,10 @@ from common.types import (
     InternalError,
     InvalidRequestError,
     JSONParseError,
+    JSONRPCError,
+    JSONRPCRequest,
     JSONRPCResponse,
+    MethodNotFoundError,
     SendTaskRequest,
     SendTaskStreamingRequest,
     SetTaskPushNotificationRequest,
@@ -28,8 +31,68 @@ from common.types import (
 )
 
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
 logger = logging.getLogger(__name__)
 
+# Maps each JSON-RPC method to its request model and TaskManager handler, so
+# a request is validated against one model instead of the whole union.
+METHOD_HANDLERS: dict[str, tuple[type[JSONRPCRequest], str]] = {
+    request_type.model_fields['method'].default: (request_type, handler)
+    for request_type, handler in (
+        (GetTaskRequest, 'on_get_task'),
+        (SendTaskRequest, 'on_send_task'),
+        (SendTaskStreamingRequest, 'on_send_task_subscribe'),
+        (CancelTaskRequest, 'on_cancel_task'),
+        (SetTaskPushNotificationRequest, 'on_set_task_push_notification'),
+        (GetTaskPushNotificationRequest, 'on_get_task_push_notification'),
+        (TaskResubscriptionRequest, 'on_resubscribe_to_task'),
+    )
+}
+
+# Methods whose result is an SSE stream, which cannot be part of a batch.
+STREAMING_METHODS = frozenset(
+    request_type.model_fields['method'].default
+    for request_type in (SendTaskStreamingRequest, TaskResubscriptionRequest)
+)
+
+
+class _JSONRPCRequestError(Exception):
+    """A request failed before reaching the task manager."""
+
+    def __init__(self, request_id: int | str | None, error: JSONRPCError):
+        super().__init__(error.message)
+        self.request_id = request_id
+        self.error = error
+
+
+def _loads(body: bytes):
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body)
+
+
+def _resume_after(body: Any, last_event_id: str) -> Any:
+    """Resubscribes from the event after Last-Event-ID.
+
+    The header wins over params.offset, as a reconnecting client sends the
+    id of the last event it received. Other methods and ids that are not
+    sequence numbers are left alone.
+    """
+    if (
+        not isinstance(body, dict)
+        or body.get('method') != 'tasks/resubscribe'
+        or not isinstance(body.get('params'), dict)
+        or not last_event_id.strip().isdigit()
+    ):
+        return body
+    params = {**body['params'], 'offset': int(last_event_id) + 1}
+    return {**body, 'params': params}
+
 
 class A2AServer:
     def __init__(
@@ -39,12 +102,16 @@ class A2AServer:
         endpoint='/',
         agent_card: AgentCard = None,
         task_manager: TaskManager = None,
+        batch_concurrency: int = 16,
+        max_batch_size: int = 100,
     ):
         self.host = host
         self.port = port
         self.endpoint = endpoint
         self.task_manager = task_manager
         self.agent_card = agent_card
+        self.batch_concurrency = batch_concurrency
+        self.max_batch_size = max_batch_size
         self.app = Starlette()
         self.app.add_route(
             self.endpoint, self._process_request, methods=['POST']
@@ -69,69 +136,131 @@ class A2AServer:
 
     async def _process_request(self, request: Request):
         try:
-            body = await request.json()
-            json_rpc_request = A2ARequest.validate_python(body)
-
-            if isinstance(json_rpc_request, GetTaskRequest):
-                result = await self.task_manager.on_get_task(json_rpc_request)
-            elif isinstance(json_rpc_request, SendTaskRequest):
-                result = await self.task_manager.on_send_task(json_rpc_request)
-            elif isinstance(json_rpc_request, SendTaskStreamingRequest):
-                result = await self.task_manager.on_send_task_subscribe(
-                    json_rpc_request
-                )
-            elif isinstance(json_rpc_request, CancelTaskRequest):
-                result = await self.task_manager.on_cancel_task(
-                    json_rpc_request
-                )
-            elif isinstance(json_rpc_request, SetTaskPushNotificationRequest):
-                result = await self.task_manager.on_set_task_push_notification(
-                    json_rpc_request
-                )
-            elif isinstance(json_rpc_request, GetTaskPushNotificationRequest):
-                result = await self.task_manager.on_get_task_push_notification(
-                    json_rpc_request
-                )
-            elif isinstance(json_rpc_request, TaskResubscriptionRequest):
-                result = await self.task_manager.on_resubscribe_to_task(
-                    json_rpc_request
-                )
-            else:
-                logger.warning(
-                    f'Unexpected request type: {type(json_rpc_request)}'
+            body = _loads(await request.body())
+            if isinstance(body, list):
+                return await self._process_batch(body)
+            last_event_id = request.headers.get('last-event-id')
+            if last_event_id is not None:
+                body = _resume_after(body, last_event_id)
+            return self._create_response(await self._dispatch(body))
+        except Exception as e:
+            return self._handle_exception(e)
+
+    async def _dispatch(self, body: Any, batched: bool = False) -> Any:
+        if not isinstance(body, dict):
+            raise _JSONRPCRequestError(None, InvalidRequestError())
+
+        request_id = body.get('id')
+        method = body.get('method')
+        route = METHOD_HANDLERS.get(method)
+        if route is None:
+            logger.warning(f'Unknown method: {method}')
+            raise _JSONRPCRequestError(request_id, MethodNotFoundError())
+        if batched and method in STREAMING_METHODS:
+            raise _JSONRPCRequestError(
+                request_id,
+                InvalidRequestError(
+                    message=f'{method} cannot be part of a batch'
+                ),
+            )
+
+        request_type, handler = route
+        try:
+            json_rpc_request = request_type.model_validate(body)
+        except ValidationError as e:
+            raise _JSONRPCRequestError(
+                request_id, InvalidRequestError(data=json.loads(e.json()))
+            ) from e
+        return await getattr(self.task_manager, handler)(json_rpc_request)
+
+    async def _process_batch(self, batch: list[Any]) -> Response:
+        """Runs the calls of a JSON-RPC batch concurrently.
+
+        At most ``batch_concurrency`` calls of one batch run at a time. The
+        responses are returned in request order. Notifications, requests
+        without an id, run but get no response; a batch of only
+        notifications is answered with an empty 204.
+        """
+        if not batch or len(batch) > self.max_batch_size:
+            return self._handle_exception(
+                _JSONRPCRequestError(
+                    None,
+                    InvalidRequestError(
+                        message=f'Batch must hold 1 to {self.max_batch_size}'
+                        ' requests'
+                    ),
                 )
-                raise ValueError(f'Unexpected request type: {type(request)}')
+            )
 
-            return self._create_response(result)
+        semaphore = asyncio.Semaphore(self.batch_concurrency)
 
-        except Exception as e:
-            return self._handle_exception(e)
+        async def run(body: Any) -> str | None:
+            notification = isinstance(body, dict) and 'id' not in body
+            async with semaphore:
+                try:
+                    result = await self._dispatch(body, batched=True)
+                except Exception as e:
+                    if notification:
+                        logger.warning(f'Notification failed: {e}')
+                        return None
+                    return self._to_error_response(e).model_dump_json(
+                        exclude_none=True
+                    )
+            if notification:
+                return None
+            return self.task_manager.serialize_response(result)
+
+        responses = [
+            response
+            for response in await asyncio.gather(*(run(body) for body in batch))
+            if response is not None
+        ]
+        if not responses:
+            return Response(status_code=204)
+        return Response(
+            content=f'[{",".join(responses)}]', media_type='application/json'
+        )
 
-    def _handle_exception(self, e: Exception) -> JSONResponse:
-        if isinstance(e, json.decoder.JSONDecodeError):
+    def _to_error_response(self, e: Exception) -> JSONRPCResponse:
+        request_id = None
+        if isinstance(e, _JSONRPCRequestError):
+            request_id = e.request_id
+            json_rpc_error = e.error
+        elif isinstance(e, json.decoder.JSONDecodeError):
             json_rpc_error = JSONParseError()
         elif isinstance(e, ValidationError):
             json_rpc_error = InvalidRequestError(data=json.loads(e.json()))
         else:
             logger.error(f'Unhandled exception: {e}')
             json_rpc_error = InternalError()
+        return JSONRPCResponse(id=request_id, error=json_rpc_error)
 
-        response = JSONRPCResponse(id=None, error=json_rpc_error)
-        return JSONResponse(
-            response.model_dump(exclude_none=True), status_code=400
+    def _handle_exception(self, e: Exception) -> Response:
+        return Response(
+            content=self._to_error_response(e).model_dump_json(
+                exclude_none=True
+            ),
+            status_code=400,
+            media_type='application/json',
         )
 
-    def _create_response(
-        self, result: Any
-    ) -> JSONResponse | EventSourceResponse:
+    def _create_response(self, result: Any) -> Response | EventSourceResponse:
         if isinstance(result, AsyncIterable):
 
             async def event_generator(result) -> AsyncIterable[dict[str, str]]:
                 async for item in result:
-                    yield {'data': item.model_dump_json(exclude_none=True)}
+                    event = {'data': item.model_dump_json(exclude_none=True)}
+                    # Lets a client resubscribe with Last-Event-ID.
+                    sequence = getattr(item, 'sequence', None)
+                    if sequence is not None:
+                        event['id'] = str(sequence)
+                    yield event
 
             return EventSourceResponse(event_generator(result))
         if isinstance(result, JSONRPCResponse):
-            return JSONResponse(result.model_dump(exclude_none=True))
+            return Response(
+                content=self.task_manager.serialize_response(result),
+                media_type='application/json',
+            )
         logger.error(f'Unexpected result type: {type(result)}')
         raise ValueError(f'Unexpected result type: {type(result)}')
@@ -1,10 +1,18 @@
 import asyncio
 import logging
+import time
 
 from abc import ABC, abstractmethod
-from collections.abc import AsyncIterable
+from collections.abc import AsyncIterable, MutableMapping
+from typing import Any
 
-from common.server.utils import new_not_implemented_error
+from common.server.event_queue import (
+    SSEEventQueue,
+    SlowConsumerPolicy,
+    TaskEventLog,
+)
+from common.server.task_store import InMemoryTaskStore, TaskStore
+from common.server.utils import MessageJSONCache
 from common.types import (
     Artifact,
     CancelTaskRequest,
@@ -79,28 +87,68 @@ class TaskManager(ABC):
     ) -> AsyncIterable[SendTaskResponse] | JSONRPCResponse:
         pass
 
+    def serialize_response(self, response: JSONRPCResponse) -> str:
+        return response.model_dump_json(exclude_none=True)
+
 
 class InMemoryTaskManager(TaskManager):
-    def __init__(self):
-        self.tasks: dict[str, Task] = {}
-        self.push_notification_infos: dict[str, PushNotificationConfig] = {}
-        self.lock = asyncio.Lock()
-        self.task_sse_subscribers: dict[str, list[asyncio.Queue]] = {}
+    def __init__(
+        self,
+        sse_queue_size: int = 256,
+        slow_consumer_policy: SlowConsumerPolicy = (
+            SlowConsumerPolicy.DROP_OLDEST
+        ),
+        event_log_size: int = 1000,
+        event_log_max_age: float = 3600.0,
+        event_log_grace_period: float = 300.0,
+        task_store: TaskStore | None = None,
+    ):
+        self.task_store = task_store or InMemoryTaskStore()
+        self.sse_queue_size = sse_queue_size
+        self.slow_consumer_policy = slow_consumer_policy
+        self.task_sse_subscribers: dict[str, list[SSEEventQueue]] = {}
+        # Only guards adding and removing subscribers; fan-out never waits.
         self.subscriber_lock = asyncio.Lock()
+        self.sse_dropped_events = 0
+        self.event_log_size = event_log_size
+        self.event_log_max_age = event_log_max_age
+        self.task_event_logs: dict[str, TaskEventLog] = {}
+        # Tasks whose last event was final, in the order they finished, with
+        # when they did. Their logs are dropped event_log_grace_period
+        # seconds later unless the task publishes again.
+        self.event_log_grace_period = event_log_grace_period
+        self.finished_event_logs: dict[str, float] = {}
+        # When each task last published, oldest first. A log that published
+        # nothing for event_log_max_age seconds is empty, and is dropped
+        # once the task has no subscribers.
+        self.event_log_activity: dict[str, float] = {}
+        self.message_json_cache = MessageJSONCache()
+
+    @property
+    def tasks(self) -> MutableMapping[str, Task]:
+        """The task store as a dict of task id to task.
+
+        Only stores that hold every task in memory, like the default
+        InMemoryTaskStore, can be used this way.
+        """
+        if not isinstance(self.task_store, MutableMapping):
+            raise TypeError(
+                f'{type(self.task_store).__name__} is not a task mapping, '
+                'use task_store instead'
+            )
+        return self.task_store
 
     async def on_get_task(self, request: GetTaskRequest) -> GetTaskResponse:
         logger.info(f'Getting task {request.params.id}')
         task_query_params: TaskQueryParams = request.params
 
-        async with self.lock:
-            task = self.tasks.get(task_query_params.id)
-            if task is None:
-                return GetTaskResponse(id=request.id, error=TaskNotFoundError())
-
-            task_result = self.append_task_history(
-                task, task_query_params.historyLength
-            )
+        task = await self.task_store.get_task(task_query_params.id)
+        if task is None:
+            return GetTaskResponse(id=request.id, error=TaskNotFoundError())
 
+        task_result = self.append_task_history(
+            task, task_query_params.historyLength
+        )
         return GetTaskResponse(id=request.id, result=task_result)
 
     async def on_cancel_task(
@@ -109,12 +157,9 @@ class InMemoryTaskManager(TaskManager):
         logger.info(f'Cancelling task {request.params.id}')
         task_id_params: TaskIdParams = request.params
 
-        async with self.lock:
-            task = self.tasks.get(task_id_params.id)
-            if task is None:
-                return CancelTaskResponse(
-                    id=request.id, error=TaskNotFoundError()
-                )
+        task = await self.task_store.get_task(task_id_params.id)
+        if task is None:
+            return CancelTaskResponse(id=request.id, error=TaskNotFoundError())
 
         return CancelTaskResponse(id=request.id, error=TaskNotCancelableError())
 
@@ -131,28 +176,35 @@ class InMemoryTaskManager(TaskManager):
     async def set_push_notification_info(
         self, task_id: str, notification_config: PushNotificationConfig
     ):
-        async with self.lock:
-            task = self.tasks.get(task_id)
-            if task is None:
-                raise ValueError(f'Task not found for {task_id}')
+        task = await self.task_store.get_task(task_id)
+        if task is None:
+            raise ValueError(f'Task not found for {task_id}')
 
-            self.push_notification_infos[task_id] = notification_config
+        await self.task_store.set_push_notification_info(
+            task_id, notification_config
+        )
 
     async def get_push_notification_info(
         self, task_id: str
     ) -> PushNotificationConfig:
-        async with self.lock:
-            task = self.tasks.get(task_id)
-            if task is None:
-                raise ValueError(f'Task not found for {task_id}')
+        task = await self.task_store.get_task(task_id)
+        if task is None:
+            raise ValueError(f'Task not found for {task_id}')
 
-            return self.push_notification_infos[task_id]
+        notification_info = await self.task_store.get_push_notification_info(
+            task_id
+        )
+        if notification_info is None:
+            raise ValueError(f'Push notification info not found for {task_id}')
+        return notification_info
 
     
 
     async def has_push_notification_info(self, task_id: str) -> bool:
-        async with self.lock:
-            return task_id in self.push_notification_infos
+        return (
+            await self.task_store.get_push_notification_info(task_id)
+            is not None
+        )
 
     async def on_set_task_push_notification(
         self, request: SetTaskPushNotificationRequest
@@ -206,8 +258,8 @@ class InMemoryTaskManager(TaskManager):
 
     async def upsert_task(self, task_send_params: TaskSendParams) -> Task:
         logger.info(f'Upserting task {task_send_params.id}')
-        async with self.lock:
-            task = self.tasks.get(task_send_params.id)
+        async with self.task_store.lock(task_send_params.id):
+            task = await self.task_store.get_task(task_send_params.id)
             if task is None:
                 task = Task(
                     id=task_send_params.id,
@@ -216,24 +268,63 @@ class InMemoryTaskManager(TaskManager):
                     status=TaskStatus(state=TaskState.SUBMITTED),
                     history=[task_send_params.message],
                 )
-                self.tasks[task_send_params.id] = task
             else:
                 task.history.append(task_send_params.message)
 
+            await self.task_store.save_task(task)
             return task
 
     async def on_resubscribe_to_task(
         self, request: TaskResubscriptionRequest
     ) -> AsyncIterable[SendTaskStreamingResponse] | JSONRPCResponse:
-        return new_not_implemented_error(request.id)
+        logger.info(f'Resubscribing to task {request.params.id}')
+        task_id = request.params.id
+
+        task = await self.task_store.get_task(task_id)
+        if task is None:
+            return JSONRPCResponse(id=request.id, error=TaskNotFoundError())
+        status = task.status
+
+        async with self.subscriber_lock:
+            # Nothing below awaits, so no event can be published between
+            # reading the log and registering the live queue.
+            event_log = self.task_event_logs.get(task_id)
+            missed = (
+                event_log.entries_since(request.params.offset)
+                if event_log
+                else []
+            )
+            sse_event_queue = SSEEventQueue(
+                maxsize=self.sse_queue_size, policy=self.slow_consumer_policy
+            )
+            self.task_sse_subscribers.setdefault(task_id, []).append(
+                sse_event_queue
+            )
+
+        if status.state not in (TaskState.SUBMITTED, TaskState.WORKING) and (
+            not missed or not self._is_last_event(missed[-1][1])
+        ):
+            # The task is no longer producing events, end the stream with
+            # its current status instead of waiting forever.
+            missed.append(
+                (
+                    None,
+                    TaskStatusUpdateEvent(
+                        id=task_id, status=status, final=True
+                    ),
+                )
+            )
+
+        return self.dequeue_events_for_sse(
+            request.id, task_id, sse_event_queue, replay=missed
+        )
 
     async def update_store(
         self, task_id: str, status: TaskStatus, artifacts: list[Artifact]
     ) -> Task:
-        async with self.lock:
-            try:
-                task = self.tasks[task_id]
-            except KeyError:
+        async with self.task_store.lock(task_id):
+            task = await self.task_store.get_task(task_id)
+            if task is None:
                 logger.error(f'Task {task_id} not found for updating the task')
                 raise ValueError(f'Task {task_id} not found')
 
@@ -247,53 +338,170 @@ class InMemoryTaskManager(TaskManager):
                     task.artifacts = []
                 task.artifacts.extend(artifacts)
 
+            await self.task_store.save_task(task)
             return task
 
     def append_task_history(self, task: Task, historyLength: int | None):
-        new_task = task.model_copy()
-        if historyLength is not None and historyLength > 0:
-            new_task.history = new_task.history[-historyLength:]
+        # Shallow view of the task: only the history list is new, the
+        # messages and every other field are shared with the stored task.
+        if historyLength is not None and historyLength > 0 and task.history:
+            history = task.history[-historyLength:]
         else:
-            new_task.history = []
+            history = []
+
+        return task.model_copy(update={'history': history})
+
+    def serialize_task(self, task: Task) -> str:
+        """Serializes a task, reusing the cached JSON of its history."""
+        task_json = task.model_dump_json(exclude={'history'}, exclude_none=True)
+        if task.history is None:
+            return task_json
 
-        return new_task
+        history_json = ','.join(
+            self.message_json_cache.dumps(message) for message in task.history
+        )
+        return f'{task_json[:-1]},"history":[{history_json}]}}'
+
+    def serialize_response(self, response: JSONRPCResponse) -> str:
+        if not isinstance(response.result, Task):
+            return super().serialize_response(response)
+
+        envelope = response.model_dump_json(
+            exclude={'result'}, exclude_none=True
+        )
+        task_json = self.serialize_task(response.result)
+        return f'{envelope[:-1]},"result":{task_json}}}'
 
     async def setup_sse_consumer(
         self, task_id: str, is_resubscribe: bool = False
     ):
         async with self.subscriber_lock:
+            self._prune_event_logs(time.monotonic())
             if task_id not in self.task_sse_subscribers:
-                if is_resubscribe:
+                if is_resubscribe and task_id not in self.task_event_logs:
                     raise ValueError('Task not found for resubscription')
                 self.task_sse_subscribers[task_id] = []
 
-            sse_event_queue = asyncio.Queue(maxsize=0)  # <=0 is unlimited
+            sse_event_queue = SSEEventQueue(
+                maxsize=self.sse_queue_size, policy=self.slow_consumer_policy
+            )
             self.task_sse_subscribers[task_id].append(sse_event_queue)
             return sse_event_queue
 
     async def enqueue_events_for_sse(self, task_id, task_update_event):
-        async with self.subscriber_lock:
-            if task_id not in self.task_sse_subscribers:
-                return
+        now = time.monotonic()
+        self._prune_event_logs(now)
+        event_log = self.task_event_logs.get(task_id)
+        if event_log is None:
+            event_log = TaskEventLog(
+                max_events=self.event_log_size, max_age=self.event_log_max_age
+            )
+            self.task_event_logs[task_id] = event_log
+        sequence = event_log.append(task_update_event)
+        self.event_log_activity.pop(task_id, None)
+        self.event_log_activity[task_id] = now
+        self.finished_event_logs.pop(task_id, None)
+        if self._is_last_event(task_update_event):
+            self.finished_event_logs[task_id] = now
+
+        # put_nowait never blocks, so a slow subscriber cannot hold up the
+        # other subscribers of this task or the fan-out for other tasks.
+        for subscriber in self.task_sse_subscribers.get(task_id, ()):
+            self.sse_dropped_events += subscriber.put_nowait(
+                task_update_event, sequence
+            )
 
-            current_subscribers = self.task_sse_subscribers[task_id]
-            for subscriber in current_subscribers:
-                await subscriber.put(task_update_event)
+    def _prune_event_logs(self, now: float):
+        """Drops the logs of finished and of idle, unsubscribed tasks.
+
+        Finished tasks are dropped a grace period after their final event,
+        the others once they published nothing for event_log_max_age.
+        """
+        cutoff = now - self.event_log_grace_period
+        while self.finished_event_logs:
+            task_id, finished_at = next(iter(self.finished_event_logs.items()))
+            if finished_at > cutoff:
+                break
+            self._drop_event_log(task_id)
+
+        cutoff = now - self.event_log_max_age
+        subscribed = []
+        while self.event_log_activity:
+            task_id, active_at = next(iter(self.event_log_activity.items()))
+            if active_at > cutoff:
+                break
+            if self.task_sse_subscribers.get(task_id):
+                subscribed.append(task_id)
+                del self.event_log_activity[task_id]
+            else:
+                self._drop_event_log(task_id)
+        # Logs with subscribers are checked again after another max age.
+        for task_id in subscribed:
+            self.event_log_activity[task_id] = now
+
+    def _drop_event_log(self, task_id: str):
+        self.finished_event_logs.pop(task_id, None)
+        self.event_log_activity.pop(task_id, None)
+        self.task_event_logs.pop(task_id, None)
+        if not self.task_sse_subscribers.get(task_id, True):
+            del self.task_sse_subscribers[task_id]
+
+    def get_sse_metrics(self) -> dict[str, int]:
+        """Returns subscriber counts, queue depths and dropped event totals."""
+        depths = [
+            queue.qsize()
+            for queues in self.task_sse_subscribers.values()
+            for queue in queues
+        ]
+        return {
+            'subscribers': len(depths),
+            'queue_depth': sum(depths),
+            'max_queue_depth': max(depths, default=0),
+            'dropped_events': self.sse_dropped_events,
+        }
+
+    @staticmethod
+    def _is_last_event(event) -> bool:
+        return isinstance(event, JSONRPCError) or (
+            isinstance(event, TaskStatusUpdateEvent) and event.final
+        )
+
+    @staticmethod
+    def _to_sse_response(
+        request_id, event, sequence: int | None = None
+    ) -> SendTaskStreamingResponse:
+        if isinstance(event, JSONRPCError):
+            return SendTaskStreamingResponse(id=request_id, error=event)
+        return SendTaskStreamingResponse(
+            id=request_id, result=event, sequence=sequence
+        )
 
     async def dequeue_events_for_sse(
-        self, request_id, task_id, sse_event_queue: asyncio.Queue
+        self,
+        request_id,
+        task_id,
+        sse_event_queue: SSEEventQueue,
+        replay: list[tuple[int | None, Any]] | None = None,
     ) -> AsyncIterable[SendTaskStreamingResponse] | JSONRPCResponse:
+        """Streams the replayed and then the live events of a task.
+
+        replay holds (sequence, event) entries from the task's event log.
+        """
         try:
-            while True:
-                event = await sse_event_queue.get()
-                if isinstance(event, JSONRPCError):
-                    yield SendTaskStreamingResponse(id=request_id, error=event)
-                    break
+            for sequence, event in replay or []:
+                yield self._to_sse_response(request_id, event, sequence)
+                if self._is_last_event(event):
+                    return
 
-                yield SendTaskStreamingResponse(id=request_id, result=event)
-                if isinstance(event, TaskStatusUpdateEvent) and event.final:
+            while True:
+                sequence, event = await sse_event_queue.get_entry()
+                yield self._to_sse_response(request_id, event, sequence)
+                if self._is_last_event(event):
                     break
         finally:
             async with self.subscriber_lock:
-                if task_id in self.task_sse_subscribers:
-                    self.task_sse_subscribers[task_id].remove(sse_event_queue)
+                subscribers = self.task_sse_subscribers.get(task_id)
+                if subscribers is not None:
+                    subscribers.remove(sse_event_queue)
+                    if not subscribers:
+                        del self.task_sse_subscribers[task_id]
@@ -0,0 +1,303 @@
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+
+from abc import ABC, abstractmethod
+from collections.abc import Iterator, MutableMapping
+
+from common.types import PushNotificationConfig, Task, TaskState
+
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATES = (TaskState.COMPLETED, TaskState.CANCELED, TaskState.FAILED)
+
+
+class TaskStore(ABC):
+    """Storage backend for the tasks of an InMemoryTaskManager.
+
+    Reads are never locked. Writers take ``lock(task_id)`` around a
+    read-modify-write of a single task; the locks are striped so updates to
+    unrelated tasks rarely contend.
+    """
+
+    def __init__(self, lock_stripes: int = 64):
+        self._locks = [asyncio.Lock() for _ in range(lock_stripes)]
+
+    def lock(self, task_id: str) -> asyncio.Lock:
+        return self._locks[hash(task_id) % len(self._locks)]
+
+    @abstractmethod
+    async def get_task(self, task_id: str) -> Task | None:
+        pass
+
+    @abstractmethod
+    async def save_task(self, task: Task) -> None:
+        pass
+
+    @abstractmethod
+    async def get_push_notification_info(
+        self, task_id: str
+    ) -> PushNotificationConfig | None:
+        pass
+
+    @abstractmethod
+    async def set_push_notification_info(
+        self, task_id: str, notification_config: PushNotificationConfig
+    ) -> None:
+        pass
+
+
+class InMemoryTaskStore(TaskStore, MutableMapping[str, Task]):
+    """Sharded in-memory TaskStore.
+
+    Tasks are spread over ``shards`` dicts by task id. The store can also be
+    used as a plain mapping of task id to task.
+    """
+
+    def __init__(self, shards: int = 16, lock_stripes: int = 64):
+        super().__init__(lock_stripes=lock_stripes)
+        self._shards: list[dict[str, Task]] = [{} for _ in range(shards)]
+        self._push_notification_infos: dict[str, PushNotificationConfig] = {}
+
+    def _shard(self, task_id: str) -> dict[str, Task]:
+        return self._shards[hash(task_id) % len(self._shards)]
+
+    async def get_task(self, task_id: str) -> Task | None:
+        return self._shard(task_id).get(task_id)
+
+    async def save_task(self, task: Task) -> None:
+        self._shard(task.id)[task.id] = task
+
+    async def get_push_notification_info(
+        self, task_id: str
+    ) -> PushNotificationConfig | None:
+        return self._push_notification_infos.get(task_id)
+
+    async def set_push_notification_info(
+        self, task_id: str, notification_config: PushNotificationConfig
+    ) -> None:
+        self._push_notification_infos[task_id] = notification_config
+
+    def __getitem__(self, task_id: str) -> Task:
+        return self._shard(task_id)[task_id]
+
+    def __setitem__(self, task_id: str, task: Task) -> None:
+        self._shard(task_id)[task_id] = task
+
+    def __delitem__(self, task_id: str) -> None:
+        del self._shard(task_id)[task_id]
+        self._push_notification_infos.pop(task_id, None)
+
+    def __iter__(self) -> Iterator[str]:
+        for shard in self._shards:
+            yield from shard
+
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self._shards)
+
+
+class SQLiteTaskStore(TaskStore):
+    """Durable TaskStore backed by a SQLite database in WAL mode.
+
+    Writes are buffered and flushed in one transaction every
+    ``flush_interval`` seconds or once ``batch_size`` tasks are pending.
+    Reads see buffered writes immediately. Tasks that reached a terminal
+    state more than ``ttl`` seconds ago are deleted during flushes. All
+    database work runs in a worker thread so the event loop never blocks.
+    Call ``close`` on shutdown to flush the remaining writes.
+    """
+
+    def __init__(
+        self,
+        path: str = 'tasks.db',
+        ttl: float | None = 24 * 3600,
+        flush_interval: float = 0.05,
+        batch_size: int = 500,
+        eviction_interval: float = 60.0,
+        lock_stripes: int = 64,
+    ):
+        super().__init__(lock_stripes=lock_stripes)
+        self.ttl = ttl
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.eviction_interval = eviction_interval
+        self._pending: dict[str, Task] = {}
+        # Tasks handed to the worker thread but not yet committed.
+        self._flushing: dict[str, Task] = {}
+        self._flush_task: asyncio.Task | None = None
+        # Held from taking a batch until it is committed, so batches commit
+        # in the order they were taken.
+        self._flush_lock = asyncio.Lock()
+        self._last_eviction = time.time()
+        self._db_lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(
+            """
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+            CREATE TABLE IF NOT EXISTS tasks (
+                id TEXT PRIMARY KEY,
+                state TEXT NOT NULL,
+                updated_at REAL NOT NULL,
+                data TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS tasks_state_updated_at
+                ON tasks (state, updated_at);
+            CREATE TABLE IF NOT EXISTS push_notification_infos (
+                task_id TEXT PRIMARY KEY,
+                data TEXT NOT NULL
+            );
+            """
+        )
+
+    async def _run(self, fn, *args):
+        def locked():
+            with self._db_lock:
+                return fn(*args)
+
+        return await asyncio.to_thread(locked)
+
+    async def get_task(self, task_id: str) -> Task | None:
+        task = self._pending.get(task_id) or self._flushing.get(task_id)
+        if task is not None:
+            return task
+
+        row = await self._run(
+            lambda: self._conn.execute(
+                'SELECT data FROM tasks WHERE id = ?', (task_id,)
+            ).fetchone()
+        )
+        return Task.model_validate_json(row[0]) if row else None
+
+    async def save_task(self, task: Task) -> None:
+        self._pending[task.id] = task
+        if len(self._pending) >= self.batch_size:
+            await self.flush()
+        elif self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+    async def get_push_notification_info(
+        self, task_id: str
+    ) -> PushNotificationConfig | None:
+        row = await self._run(
+            lambda: self._conn.execute(
+                'SELECT data FROM push_notification_infos WHERE task_id = ?',
+                (task_id,),
+            ).fetchone()
+        )
+        return (
+            PushNotificationConfig.model_validate_json(row[0]) if row else None
+        )
+
+    async def set_push_notification_info(
+        self, task_id: str, notification_config: PushNotificationConfig
+    ) -> None:
+        data = notification_config.model_dump_json()
+
+        def write():
+            with self._conn:
+                self._conn.execute(
+                    'INSERT OR REPLACE INTO push_notification_infos '
+                    '(task_id, data) VALUES (?, ?)',
+                    (task_id, data),
+                )
+
+        await self._run(write)
+
+    async def _flush_later(self):
+        await asyncio.sleep(self.flush_interval)
+        self._flush_task = None
+        try:
+            await self.flush()
+        except Exception as e:
+            # flush put the batch back into the buffer, try it again later.
+            logger.error(f'Failed to flush tasks, retrying: {e}')
+            if self._pending and self._flush_task is None:
+                self._flush_task = asyncio.create_task(self._flush_later())
+
+    async def flush(self) -> None:
+        """Writes all buffered tasks in a single transaction.
+
+        Flushes run one at a time. A failed batch is put back into the
+        buffer and the error is raised.
+        """
+        async with self._flush_lock:
+            await self._flush()
+
+    async def _flush(self) -> None:
+        if not self._pending:
+            return
+
+        pending, self._pending = self._pending, {}
+        self._flushing.update(pending)
+        now = time.time()
+        rows = [
+            (task.id, task.status.state.value, now, task.model_dump_json())
+            for task in pending.values()
+        ]
+
+        def write():
+            with self._conn:
+                self._conn.executemany(
+                    'INSERT OR REPLACE INTO tasks '
+                    '(id, state, updated_at, data) VALUES (?, ?, ?, ?)',
+                    rows,
+                )
+
+        try:
+            await self._run(write)
+        except BaseException:
+            # Keep the tasks buffered, newer writes win over the failed ones.
+            # Rewriting a batch that was committed after all is harmless.
+            self._pending = pending | self._pending
+            raise
+        finally:
+            for task_id, task in pending.items():
+                if self._flushing.get(task_id) is task:
+                    del self._flushing[task_id]
+
+        if self.ttl is not None and now - self._last_eviction > (
+            self.eviction_interval
+        ):
+            self._last_eviction = now
+            await self.evict_expired()
+
+    async def evict_expired(self) -> int:
+        """Deletes terminal tasks older than the TTL and returns the count."""
+        if self.ttl is None:
+            return 0
+
+        cutoff = time.time() - self.ttl
+        states = [state.value for state in TERMINAL_STATES]
+        placeholders = ','.join('?' * len(states))
+
+        def delete():
+            with self._conn:
+                expired = f"""
+                    SELECT id FROM tasks
+                    WHERE state IN ({placeholders}) AND updated_at < ?
+                """
+                self._conn.execute(
+                    'DELETE FROM push_notification_infos '
+                    f'WHERE task_id IN ({expired})',
+                    (*states, cutoff),
+                )
+                return self._conn.execute(
+                    f'DELETE FROM tasks WHERE id IN ({expired})',
+                    (*states, cutoff),
+                ).rowcount
+
+        evicted = await self._run(delete)
+        if evicted:
+            logger.info(f'Evicted {evicted} expired tasks')
+        return evicted
+
+    async def close(self) -> None:
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        await self.flush()
+        await self._run(self._conn.close)
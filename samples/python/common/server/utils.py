@@ -1,6 +1,9 @@
+import weakref
+
 from common.types import (
     ContentTypeNotSupportedError,
     JSONRPCResponse,
+    Message,
     UnsupportedOperationError,
 )
 
@@ -26,3 +29,27 @@ def new_incompatible_types_error(request_id):
 
 def new_not_implemented_error(request_id):
     return JSONRPCResponse(id=request_id, error=UnsupportedOperationError())
+
+
+class MessageJSONCache:
+    """Caches the serialized JSON of task history messages.
+
+    History messages are never modified once appended, so each one only
+    needs to be serialized once. Entries are keyed by object identity and
+    dropped when the message is garbage collected.
+    """
+
+    def __init__(self):
+        self._cache: dict[int, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def dumps(self, message: Message) -> str:
+        key = id(message)
+        cached = self._cache.get(key)
+        if cached is None:
+            cached = message.model_dump_json(exclude_none=True)
+            self._cache[key] = cached
+            weakref.finalize(message, self._cache.pop, key, None)
+        return cached
@@ -133,6 +133,12 @@ class TaskQueryParams(TaskIdParams):
     historyLength: int | None = None
 
 
+class TaskResubscriptionParams(TaskIdParams):
+    # Sequence number of the first event to replay. Events of a task are
+    # numbered from 0 in the order they were published.
+    offset: int = 0
+
+
 class TaskSendParams(BaseModel):
     id: str
     sessionId: str = Field(default_factory=lambda: uuid4().hex)
@@ -188,6 +194,9 @@ class SendTaskStreamingRequest(JSONRPCRequest):
 
 class SendTaskStreamingResponse(JSONRPCResponse):
     result: TaskStatusUpdateEvent | TaskArtifactUpdateEvent | None = None
+    # Sequence number of the event in its task's event log. It is sent as
+    # the SSE event id, not as part of the JSON-RPC message.
+    sequence: int | None = Field(default=None, exclude=True)
 
 
 class GetTaskRequest(JSONRPCRequest):
@@ -232,7 +241,7 @@ class GetTaskPushNotificationResponse(JSONRPCResponse):
 
 class TaskResubscriptionRequest(JSONRPCRequest):
     method: Literal['tasks/resubscribe',] = 'tasks/resubscribe'
-    params: TaskIdParams
+    params: TaskResubscriptionParams
 
 
 A2ARequest = TypeAdapter(
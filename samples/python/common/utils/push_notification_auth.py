@@ -1,9 +1,12 @@
+import asyncio
 import hashlib
 import json
 import logging
+import random
 import time
 import uuid
 
+from collections import OrderedDict, deque
 from typing import Any
 
 import httpx
@@ -11,6 +14,7 @@ import jwt
 
 from jwcrypto import jwk
 from jwt import PyJWK, PyJWKClient
+from pydantic import BaseModel
 from starlette.requests import Request
 from starlette.responses import JSONResponse
 
@@ -20,25 +24,94 @@ AUTH_HEADER_PREFIX = 'Bearer '
 
 
 class PushNotificationAuth:
-    def _calculate_request_body_sha256(self, data: dict[str, Any]):
-        """Calculates the SHA256 hash of a request body.
-
-        This logic needs to be same for both the agent who signs the payload and the client verifier.
-        """
-        body_str = json.dumps(
+    @staticmethod
+    def _serialize_request_body(data: dict[str, Any]) -> str:
+        return json.dumps(
             data,
             ensure_ascii=False,
             allow_nan=False,
             indent=None,
             separators=(',', ':'),
         )
+
+    def _calculate_request_body_sha256(self, data: dict[str, Any]):
+        """Calculates the SHA256 hash of a request body.
+
+        This logic needs to be same for both the agent who signs the payload and the client verifier.
+        """
+        body_str = self._serialize_request_body(data)
         return hashlib.sha256(body_str.encode()).hexdigest()
 
 
+class DeadLetter(BaseModel):
+    """A push notification that could not be delivered."""
+
+    url: str
+    data: dict[str, Any]
+    error: str
+    attempts: int
+
+
+class _Notification:
+    def __init__(self, url: str, data: dict[str, Any]):
+        self.url = url
+        self.data = data
+        self.enqueued_at = time.monotonic()
+
+
 class PushNotificationSenderAuth(PushNotificationAuth):
-    def __init__(self):
+    """Signs and delivers push notifications in the background.
+
+    ``send_push_notification`` only enqueues a notification; a pool of
+    ``workers`` delivers the queue, reusing one connection pool per
+    destination. While a notification for a task is still queued, a newer
+    one for the same task and URL replaces it, and notifications for one
+    task are delivered in order. Failed deliveries are retried with
+    exponential backoff and end up in ``dead_letters`` after
+    ``max_retries`` retries. A signed JWT is reused for identical payloads
+    for up to ``jwt_max_age`` seconds.
+    """
+
+    def __init__(
+        self,
+        max_queue_size: int = 1000,
+        workers: int = 8,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        timeout: float = 10.0,
+        max_destinations: int = 64,
+        jwt_max_age: float = 60.0,
+        dead_letter_size: int = 1000,
+    ):
         self.public_keys = []
         self.private_key_jwk: PyJWK = None
+        self.max_queue_size = max_queue_size
+        self.workers = workers
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        self.max_destinations = max_destinations
+        self.jwt_max_age = jwt_max_age
+        self.dead_letters: deque[DeadLetter] = deque(maxlen=dead_letter_size)
+        self._queue: asyncio.Queue | None = None
+        self._workers: list[asyncio.Task] = []
+        # Keyed by (url, task id); holds the latest undelivered notification.
+        self._pending: dict[tuple[str, Any], _Notification] = {}
+        self._in_flight: set[tuple[str, Any]] = set()
+        self._clients: OrderedDict[tuple, httpx.AsyncClient] = OrderedDict()
+        # Requests in progress per client. An evicted client is only closed
+        # once its last request finished.
+        self._client_uses: dict[httpx.AsyncClient, int] = {}
+        self._evicted_clients: set[httpx.AsyncClient] = set()
+        self._closing: set[asyncio.Task] = set()
+        self._jwt_cache: OrderedDict[str, tuple[int, str]] = OrderedDict()
+        self._latencies: deque[float] = deque(maxlen=1000)
+        self._sequence = 0
+        self.sent = 0
+        self.retried = 0
+        self.coalesced = 0
 
     @staticmethod
     async def verify_push_notification_url(url: str) -> bool:
@@ -68,6 +141,7 @@ class PushNotificationSenderAuth(PushNotificationAuth):
         )
         self.public_keys.append(key.export_public(as_dict=True))
         self.private_key_jwk = PyJWK.from_json(key.export_private())
+        self._jwt_cache.clear()
 
     def handle_jwks_endpoint(self, _request: Request):
         """Allow clients to fetch public keys."""
@@ -79,32 +153,223 @@ class PushNotificationSenderAuth(PushNotificationAuth):
         Payload is signed with private key and it ensures the integrity of payload for client.
         Including iat prevents from replay attack.
         """
-        iat = int(time.time())
-
-        return jwt.encode(
-            {
-                'iat': iat,
-                'request_body_sha256': self._calculate_request_body_sha256(
-                    data
-                ),
-            },
+        return self._signed_jwt(self._calculate_request_body_sha256(data))
+
+    def _signed_jwt(self, body_sha256: str) -> str:
+        now = int(time.time())
+        cached = self._jwt_cache.get(body_sha256)
+        if cached is not None and now - cached[0] < self.jwt_max_age:
+            self._jwt_cache.move_to_end(body_sha256)
+            return cached[1]
+
+        token = jwt.encode(
+            {'iat': now, 'request_body_sha256': body_sha256},
             key=self.private_key_jwk,
             headers={'kid': self.private_key_jwk.key_id},
             algorithm='RS256',
         )
+        self._jwt_cache[body_sha256] = (now, token)
+        if len(self._jwt_cache) > 1024:
+            self._jwt_cache.popitem(last=False)
+        return token
 
     async def send_push_notification(self, url: str, data: dict[str, Any]):
-        jwt_token = self._generate_jwt(data)
-        headers = {'Authorization': f'Bearer {jwt_token}'}
-        async with httpx.AsyncClient(timeout=10) as client:
+        """Queues a notification for delivery.
+
+        Waits only while the queue is full.
+        """
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+            self._workers = [
+                asyncio.create_task(self._worker()) for _ in range(self.workers)
+            ]
+
+        task_id = data.get('id')
+        if task_id is None:
+            self._sequence += 1
+            task_id = ('#', self._sequence)
+        key = (url, task_id)
+        if key in self._pending:
+            self.coalesced += 1
+            self._pending[key] = _Notification(url, data)
+            return
+
+        self._pending[key] = _Notification(url, data)
+        if key not in self._in_flight:
+            await self._queue.put(key)
+
+    async def flush(self):
+        """Waits until every queued notification was delivered or dropped."""
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def aclose(self):
+        """Delivers the queued notifications and closes all connections."""
+        await self.flush()
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._queue = None
+        for client in [*self._clients.values(), *self._evicted_clients]:
+            await client.aclose()
+        self._clients.clear()
+        self._evicted_clients.clear()
+        self._client_uses.clear()
+        await asyncio.gather(*self._closing, return_exceptions=True)
+
+    def get_metrics(self) -> dict[str, Any]:
+        latencies = sorted(self._latencies)
+        return {
+            'queue_depth': len(self._pending),
+            'in_flight': len(self._in_flight),
+            'sent': self.sent,
+            'retried': self.retried,
+            'coalesced': self.coalesced,
+            'dead_lettered': len(self.dead_letters),
+            'latency_avg': (
+                sum(latencies) / len(latencies) if latencies else 0.0
+            ),
+            'latency_p95': (
+                latencies[int(len(latencies) * 0.95)] if latencies else 0.0
+            ),
+            'latency_max': latencies[-1] if latencies else 0.0,
+        }
+
+    async def _worker(self):
+        while True:
+            key = await self._queue.get()
+            # Newer notifications for the key that arrive while this one is
+            # being delivered are picked up here, keeping them in order.
+            self._in_flight.add(key)
             try:
-                response = await client.post(url, json=data, headers=headers)
+                while key in self._pending:
+                    notification = self._pending.pop(key)
+                    try:
+                        await self._deliver(key, notification)
+                    except Exception as e:
+                        logger.error(f'Push-notification worker failed: {e}')
+                        self.dead_letters.append(
+                            DeadLetter(
+                                url=notification.url,
+                                data=notification.data,
+                                error=str(e),
+                                attempts=1,
+                            )
+                        )
+            finally:
+                self._in_flight.discard(key)
+                if key in self._pending:
+                    # The worker was cancelled; another one takes over the
+                    # newer notification, which is otherwise never queued.
+                    self._requeue(key)
+                self._queue.task_done()
+
+    def _requeue(self, key: tuple[str, Any]):
+        try:
+            self._queue.put_nowait(key)
+        except asyncio.QueueFull:
+            notification = self._pending.pop(key)
+            self.dead_letters.append(
+                DeadLetter(
+                    url=notification.url,
+                    data=notification.data,
+                    error='Push-notification worker stopped',
+                    attempts=0,
+                )
+            )
+
+    async def _deliver(self, key: tuple[str, Any], notification: _Notification):
+        body = self._serialize_request_body(notification.data)
+        headers = {
+            'Authorization': 'Bearer '
+            + self._signed_jwt(hashlib.sha256(body.encode()).hexdigest()),
+            'Content-Type': 'application/json',
+        }
+        url = notification.url
+        for attempt in range(self.max_retries + 1):
+            client = self._client_for(url)
+            self._client_uses[client] = self._client_uses.get(client, 0) + 1
+            try:
+                response = await client.post(url, content=body, headers=headers)
                 response.raise_for_status()
-                logger.info(f'Push-notification sent for URL: {url}')
-            except Exception as e:
-                logger.warning(
-                    f'Error during sending push-notification for URL {url}: {e}'
+                self.sent += 1
+                self._latencies.append(
+                    time.monotonic() - notification.enqueued_at
                 )
+                logger.info(f'Push-notification sent for URL: {url}')
+                return
+            except (httpx.HTTPStatusError, httpx.RequestError) as e:
+                error = e
+                if not self._is_retryable(e) or attempt == self.max_retries:
+                    break
+            finally:
+                self._release_client(client)
+
+            delay = min(self.backoff_max, self.backoff_base * 2**attempt)
+            await asyncio.sleep(delay * (0.5 + random.random() / 2))
+            if key in self._pending:
+                # A newer notification for the task replaces this one.
+                self.coalesced += 1
+                return
+            self.retried += 1
+
+        logger.warning(
+            f'Error during sending push-notification for URL {url}: {error}'
+        )
+        self.dead_letters.append(
+            DeadLetter(
+                url=url,
+                data=notification.data,
+                error=str(error),
+                attempts=attempt + 1,
+            )
+        )
+
+    @staticmethod
+    def _is_retryable(error: Exception) -> bool:
+        if isinstance(error, httpx.HTTPStatusError):
+            status = error.response.status_code
+            return status == 429 or status >= 500
+        return True
+
+    def _client_for(self, url: str) -> httpx.AsyncClient:
+        parsed = httpx.URL(url)
+        destination = (parsed.scheme, parsed.host, parsed.port)
+        client = self._clients.get(destination)
+        if client is not None:
+            self._clients.move_to_end(destination)
+            return client
+
+        client = httpx.AsyncClient(
+            timeout=self.timeout,
+            limits=httpx.Limits(
+                max_connections=10, max_keepalive_connections=5
+            ),
+        )
+        self._clients[destination] = client
+        if len(self._clients) > self.max_destinations:
+            _, evicted = self._clients.popitem(last=False)
+            if self._client_uses.get(evicted):
+                self._evicted_clients.add(evicted)
+            else:
+                self._close_client(evicted)
+        return client
+
+    def _release_client(self, client: httpx.AsyncClient):
+        uses = self._client_uses.get(client, 1) - 1
+        if uses > 0:
+            self._client_uses[client] = uses
+            return
+        self._client_uses.pop(client, None)
+        if client in self._evicted_clients:
+            self._evicted_clients.discard(client)
+            self._close_client(client)
+
+    def _close_client(self, client: httpx.AsyncClient):
+        task = asyncio.create_task(client.aclose())
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
 
 
 class PushNotificationReceiverAuth(PushNotificationAuth):
@@ -0,0 +1,298 @@
+import asyncio
+import json
+import time
+import unittest
+
+import httpx
+
+from common.client import A2AClient
+from common.types import (
+    A2AClientHTTPError,
+    GetTaskResponse,
+    SendTaskStreamingResponse,
+    TaskState,
+    TaskStatusUpdateEvent,
+)
+
+
+def _get_task_handler(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(
+        200,
+        json={
+            'jsonrpc': '2.0',
+            'id': '1',
+            'result': {'id': 'test_task', 'status': {'state': 'working'}},
+        },
+    )
+
+
+class _SlowEventStream(httpx.AsyncByteStream):
+    """Stub agent stream that emits a few status updates with a delay."""
+
+    def __init__(self, task_id: str, events: int = 3, delay: float = 0.01):
+        self.task_id = task_id
+        self.events = events
+        self.delay = delay
+
+    async def __aiter__(self):
+        for i in range(self.events):
+            await asyncio.sleep(self.delay)
+            final = 'true' if i == self.events - 1 else 'false'
+            yield (
+                'data: {"jsonrpc":"2.0","id":"1","result":'
+                f'{{"id":"{self.task_id}","final":{final},'
+                '"status":{"state":"working"}}}\n\n'
+            ).encode()
+
+
+def _streaming_handler(request: httpx.Request) -> httpx.Response:
+    task_id = json.loads(request.read())['params']['id']
+    return httpx.Response(
+        200,
+        headers={'content-type': 'text/event-stream'},
+        stream=_SlowEventStream(task_id),
+    )
+
+
+class _LocalAgent:
+    """Minimal HTTP/1.1 agent on a local socket.
+
+    tasks/sendSubscribe answers with one event and holds the stream open
+    until release is set; any other call gets a tasks/get result.
+    """
+
+    def __init__(self):
+        self.release = asyncio.Event()
+        self.server = None
+
+    async def start(self) -> str:
+        self.server = await asyncio.start_server(self._serve, '127.0.0.1', 0)
+        port = self.server.sockets[0].getsockname()[1]
+        return f'http://127.0.0.1:{port}/'
+
+    async def stop(self):
+        self.release.set()
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def _serve(self, reader, writer):
+        try:
+            while True:
+                head = await reader.readuntil(b'\r\n\r\n')
+                length = 0
+                for line in head.decode().split('\r\n'):
+                    name, _, value = line.partition(':')
+                    if name.lower() == 'content-length':
+                        length = int(value)
+                body = json.loads(await reader.readexactly(length))
+                if body['method'] == 'tasks/sendSubscribe':
+                    await self._stream(writer, body['params']['id'])
+                    return
+                payload = json.dumps(
+                    {
+                        'jsonrpc': '2.0',
+                        'id': body['id'],
+                        'result': {
+                            'id': 'test_task',
+                            'status': {'state': 'working'},
+                        },
+                    }
+                ).encode()
+                writer.write(
+                    b'HTTP/1.1 200 OK\r\ncontent-type: application/json\r\n'
+                    + f'content-length: {len(payload)}\r\n\r\n'.encode()
+                    + payload
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _stream(self, writer, task_id: str):
+        writer.write(
+            b'HTTP/1.1 200 OK\r\ncontent-type: text/event-stream\r\n'
+            b'connection: close\r\n\r\n'
+            + (
+                'data: {"jsonrpc":"2.0","id":"1","result":'
+                f'{{"id":"{task_id}","final":false,'
+                '"status":{"state":"working"}}}\n\n'
+            ).encode()
+        )
+        await writer.drain()
+        await self.release.wait()
+
+
+class TestA2AClient(unittest.IsolatedAsyncioTestCase):
+    async def test_requests_share_one_transport(self):
+        seen = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen.append(request.url)
+            return _get_task_handler(request)
+
+        httpx_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        client = A2AClient(url='http://agent.test/', httpx_client=httpx_client)
+
+        for _ in range(3):
+            response = await client.get_task({'id': 'test_task'})
+            self.assertIsInstance(response, GetTaskResponse)
+            self.assertEqual(response.result.status.state, TaskState.WORKING)
+
+        self.assertEqual(len(seen), 3)
+        await client.aclose()
+        # A caller supplied transport is left open for the caller to close.
+        self.assertFalse(httpx_client.is_closed)
+        await httpx_client.aclose()
+
+    async def test_context_manager_closes_owned_transport(self):
+        async with A2AClient(url='http://agent.test/') as client:
+            self.assertFalse(client._client.is_closed)
+        self.assertTrue(client._client.is_closed)
+
+    async def test_batch_window_coalesces_calls(self):
+        posts = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            body = json.loads(request.read())
+            posts.append(body)
+            calls = body if isinstance(body, list) else [body]
+            responses = [
+                {
+                    'jsonrpc': '2.0',
+                    'id': call['id'],
+                    'result': {
+                        'id': call['params']['id'],
+                        'status': {'state': 'working'},
+                    },
+                }
+                for call in reversed(calls)
+            ]
+            return httpx.Response(
+                200, json=responses if isinstance(body, list) else responses[0]
+            )
+
+        httpx_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        client = A2AClient(
+            url='http://agent.test/',
+            httpx_client=httpx_client,
+            batch_window=0.01,
+            max_batch_size=4,
+        )
+
+        responses = await asyncio.gather(
+            *(client.get_task({'id': f'task-{i}'}) for i in range(6))
+        )
+        # A full batch is sent immediately, the rest after the window.
+        self.assertEqual([len(p) for p in posts], [4, 2])
+        self.assertEqual(
+            [r.result.id for r in responses], [f'task-{i}' for i in range(6)]
+        )
+
+        response = await client.get_task({'id': 'single'})
+        # A lone call is sent as a plain request rather than a batch.
+        self.assertIsInstance(posts[-1], dict)
+        self.assertEqual(response.result.id, 'single')
+        await client.aclose()
+        await httpx_client.aclose()
+
+    async def test_batch_failure_reaches_every_caller(self):
+        httpx_client = httpx.AsyncClient(
+            transport=httpx.MockTransport(lambda request: httpx.Response(503))
+        )
+        client = A2AClient(
+            url='http://agent.test/', httpx_client=httpx_client, batch_window=0
+        )
+
+        results = await asyncio.gather(
+            *(client.get_task({'id': f'task-{i}'}) for i in range(3)),
+            return_exceptions=True,
+        )
+        for result in results:
+            self.assertIsInstance(result, A2AClientHTTPError)
+            self.assertEqual(result.status_code, 503)
+        await httpx_client.aclose()
+
+    def test_requires_agent_card_or_url(self):
+        with self.assertRaises(ValueError):
+            A2AClient()
+
+    async def test_open_streams_do_not_starve_rpc_calls(self):
+        agent = _LocalAgent()
+        url = await agent.start()
+        client = A2AClient(
+            url=url, timeout=5.0, limits=httpx.Limits(max_connections=2)
+        )
+        streams = [
+            client.send_task_streaming(
+                {
+                    'id': f'task-{i}',
+                    'message': {
+                        'role': 'user',
+                        'parts': [{'type': 'text', 'text': 'hi'}],
+                    },
+                }
+            )
+            for i in range(5)
+        ]
+        try:
+            # More streams than the RPC pool allows all get their first event.
+            first = await asyncio.wait_for(
+                asyncio.gather(*(anext(s) for s in streams)), 5
+            )
+            self.assertEqual(
+                [e.result.id for e in first],
+                [f'task-{i}' for i in range(5)],
+            )
+            # RPC calls still get a connection while the streams are open.
+            response = await asyncio.wait_for(
+                client.get_task({'id': 'test_task'}), 5
+            )
+            self.assertEqual(response.result.id, 'test_task')
+        finally:
+            for stream in streams:
+                await stream.aclose()
+            await client.aclose()
+            await agent.stop()
+
+    async def test_concurrent_streams_do_not_block_event_loop(self):
+        httpx_client = httpx.AsyncClient(
+            transport=httpx.MockTransport(_streaming_handler)
+        )
+        client = A2AClient(url='http://agent.test/', httpx_client=httpx_client)
+        max_gap = 0.0
+        done = asyncio.Event()
+
+        async def heartbeat():
+            nonlocal max_gap
+            last = time.monotonic()
+            while not done.is_set():
+                await asyncio.sleep(0.005)
+                now = time.monotonic()
+                max_gap = max(max_gap, now - last)
+                last = now
+
+        async def consume(i: int) -> list[SendTaskStreamingResponse]:
+            payload = {
+                'id': f'task-{i}',
+                'message': {
+                    'role': 'user',
+                    'parts': [{'type': 'text', 'text': 'hi'}],
+                },
+            }
+            return [e async for e in client.send_task_streaming(payload)]
+
+        beat = asyncio.create_task(heartbeat())
+        results = await asyncio.gather(*(consume(i) for i in range(500)))
+        done.set()
+        await beat
+        await httpx_client.aclose()
+
+        self.assertEqual(len(results), 500)
+        for i, events in enumerate(results):
+            self.assertEqual(len(events), 3)
+            self.assertIsInstance(events[-1].result, TaskStatusUpdateEvent)
+            self.assertEqual(events[-1].result.id, f'task-{i}')
+            self.assertTrue(events[-1].result.final)
+        # The loop kept servicing other coroutines while streams were open.
+        self.assertLess(max_gap, 1.0)
@@ -0,0 +1,162 @@
+import asyncio
+import json
+import unittest
+
+import httpx
+
+from common.utils.push_notification_auth import PushNotificationSenderAuth
+
+
+def _task(state: str) -> dict:
+    return {'id': 'task-1', 'status': {'state': state}}
+
+
+class TestPushNotificationSenderAuth(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.sender = PushNotificationSenderAuth(
+            workers=2, max_retries=2, backoff_base=0.001
+        )
+        self.sender.generate_jwk()
+        self.received = []
+        self.responses = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            self.received.append(
+                (
+                    json.loads(request.read()),
+                    request.headers['Authorization'],
+                )
+            )
+            status = self.responses.pop(0) if self.responses else 200
+            if isinstance(status, Exception):
+                raise status
+            return httpx.Response(status)
+
+        self.client = httpx.AsyncClient(
+            transport=httpx.MockTransport(handler)
+        )
+        self.sender._client_for = lambda url: self.client
+
+    async def asyncTearDown(self):
+        await self.sender.aclose()
+        await self.client.aclose()
+
+    async def test_coalesces_queued_updates_for_a_task(self):
+        # Blocks the workers so the updates pile up in the queue.
+        gate = asyncio.Event()
+        deliver = self.sender._deliver
+
+        async def gated_deliver(key, notification):
+            await gate.wait()
+            await deliver(key, notification)
+
+        self.sender._deliver = gated_deliver
+        await self.sender.send_push_notification(
+            'http://a.test/', _task('submitted')
+        )
+        await asyncio.sleep(0)
+        for state in ('working', 'input-required', 'completed'):
+            await self.sender.send_push_notification(
+                'http://a.test/', _task(state)
+            )
+        gate.set()
+        await self.sender.flush()
+
+        states = [data['status']['state'] for data, _ in self.received]
+        self.assertEqual(states, ['submitted', 'completed'])
+        self.assertEqual(self.sender.get_metrics()['coalesced'], 2)
+
+    async def test_retries_then_delivers(self):
+        self.responses = [503, 502]
+        await self.sender.send_push_notification(
+            'http://a.test/', _task('working')
+        )
+        await self.sender.flush()
+
+        self.assertEqual(len(self.received), 3)
+        metrics = self.sender.get_metrics()
+        self.assertEqual(metrics['sent'], 1)
+        self.assertEqual(metrics['retried'], 2)
+        self.assertGreater(metrics['latency_max'], 0)
+        # Retries of the same payload reuse the signed token.
+        self.assertEqual(len({token for _, token in self.received}), 1)
+
+    async def test_dead_letters_after_retries(self):
+        self.responses = [500, 500, 500]
+        await self.sender.send_push_notification(
+            'http://a.test/', _task('working')
+        )
+        await self.sender.flush()
+
+        self.assertEqual(len(self.sender.dead_letters), 1)
+        dead_letter = self.sender.dead_letters[0]
+        self.assertEqual(dead_letter.attempts, 3)
+        self.assertEqual(dead_letter.data, _task('working'))
+
+    async def test_client_errors_are_not_retried(self):
+        self.responses = [404]
+        await self.sender.send_push_notification(
+            'http://a.test/', _task('working')
+        )
+        await self.sender.flush()
+
+        self.assertEqual(len(self.received), 1)
+        self.assertEqual(self.sender.dead_letters[0].attempts, 1)
+
+    async def test_unexpected_error_does_not_block_the_task(self):
+        self.responses = [RuntimeError('boom')]
+        gate = asyncio.Event()
+        deliver = self.sender._deliver
+
+        async def gated_deliver(key, notification):
+            await gate.wait()
+            await deliver(key, notification)
+
+        self.sender._deliver = gated_deliver
+        await self.sender.send_push_notification(
+            'http://a.test/', _task('working')
+        )
+        await asyncio.sleep(0)
+        await self.sender.send_push_notification(
+            'http://a.test/', _task('completed')
+        )
+        gate.set()
+        await self.sender.flush()
+
+        self.assertEqual(self.sender.dead_letters[0].error, 'boom')
+        await self.sender.send_push_notification(
+            'http://a.test/', _task('canceled')
+        )
+        await self.sender.flush()
+        states = [data['status']['state'] for data, _ in self.received]
+        self.assertEqual(states, ['working', 'completed', 'canceled'])
+        self.assertEqual(self.sender.get_metrics()['queue_depth'], 0)
+
+    async def test_evicted_client_closed_after_last_request(self):
+        sender = PushNotificationSenderAuth(max_destinations=1)
+        busy = sender._client_for('http://a.test/')
+        sender._client_uses[busy] = 1
+        current = sender._client_for('http://b.test/')
+        self.assertFalse(busy.is_closed)
+
+        sender._release_client(busy)
+        await asyncio.gather(*sender._closing)
+        self.assertTrue(busy.is_closed)
+        await sender.aclose()
+        self.assertTrue(current.is_closed)
+
+    async def test_signed_body_matches_sent_body(self):
+        await self.sender.send_push_notification(
+            'http://a.test/', _task('working')
+        )
+        await self.sender.flush()
+
+        data, token = self.received[0]
+        expected = self.sender._signed_jwt(
+            self.sender._calculate_request_body_sha256(data)
+        )
+        self.assertEqual(token, f'Bearer {expected}')
+
+
+if __name__ == '__main__':
+    unittest.main()
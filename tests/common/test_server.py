@@ -0,0 +1,232 @@
+import asyncio
+import json
+import unittest
+
+import httpx
+
+from common.server import A2AServer, InMemoryTaskManager
+from common.types import (
+    AgentCapabilities,
+    AgentCard,
+    AgentSkill,
+    Task,
+    TaskState,
+    TaskStatus,
+    TaskStatusUpdateEvent,
+)
+
+
+class _TaskManager(InMemoryTaskManager):
+    async def on_send_task(self, request):
+        raise NotImplementedError
+
+    async def on_send_task_subscribe(self, request):
+        raise NotImplementedError
+
+
+def _agent_card() -> AgentCard:
+    return AgentCard(
+        name='test',
+        url='http://agent.test/',
+        version='1.0',
+        capabilities=AgentCapabilities(),
+        defaultInputModes=['text'],
+        defaultOutputModes=['text'],
+        skills=[AgentSkill(id='s', name='s')],
+    )
+
+
+class TestA2AServer(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.task_manager = _TaskManager()
+        self.task_manager.tasks['task-1'] = Task(
+            id='task-1', status=TaskStatus(state=TaskState.WORKING)
+        )
+        server = A2AServer(
+            agent_card=_agent_card(), task_manager=self.task_manager
+        )
+        self.client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=server.app),
+            base_url='http://agent.test',
+        )
+
+    async def asyncTearDown(self):
+        await self.client.aclose()
+
+    async def test_dispatches_by_method(self):
+        response = await self.client.post(
+            '/',
+            json={
+                'jsonrpc': '2.0',
+                'id': 1,
+                'method': 'tasks/get',
+                'params': {'id': 'task-1'},
+            },
+        )
+        body = response.json()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(body['id'], 1)
+        self.assertEqual(body['result']['id'], 'task-1')
+        self.assertEqual(body['result']['status']['state'], 'working')
+
+    async def test_unknown_method(self):
+        response = await self.client.post(
+            '/', json={'jsonrpc': '2.0', 'id': 7, 'method': 'tasks/nope'}
+        )
+        body = response.json()
+        self.assertEqual(body['id'], 7)
+        self.assertEqual(body['error']['code'], -32601)
+
+    async def test_invalid_params(self):
+        response = await self.client.post(
+            '/',
+            json={
+                'jsonrpc': '2.0',
+                'id': 1,
+                'method': 'tasks/get',
+                'params': {},
+            },
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['error']['code'], -32600)
+
+    async def test_invalid_json(self):
+        response = await self.client.post('/', content=b'{not json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['error']['code'], -32700)
+
+    async def test_non_object_body(self):
+        response = await self.client.post('/', json='tasks/get')
+        self.assertEqual(response.json()['error']['code'], -32600)
+
+    async def test_batch(self):
+        response = await self.client.post(
+            '/',
+            json=[
+                {
+                    'jsonrpc': '2.0',
+                    'id': 1,
+                    'method': 'tasks/get',
+                    'params': {'id': 'task-1'},
+                },
+                {
+                    'jsonrpc': '2.0',
+                    'id': 2,
+                    'method': 'tasks/get',
+                    'params': {'id': 'missing'},
+                },
+                {'jsonrpc': '2.0', 'id': 3, 'method': 'tasks/nope'},
+                {
+                    'jsonrpc': '2.0',
+                    'id': 4,
+                    'method': 'tasks/sendSubscribe',
+                    'params': {},
+                },
+                'not a request',
+            ],
+        )
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual([r.get('id') for r in body], [1, 2, 3, 4, None])
+        self.assertEqual(body[0]['result']['id'], 'task-1')
+        self.assertEqual(body[1]['error']['code'], -32001)
+        self.assertEqual(body[2]['error']['code'], -32601)
+        self.assertEqual(body[3]['error']['code'], -32600)
+        self.assertEqual(body[4]['error']['code'], -32600)
+
+    async def test_batch_skips_notifications(self):
+        notification = {
+            'jsonrpc': '2.0',
+            'method': 'tasks/get',
+            'params': {'id': 'task-1'},
+        }
+        response = await self.client.post(
+            '/',
+            json=[
+                notification,
+                {
+                    'jsonrpc': '2.0',
+                    'id': 1,
+                    'method': 'tasks/get',
+                    'params': {'id': 'task-1'},
+                },
+                {'jsonrpc': '2.0', 'method': 'tasks/nope'},
+            ],
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([r['id'] for r in response.json()], [1])
+
+        response = await self.client.post('/', json=[notification] * 2)
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(response.content, b'')
+
+    async def test_batch_concurrency_limit(self):
+        running = peak = 0
+        on_get_task = self.task_manager.on_get_task
+
+        async def slow_get_task(request):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return await on_get_task(request)
+
+        self.task_manager.on_get_task = slow_get_task
+        batch = [
+            {
+                'jsonrpc': '2.0',
+                'id': i,
+                'method': 'tasks/get',
+                'params': {'id': 'task-1'},
+            }
+            for i in range(40)
+        ]
+        response = await self.client.post('/', json=batch)
+        self.assertEqual(len(response.json()), 40)
+        self.assertEqual(peak, 16)
+
+    async def test_resubscribe_from_last_event_id(self):
+        for _ in range(2):
+            await self.task_manager.enqueue_events_for_sse(
+                'task-1',
+                TaskStatusUpdateEvent(
+                    id='task-1', status=TaskStatus(state=TaskState.WORKING)
+                ),
+            )
+        self.task_manager.tasks['task-1'] = Task(
+            id='task-1', status=TaskStatus(state=TaskState.COMPLETED)
+        )
+        response = await self.client.post(
+            '/',
+            headers={'Last-Event-ID': '0'},
+            json={
+                'jsonrpc': '2.0',
+                'id': 1,
+                'method': 'tasks/resubscribe',
+                'params': {'id': 'task-1'},
+            },
+        )
+        ids = [
+            line.removeprefix('id:').strip()
+            for line in response.text.splitlines()
+            if line.startswith('id:')
+        ]
+        data = [
+            json.loads(line.removeprefix('data:'))
+            for line in response.text.splitlines()
+            if line.startswith('data:')
+        ]
+        # Event 1 is replayed with its id; the closing status has none.
+        self.assertEqual(ids, ['1'])
+        self.assertEqual(len(data), 2)
+        self.assertTrue(data[-1]['result']['final'])
+
+    async def test_empty_batch(self):
+        response = await self.client.post('/', json=[])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['error']['code'], -32600)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,8 +1,14 @@
+import asyncio
+import json
+import os
+import tempfile
 import unittest
 
 from collections.abc import AsyncIterable
 
+from common.server.event_queue import SlowConsumerPolicy
 from common.server.task_manager import InMemoryTaskManager
+from common.server.task_store import InMemoryTaskStore, SQLiteTaskStore
 from common.types import (
     Artifact,
     CancelTaskRequest,
@@ -22,26 +28,27 @@ from common.types import (
     SetTaskPushNotificationRequest,
     SetTaskPushNotificationResponse,
     Task,
+    TaskArtifactUpdateEvent,
     TaskIdParams,
     TaskNotCancelableError,
     TaskNotFoundError,
     TaskPushNotificationConfig,
     TaskQueryParams,
+    TaskResubscriptionParams,
     TaskResubscriptionRequest,
     TaskSendParams,
     TaskState,
     TaskStatus,
     TaskStatusUpdateEvent,
     TextPart,
-    UnsupportedOperationError,
 )
 
 
 class TestTaskManager(InMemoryTaskManager):
     __test__ = False
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
 
     async def on_send_task(self, request: SendTaskRequest) -> SendTaskResponse:
         pass
@@ -183,13 +190,64 @@ class TestInMemoryTaskManager(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(len(self.task_manager.tasks), 1)
         self.assertEqual(len(task.history), 2)
 
-    async def test_on_resubscribe_to_task(self):
+    async def test_on_resubscribe_to_task_not_found(self):
         request = TaskResubscriptionRequest(
-            id='1', params=TaskIdParams(id='test_task')
+            id='1', params=TaskResubscriptionParams(id='test_task')
         )
         response = await self.task_manager.on_resubscribe_to_task(request)
         self.assertIsInstance(response, JSONRPCResponse)
-        self.assertIsInstance(response.error, UnsupportedOperationError)
+        self.assertIsInstance(response.error, TaskNotFoundError)
+
+    async def test_on_resubscribe_to_task_replays_then_goes_live(self):
+        task_id = 'test_task'
+        await self.task_manager.upsert_task(
+            TaskSendParams(id=task_id, message=self.get_test_message('user'))
+        )
+        await self.task_manager.update_store(
+            task_id, TaskStatus(state=TaskState.WORKING), None
+        )
+        events = [
+            TaskStatusUpdateEvent(
+                id=task_id, status=TaskStatus(state=TaskState.WORKING)
+            )
+            for _ in range(3)
+        ]
+        for event in events:
+            await self.task_manager.enqueue_events_for_sse(task_id, event)
+
+        request = TaskResubscriptionRequest(
+            id='1', params=TaskResubscriptionParams(id=task_id, offset=1)
+        )
+        stream = await self.task_manager.on_resubscribe_to_task(request)
+        received = [await anext(stream) for _ in range(2)]
+        self.assertEqual([r.result for r in received], events[1:])
+        self.assertEqual([r.sequence for r in received], [1, 2])
+
+        final_event = TaskStatusUpdateEvent(
+            id=task_id, status=TaskStatus(state=TaskState.COMPLETED), final=True
+        )
+        await self.task_manager.enqueue_events_for_sse(task_id, final_event)
+        remaining = [response async for response in stream]
+        self.assertEqual([r.result for r in remaining], [final_event])
+        self.assertEqual(remaining[0].sequence, 3)
+        self.assertNotIn('sequence', remaining[0].model_dump_json())
+
+    async def test_on_resubscribe_to_finished_task(self):
+        task_id = 'test_task'
+        await self.task_manager.upsert_task(
+            TaskSendParams(id=task_id, message=self.get_test_message('user'))
+        )
+        await self.task_manager.update_store(
+            task_id, TaskStatus(state=TaskState.COMPLETED), None
+        )
+        request = TaskResubscriptionRequest(
+            id='1', params=TaskResubscriptionParams(id=task_id, offset=5)
+        )
+        stream = await self.task_manager.on_resubscribe_to_task(request)
+        responses = [response async for response in stream]
+        self.assertEqual(len(responses), 1)
+        self.assertTrue(responses[0].result.final)
+        self.assertEqual(responses[0].result.status.state, TaskState.COMPLETED)
 
     async def test_update_store_success(self):
         task_id = 'test_task'
@@ -245,6 +303,60 @@ class TestInMemoryTaskManager(unittest.IsolatedAsyncioTestCase):
         new_task = self.task_manager.append_task_history(task, None)
         self.assertEqual(len(new_task.history), 0)
 
+    async def test_append_task_history_shares_messages(self):
+        history = [
+            self.get_test_message(role='agent', text=f'Message {i}')
+            for i in range(5)
+        ]
+        task = Task(
+            id='test_task',
+            status=TaskStatus(state=TaskState.SUBMITTED),
+            history=history,
+        )
+        new_task = self.task_manager.append_task_history(task, 2)
+        self.assertIs(new_task.history[0], history[3])
+        self.assertIs(new_task.status, task.status)
+        self.assertEqual(len(task.history), 5)
+
+    async def test_serialize_response_matches_model_dump(self):
+        task = Task(
+            id='test_task',
+            status=TaskStatus(state=TaskState.WORKING),
+            history=[
+                self.get_test_message(role='agent', text=f'Message {i}')
+                for i in range(5)
+            ],
+            artifacts=[Artifact(parts=[TextPart(text='artifact')])],
+        )
+        self.task_manager.tasks[task.id] = task
+        request = GetTaskRequest(
+            id='1', params=TaskQueryParams(id=task.id, historyLength=3)
+        )
+        response = await self.task_manager.on_get_task(request)
+
+        serialized = self.task_manager.serialize_response(response)
+        self.assertEqual(
+            json.loads(serialized), response.model_dump(exclude_none=True)
+        )
+        self.assertEqual(len(self.task_manager.message_json_cache), 3)
+
+        # Polling again only serializes messages that were not seen before.
+        task.history.append(self.get_test_message(text='Message 5'))
+        response = await self.task_manager.on_get_task(request)
+        self.assertEqual(
+            json.loads(self.task_manager.serialize_response(response)),
+            response.model_dump(exclude_none=True),
+        )
+        self.assertEqual(len(self.task_manager.message_json_cache), 4)
+
+    async def test_serialize_response_error(self):
+        request = GetTaskRequest(id='1', params=TaskQueryParams(id='missing'))
+        response = await self.task_manager.on_get_task(request)
+        self.assertEqual(
+            json.loads(self.task_manager.serialize_response(response)),
+            response.model_dump(exclude_none=True),
+        )
+
     async def test_setup_sse_consumer_new_task(self):
         task_id = 'new_task'
         sse_queue = await self.task_manager.setup_sse_consumer(task_id)
@@ -336,6 +448,177 @@ class TestInMemoryTaskManager(unittest.IsolatedAsyncioTestCase):
             request_id, task_id, sse_queue
         ):
             pass
-        self.assertEqual(
-            len(self.task_manager.task_sse_subscribers[task_id]), 0
+        self.assertNotIn(task_id, self.task_manager.task_sse_subscribers)
+
+    async def test_event_logs_dropped_after_grace_period(self):
+        task_manager = TestTaskManager(event_log_grace_period=0)
+        await task_manager.enqueue_events_for_sse(
+            'done', self.get_status_event('done', TaskState.COMPLETED, True)
+        )
+        await task_manager.enqueue_events_for_sse(
+            'running', self.get_status_event('running')
+        )
+        self.assertNotIn('done', task_manager.task_event_logs)
+        self.assertIn('running', task_manager.task_event_logs)
+
+    async def test_event_log_kept_when_task_publishes_again(self):
+        task_manager = TestTaskManager(event_log_grace_period=60)
+        task_id = 'test_task'
+        await task_manager.enqueue_events_for_sse(
+            task_id,
+            self.get_status_event(task_id, TaskState.INPUT_REQUIRED, True),
+        )
+        self.assertIn(task_id, task_manager.finished_event_logs)
+        await task_manager.enqueue_events_for_sse(
+            task_id, self.get_status_event(task_id)
+        )
+        self.assertNotIn(task_id, task_manager.finished_event_logs)
+        self.assertEqual(task_manager.task_event_logs[task_id].next_sequence, 2)
+
+    async def test_idle_event_logs_dropped_without_subscribers(self):
+        task_manager = TestTaskManager(event_log_max_age=0)
+        await task_manager.setup_sse_consumer('watched')
+        for task_id in ('idle', 'watched'):
+            await task_manager.enqueue_events_for_sse(
+                task_id, self.get_status_event(task_id)
+            )
+        await task_manager.enqueue_events_for_sse(
+            'other', self.get_status_event('other')
+        )
+        self.assertNotIn('idle', task_manager.task_event_logs)
+        self.assertIn('watched', task_manager.task_event_logs)
+
+    def get_status_event(self, task_id, state=TaskState.WORKING, final=False):
+        return TaskStatusUpdateEvent(
+            id=task_id, final=final, status=TaskStatus(state=state)
+        )
+
+    async def test_enqueue_events_for_sse_drop_oldest(self):
+        task_manager = TestTaskManager(sse_queue_size=2)
+        task_id = 'test_task'
+        sse_queue = await task_manager.setup_sse_consumer(task_id)
+        events = [
+            self.get_status_event(task_id),
+            self.get_status_event(task_id, TaskState.INPUT_REQUIRED),
+            self.get_status_event(task_id, TaskState.COMPLETED, final=True),
+        ]
+        for event in events:
+            await task_manager.enqueue_events_for_sse(task_id, event)
+
+        self.assertEqual(sse_queue.qsize(), 2)
+        self.assertEqual(await sse_queue.get(), events[1])
+        self.assertEqual(await sse_queue.get(), events[2])
+        metrics = task_manager.get_sse_metrics()
+        self.assertEqual(metrics['dropped_events'], 1)
+        self.assertEqual(metrics['subscribers'], 1)
+
+    async def test_enqueue_events_for_sse_coalesce_keeps_artifacts(self):
+        task_manager = TestTaskManager(
+            sse_queue_size=2, slow_consumer_policy=SlowConsumerPolicy.COALESCE
+        )
+        task_id = 'test_task'
+        sse_queue = await task_manager.setup_sse_consumer(task_id)
+        artifact_event = TaskArtifactUpdateEvent(
+            id=task_id, artifact=Artifact(parts=[TextPart(text='artifact')])
+        )
+        final_event = self.get_status_event(
+            task_id, TaskState.COMPLETED, final=True
         )
+        await task_manager.enqueue_events_for_sse(task_id, artifact_event)
+        await task_manager.enqueue_events_for_sse(
+            task_id, self.get_status_event(task_id)
+        )
+        await task_manager.enqueue_events_for_sse(task_id, final_event)
+
+        self.assertEqual(await sse_queue.get(), artifact_event)
+        self.assertEqual(await sse_queue.get(), final_event)
+
+    async def test_enqueue_events_for_sse_coalesce_replaces_status(self):
+        task_manager = TestTaskManager(
+            slow_consumer_policy=SlowConsumerPolicy.COALESCE
+        )
+        task_id = 'test_task'
+        sse_queue = await task_manager.setup_sse_consumer(task_id)
+        artifact_event = TaskArtifactUpdateEvent(
+            id=task_id, artifact=Artifact(parts=[TextPart(text='artifact')])
+        )
+        events = [
+            self.get_status_event(task_id, TaskState.SUBMITTED),
+            artifact_event,
+            self.get_status_event(task_id),
+            self.get_status_event(task_id, TaskState.INPUT_REQUIRED),
+        ]
+        for event in events:
+            await task_manager.enqueue_events_for_sse(task_id, event)
+
+        # The status before the artifact stays; the later one is replaced.
+        self.assertEqual(sse_queue.qsize(), 3)
+        self.assertEqual(await sse_queue.get(), events[0])
+        self.assertEqual(await sse_queue.get(), artifact_event)
+        self.assertEqual(await sse_queue.get_entry(), (3, events[3]))
+        self.assertEqual(task_manager.get_sse_metrics()['dropped_events'], 1)
+
+    async def test_enqueue_events_for_sse_disconnect(self):
+        task_manager = TestTaskManager(
+            sse_queue_size=1,
+            slow_consumer_policy=SlowConsumerPolicy.DISCONNECT,
+        )
+        task_id = 'test_task'
+        sse_queue = await task_manager.setup_sse_consumer(task_id)
+        for _ in range(3):
+            await task_manager.enqueue_events_for_sse(
+                task_id, self.get_status_event(task_id)
+            )
+
+        responses = [
+            response
+            async for response in task_manager.dequeue_events_for_sse(
+                '1', task_id, sse_queue
+            )
+        ]
+        self.assertEqual(len(responses), 1)
+        self.assertIsInstance(responses[0].error, JSONRPCError)
+        self.assertNotIn(task_id, task_manager.task_sse_subscribers)
+
+    async def test_mixed_traffic_with_sharded_store(self):
+        task_manager = TestTaskManager(task_store=InMemoryTaskStore(shards=4))
+        task_ids = [f'task_{i}' for i in range(20)]
+        for task_id in task_ids:
+            await task_manager.upsert_task(
+                TaskSendParams(
+                    id=task_id, message=self.get_test_message(role='user')
+                )
+            )
+
+        async def update(task_id):
+            await task_manager.update_store(
+                task_id,
+                TaskStatus(
+                    state=TaskState.WORKING, message=self.get_test_message()
+                ),
+                None,
+            )
+
+        async def get(task_id):
+            request = GetTaskRequest(
+                id='1', params=TaskQueryParams(id=task_id, historyLength=100)
+            )
+            return await task_manager.on_get_task(request)
+
+        await asyncio.gather(
+            *(update(task_id) for task_id in task_ids for _ in range(5)),
+            *(get(task_id) for task_id in task_ids for _ in range(5)),
+        )
+
+        self.assertEqual(len(task_manager.tasks), len(task_ids))
+        for task_id in task_ids:
+            response = await get(task_id)
+            self.assertEqual(len(response.result.history), 6)
+
+    async def test_tasks_needs_a_mapping_store(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            store = SQLiteTaskStore(os.path.join(tmp_dir, 'tasks.db'))
+            task_manager = TestTaskManager(task_store=store)
+            with self.assertRaises(TypeError):
+                task_manager.tasks
+            await store.close()
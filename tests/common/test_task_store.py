@@ -0,0 +1,120 @@
+import asyncio
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from common.server.task_store import SQLiteTaskStore
+from common.types import (
+    Message,
+    PushNotificationConfig,
+    Task,
+    TaskState,
+    TaskStatus,
+    TextPart,
+)
+
+
+class TestSQLiteTaskStore(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, 'tasks.db')
+
+    async def asyncTearDown(self):
+        self.tmp_dir.cleanup()
+
+    def get_test_task(self, task_id='test_task', state=TaskState.WORKING):
+        return Task(
+            id=task_id,
+            status=TaskStatus(state=state),
+            history=[Message(role='user', parts=[TextPart(text='hello')])],
+        )
+
+    async def test_tasks_survive_restart(self):
+        store = SQLiteTaskStore(self.path)
+        task = self.get_test_task()
+        await store.save_task(task)
+        # Buffered writes are visible before they are flushed.
+        self.assertIs(await store.get_task(task.id), task)
+        await store.set_push_notification_info(
+            task.id, PushNotificationConfig(url='http://test.com')
+        )
+        await store.close()
+
+        store = SQLiteTaskStore(self.path)
+        self.assertEqual(await store.get_task(task.id), task)
+        info = await store.get_push_notification_info(task.id)
+        self.assertEqual(info.url, 'http://test.com')
+        self.assertIsNone(await store.get_task('missing'))
+        await store.close()
+
+    async def test_batch_size_triggers_flush(self):
+        store = SQLiteTaskStore(self.path, batch_size=10, flush_interval=60)
+        for i in range(10):
+            await store.save_task(self.get_test_task(f'task_{i}'))
+        with sqlite3.connect(self.path) as conn:
+            (count,) = conn.execute('SELECT COUNT(*) FROM tasks').fetchone()
+        self.assertEqual(count, 10)
+        await store.close()
+
+    async def test_evict_expired_only_removes_finished_tasks(self):
+        store = SQLiteTaskStore(self.path, ttl=0)
+        await store.save_task(self.get_test_task('working'))
+        await store.save_task(
+            self.get_test_task('done', state=TaskState.COMPLETED)
+        )
+        await store.flush()
+
+        self.assertEqual(await store.evict_expired(), 1)
+        self.assertIsNone(await store.get_task('done'))
+        self.assertIsNotNone(await store.get_task('working'))
+        await store.close()
+
+    async def test_flushes_commit_in_order(self):
+        store = SQLiteTaskStore(self.path, flush_interval=60)
+        run = store._run
+        calls = 0
+
+        async def slow_first_write(fn, *args):
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                await asyncio.sleep(0.05)
+            return await run(fn, *args)
+
+        store._run = slow_first_write
+        await store.save_task(self.get_test_task())
+        first = asyncio.create_task(store.flush())
+        await asyncio.sleep(0)
+        await store.save_task(self.get_test_task(state=TaskState.COMPLETED))
+        await asyncio.gather(first, store.flush())
+        store._run = run
+
+        with sqlite3.connect(self.path) as conn:
+            (state,) = conn.execute('SELECT state FROM tasks').fetchone()
+        self.assertEqual(state, TaskState.COMPLETED.value)
+        await store.close()
+
+    async def test_failed_background_flush_is_retried(self):
+        store = SQLiteTaskStore(self.path, flush_interval=0.01)
+        run = store._run
+        calls = 0
+
+        async def fail_first_write(fn, *args):
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                raise sqlite3.OperationalError('database is locked')
+            return await run(fn, *args)
+
+        store._run = fail_first_write
+        task = self.get_test_task()
+        with self.assertLogs('common.server.task_store', 'ERROR'):
+            await store.save_task(task)
+            await asyncio.sleep(0.1)
+
+        self.assertEqual(await store.get_task(task.id), task)
+        with sqlite3.connect(self.path) as conn:
+            (count,) = conn.execute('SELECT COUNT(*) FROM tasks').fetchone()
+        self.assertEqual(count, 1)
+        await store.close()